@@ -26,11 +26,13 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import copy
 import logging
 
+import numpy as np
 import pandas as pd
 
-from .static import poisson_process
+from .static import poisson_process_batch
 
 # Set up logging
 module_logger = logging.getLogger(__name__)
@@ -46,7 +48,8 @@ class Array(object):
                        systype,
                        eventsTableKeys,
                        NoPoisson_eventsTableKeys,
-                       printWP6):
+                       printWP6,
+                       ramTable=None):
 
         '''__init__ function: Saves the arguments in internal variabels.
 
@@ -62,6 +65,9 @@ class Array(object):
                 keys of NoPoisson event table dataframe
             printWP6 (bool):
                 internal flag in order to print messages
+            ramTable (dataframe):
+                precalculated RAM table (see get_ram_table). If None the
+                table is calculated from rsubsysvalues
 
         Attributes:
             self.__dtocean_maintenance_PRINT_FLAG (bool):
@@ -77,8 +83,9 @@ class Array(object):
             self.__eventsTableKeys (list of str): keys of event table dataframe
             self.__FM_ID_RA_ID (dictionary):
                 Id of defined repair actions between logistics and maintenance
-            self.__ramTableKeys (list of str): Keys of RAM table
             self.__ramTable (dataframe): RAM table
+            self.__ramIndex (dict): rows of the RAM table indexed by device
+                and sub-system
 
         '''
 
@@ -140,78 +147,46 @@ class Array(object):
         self.__FM_ID_RA_ID['RtP4']  = 'LpM7'
         self.__FM_ID_RA_ID['RtP5']  = 'LpM8'
         self.__FM_ID_RA_ID['RtP6']  = 'LpM8'
-        
-        # Keys of RAM table
-        self.__ramTableKeys  = ['deviceID',
-                                'subSystem',
-                                'failureRate',
-                                'breakDown']
                 
         # Original RAM table
-        self.__ramTable = None
+        self.__ramTable = ramTable
+        
+        # Indexed RAM table
+        self.__ramIndex = None
         
         return
                          
     # Failure estimation module
-    def executeFEM(self, arrayDict,
-                         eventsTable,
-                         eventsTableNoPoisson,
-                         component,
+    def compileFEM(self, component,
                          failureMode,
-                         repairAction,
-                         inspection,
                          annual_Energy_Production_perD):
 
-        '''executeFEM function: Generates tables for maintenance analysis.
+        '''compileFEM function: Collects the deterministic parts of the
+        failure event model, i.e. the array dictionary template and the
+        failure rate of every failure mode.
 
         Args:
-            arrayDict (dict):
-                dictionary for the saving of model calculation
-            eventsTable (dataframe):
-                table which contains the failure events for different
-                components
-            eventsTableNoPoisson (dataframe):
-                table which contains the failure events without poisson
-                distribution
             component (dataframe):
                 table which contains the information about components
             failureMode (dataframe):
                 table which contains the information about failure modes
-            repairAction (dataframe):
-                table which contains the information about repair actions
-            inspection (dataframe):
-                table which contains the information about inspections
             annual_Energy_Production_perD (list of float):
                 annual energy production of devices
 
+        Returns:
+            femTemplate (dict):
+                arrayDict (dict): initial values of arrayDict
+                failureModes (list of tuple): failureRate, belongsTo,
+                    ComponentType, ComponentSubType, ComponentID, FM_ID,
+                    indexFM and RA_ID of each failure mode
+
         '''
 
         # read the necessary information from RAM
-        self.__readFromRAM()
-
-        # EventsTable (DataFrame)
-        failureRateList = []
-        failureEventsList = []
-        repairActionEventsList = []
-        belongsToList = []
-        componentTypeList = []
-        componentSubTypeList = []
-        componentIDList = []
-        FM_IDList = []
-        indexFMList = []
-        RA_IDList = []
-
-        failureEventsListNoPoisson = []
-        repairActionEventsListNoPoisson = []
-        belongsToListNoPoisson = []
-        componentTypeListNoPoisson = []
-        componentSubTypeListNoPoisson = []
-        componentIDListNoPoisson = []
-        FM_IDListNoPoisson = []
-        indexFMListNoPoisson = []
-        RA_IDListNoPoisson = []
-        AlarmListNoPoisson = []
-        failureRateListNoPoisson = []
+        if self.__ramIndex is None: self.__readFromRAM()
+
+        arrayDict = {}
+        failureModes = []
 
         # Which component type is definedt
         for iCnt in range(0, component.shape[1]):
@@ -258,27 +233,22 @@ class Array(object):
 
             if 'subhub' in componentType:
 
-                dummyRamTable = self.__ramTable.loc[
-                    (self.__ramTable['deviceID'] == RamTableQueryDeviceID)]
+                ramRows = self.__ramIndex.get((RamTableQueryDeviceID, None),
+                                              [])
 
             else:
 
-                dummyRamTable = self.__ramTable.loc[
-                    (self.__ramTable['deviceID'] == \
-                                                 RamTableQueryDeviceID) &
-                    (self.__ramTable['subSystem'] == \
-                                                 RamTableQuerySubSystem)]
-
-            if len(dummyRamTable) > 0:
+                ramRows = self.__ramIndex.get((RamTableQueryDeviceID,
+                                               RamTableQuerySubSystem),
+                                              [])
 
-                dummyRamTable.reset_index(drop=True, inplace=True)
-
-                failure = dummyRamTable.failureRate
+            if len(ramRows) > 0:
 
                 if 'subhub' in componentType:
-                    arrayDict[componentID]['FR'] = failure[0] + failure[1]
+                    arrayDict[componentID]['FR'] = ramRows[0][0] + \
+                                                                ramRows[1][0]
                 else:
-                    arrayDict[componentID]['FR'] = failure[0]
+                    arrayDict[componentID]['FR'] = ramRows[0][0]
 
                 # M&F -> 50% Mooring and 50% foundation
                 if (componentSubType == 'Mooring line' or
@@ -387,54 +357,10 @@ class Array(object):
 
                 if iCnt1 == 0:
 
-                    # failure rate will be read from component table
-                    if 'device' in componentType:
-
-                        RamTableQueryDeviceID  = componentType
-
-                        if (componentSubType == 'Mooring line' or
-                            componentSubType == 'Foundation'):
-
-                            RamTableQuerySubSystem = \
-                                            'M&F sub-system mooring foundation'
-
-                        elif componentSubType == 'Dynamic cable':
-
-                            RamTableQuerySubSystem = \
-                                            'M&F sub-system dynamic cable'
+                    if len(ramRows) > 0:
 
-                        else:
-
-                            RamTableQuerySubSystem = componentSubType
-
-
-                    elif 'subhub' in componentType:
-
-                        RamTableQueryDeviceID = componentType
-
-                    else:
-
-                        RamTableQueryDeviceID  = 'Array'
-                        RamTableQuerySubSystem = componentType[0:-3]
-
-                    if 'subhub' in componentType:
-
-                        dummyRamTable = self.__ramTable.loc[
-                            (self.__ramTable['deviceID'] == \
-                                                     RamTableQueryDeviceID)]
-
-                    else:
-                        dummyRamTable = self.__ramTable.loc[
-                            (self.__ramTable['deviceID'] == \
-                                                     RamTableQueryDeviceID) &
-                            (self.__ramTable['subSystem'] ==
-                                                     RamTableQuerySubSystem)]
-
-                    if len(dummyRamTable > 0):
-
-                        dummyRamTable.reset_index(drop=True, inplace=True)
                         arrayDict[componentID]['Breakdown'].append(
-                                                dummyRamTable.breakDown[0])
+                                                            ramRows[0][1])
 
                         breakdown = arrayDict[componentID]['Breakdown']
 
@@ -477,51 +403,147 @@ class Array(object):
                                                                         100.0
                 arrayDict[componentID]['FR List'].append(failureRate)
 
-                # for checking purposes
-                failureEventsListNoPoisson.append(self.__startOperationDate)
-                repairActionEventsListNoPoisson.append(
-                                                    self.__startOperationDate)
-                indexFMListNoPoisson.append(iCnt1 + 1)
-                componentTypeListNoPoisson.append(componentType)
-                componentSubTypeListNoPoisson.append(componentSubType)
-                componentIDListNoPoisson.append(componentID)
-                FM_IDListNoPoisson.append(failureMode[strDummy]['FM_ID'])
-                RA_IDListNoPoisson.append(
-                        self.__FM_ID_RA_ID[failureMode[strDummy]['FM_ID']])
-
                 if componentSubType in device_systems:
-                    belongsToListNoPoisson.append(deviceID)
+                    belongsTo = deviceID
                 else:
-                    belongsToListNoPoisson.append('Array')
+                    belongsTo = 'Array'
 
-                # failure rate from 1/year
-                self.__calcPoissonEvents(failureRate)
-                failureRateListNoPoisson.append(failureRate)
+                FM_ID = failureMode[strDummy]['FM_ID']
 
-                if 0 < len(self.__Poisson):
-                    AlarmListNoPoisson.append(self.__Poisson[0])
-                else:
-                    AlarmListNoPoisson.append(self.__startOperationDate)
+                failureModes.append((failureRate,
+                                     belongsTo,
+                                     componentType,
+                                     componentSubType,
+                                     componentID,
+                                     FM_ID,
+                                     iCnt1 + 1,
+                                     self.__FM_ID_RA_ID[FM_ID]))
 
-                for dIndex in range(0,len(self.__Poisson)):
+        femTemplate = {'arrayDict': arrayDict,
+                       'failureModes': failureModes}
 
-                    failureEventsList.append(self.__Poisson[dIndex])
-                    repairActionEventsList.append(self.__Poisson[dIndex])
+        return femTemplate
 
-                    if componentSubType in device_systems:
-                        belongsToList.append(deviceID)
-                    else:
-                        belongsToList.append('Array')
-
-                    # [1/year]
-                    failureRateList.append(failureRate)
-                    indexFMList.append(iCnt1+1)
-                    componentTypeList.append(componentType)
-                    componentSubTypeList.append(componentSubType)
-                    componentIDList.append(componentID)
-                    FM_IDList.append(failureMode[strDummy]['FM_ID'])
-                    RA_IDList.append(
-                            self.__FM_ID_RA_ID[failureMode[strDummy]['FM_ID']])
+    def executeFEM(self, arrayDict,
+                         eventsTable,
+                         eventsTableNoPoisson,
+                         component,
+                         failureMode,
+                         repairAction,
+                         inspection,
+                         annual_Energy_Production_perD,
+                         random_state=None,
+                         femTemplate=None,
+                         repairDelays=None):
+
+        '''executeFEM function: Generates tables for maintenance analysis.
+
+        Args:
+            arrayDict (dict):
+                dictionary for the saving of model calculation
+            eventsTable (dataframe):
+                unused, the table of failure events is returned
+            eventsTableNoPoisson (dataframe):
+                unused, the table of failure events without poisson
+                distribution is returned
+            component (dataframe):
+                table which contains the information about components. Only
+                used if femTemplate is None
+            failureMode (dataframe):
+                table which contains the information about failure modes.
+                Only used if femTemplate is None
+            repairAction (dataframe):
+                unused
+            inspection (dataframe):
+                unused
+            annual_Energy_Production_perD (list of float):
+                annual energy production of devices. Only used if
+                femTemplate is None
+            random_state (numpy.random.RandomState):
+                random number stream for the failure events. If None the
+                global numpy random state is used
+            femTemplate (dict):
+                result of compileFEM. If None it is compiled from the given
+                tables
+            repairDelays (numpy.ndarray):
+                delay of the repair action after a failure event, for each
+                failure mode of femTemplate [hour]. If None the repair
+                actions are not delayed
+
+        '''
+
+        if femTemplate is None:
+            femTemplate = self.compileFEM(component,
+                                          failureMode,
+                                          annual_Energy_Production_perD)
+
+        # the template is shared, so only a copy may be modified
+        arrayDict.update(copy.deepcopy(femTemplate['arrayDict']))
+
+        failureModes = femTemplate['failureModes']
+        nModes = len(failureModes)
+        
+        # Failure mode information as columns
+        failureRate = np.array([mode[0] for mode in failureModes],
+                               dtype=float)
+        indexFM = np.array([mode[6] for mode in failureModes], dtype=int)
+        
+        # String information as categorical codes of each failure mode
+        modeCodes = {}
+        
+        for key, iCol in [('belongsTo', 1),
+                          ('ComponentType', 2),
+                          ('ComponentSubType', 3),
+                          ('ComponentID', 4),
+                          ('FM_ID', 5),
+                          ('RA_ID', 7)]:
+            
+            column = np.empty(nModes, dtype=object)
+            column[:] = [mode[iCol] for mode in failureModes]
+            modeCodes[key] = pd.factorize(column)
+        
+        def get_categorical(key, modeRows):
+            codes, categories = modeCodes[key]
+            return pd.Categorical.from_codes(codes[modeRows], categories)
+        
+        # failure events of all failure modes, failure rate from 1/year
+        (modeIndex,
+         failureEvents) = poisson_process_batch(
+                                            self.__startOperationDate,
+                                            self.__simulationTimeDay,
+                                            failureRate / self.__yearDays,
+                                            random_state)
+        
+        # for checking purposes
+        startOperationDate = np.datetime64(self.__startOperationDate, 'ns')
+        startDates = np.repeat(startOperationDate, nModes)
+        
+        # the first event of each failure mode raises the alarm
+        alarm = startDates.copy()
+        
+        if len(modeIndex) > 0:
+            
+            firstEvent = np.flatnonzero(np.r_[True,
+                                              modeIndex[1:] != modeIndex[:-1]])
+            alarm[modeIndex[firstEvent]] = failureEvents[firstEvent]
+        
+        # the repair actions are delayed from the failure events, to the
+        # nearest microsecond
+        if repairDelays is None:
+            
+            repairEvents = failureEvents.copy()
+        
+        else:
+            
+            delays = np.round(np.asarray(repairDelays, dtype=float) * 3.6e9)
+            delays = delays.astype('i8').astype('timedelta64[us]')
+            repairEvents = failureEvents + delays[modeIndex]
+        
+        # the events are emitted in order of their repair action date
+        eventOrder = np.argsort(repairEvents.view('i8'), kind='quicksort')
+        eventRows = modeIndex[eventOrder]
+        failureEvents = failureEvents[eventOrder]
+        repairEvents = repairEvents[eventOrder]
 
 #        self.__eventsTableKeys  = ['failureRate',
 #                                   'repairActionEvents',
@@ -533,24 +555,28 @@ class Array(object):
 #                                   'FM_ID',
 #                                   'indexFM',
 #                                   'RA_ID']
-        data = {self.__eventsTableKeys[0]: failureRateList,
-                self.__eventsTableKeys[1]: repairActionEventsList,
-                self.__eventsTableKeys[2]: failureEventsList,
-                self.__eventsTableKeys[3]: belongsToList,
-                self.__eventsTableKeys[4]: componentTypeList,
-                self.__eventsTableKeys[5]: componentSubTypeList,
-                self.__eventsTableKeys[6]: componentIDList,
-                self.__eventsTableKeys[7]: FM_IDList,
-                self.__eventsTableKeys[8]: indexFMList,
-                self.__eventsTableKeys[9]: RA_IDList}
+        data = {self.__eventsTableKeys[0]: failureRate[eventRows],
+                self.__eventsTableKeys[1]: repairEvents,
+                self.__eventsTableKeys[2]: failureEvents,
+                self.__eventsTableKeys[3]:
+                                get_categorical('belongsTo', eventRows),
+                self.__eventsTableKeys[4]:
+                                get_categorical('ComponentType', eventRows),
+                self.__eventsTableKeys[5]:
+                                get_categorical('ComponentSubType', eventRows),
+                self.__eventsTableKeys[6]:
+                                get_categorical('ComponentID', eventRows),
+                self.__eventsTableKeys[7]:
+                                get_categorical('FM_ID', eventRows),
+                self.__eventsTableKeys[8]: indexFM[eventRows],
+                self.__eventsTableKeys[9]:
+                                get_categorical('RA_ID', eventRows)}
 
         eventsTable = pd.DataFrame(data)
-
-        # sort of eventsTable
-        eventsTable.sort_values(by=self.__eventsTableKeys[1], inplace=True)
-
-        # start index with 0
-        eventsTable.reset_index(drop=True, inplace=True)
+        
+        # the failure modes are emitted in order of their sub-system type
+        subTypeCodes, subTypes = modeCodes['ComponentSubType']
+        modeRows = np.argsort(subTypes[subTypeCodes], kind='quicksort')
 
 #        self.__NoPoisson_eventsTableKeys = ['repairActionEvents',
 #                                            'failureEvents',
@@ -563,263 +589,297 @@ class Array(object):
 #                                            'RA_ID',
 #                                            'Alarm',
 #                                            'failureRate']
-        data1 = {self.__NoPoisson_eventsTableKeys[0]:
-                                            repairActionEventsListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[1]:
-                                            failureEventsListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[2]: belongsToListNoPoisson,
+        data1 = {self.__NoPoisson_eventsTableKeys[0]: startDates,
+                 self.__NoPoisson_eventsTableKeys[1]: startDates.copy(),
+                 self.__NoPoisson_eventsTableKeys[2]:
+                                get_categorical('belongsTo', modeRows),
                  self.__NoPoisson_eventsTableKeys[3]:
-                                            componentTypeListNoPoisson,
+                                get_categorical('ComponentType', modeRows),
                  self.__NoPoisson_eventsTableKeys[4]:
-                                            componentSubTypeListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[5]: componentIDListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[6]: FM_IDListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[7]: indexFMListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[8]: RA_IDListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[9]: failureRateListNoPoisson,
-                 self.__NoPoisson_eventsTableKeys[10]: AlarmListNoPoisson
+                                get_categorical('ComponentSubType', modeRows),
+                 self.__NoPoisson_eventsTableKeys[5]:
+                                get_categorical('ComponentID', modeRows),
+                 self.__NoPoisson_eventsTableKeys[6]:
+                                get_categorical('FM_ID', modeRows),
+                 self.__NoPoisson_eventsTableKeys[7]: indexFM[modeRows],
+                 self.__NoPoisson_eventsTableKeys[8]:
+                                get_categorical('RA_ID', modeRows),
+                 self.__NoPoisson_eventsTableKeys[9]: failureRate[modeRows],
+                 self.__NoPoisson_eventsTableKeys[10]: alarm[modeRows]
                 }
 
         eventsTableNoPoisson = pd.DataFrame(data1)
 
-        # sort of eventsTable
-        eventsTableNoPoisson.sort_values(by=self.__eventsTableKeys[5],
-                                         inplace=True)
-
-        # start index with 0
-        eventsTableNoPoisson.reset_index(drop=True, inplace=True)
-
         return arrayDict, eventsTable, eventsTableNoPoisson
 
-    def __calcPoissonEvents(self, failureRate):
-
-        '''calcPoissonEvents function: Calls the poisson process function
+    def __readFromRAM(self):
 
-        Args:
-            failureRate (float) : Failure rate of component
+        '''readFromRAM function: Read the necessary information from RAM.
 
         '''
+        
+        if self.__ramTable is None:
+            self.__ramTable = get_ram_table(self.__rsubsysvalues,
+                                            self.__eleclayout)
+        
+        self.__ramIndex = get_ram_index(self.__ramTable)
+        
+        return
 
-        rate_day = failureRate / self.__yearDays
 
-        returnValue = poisson_process(self.__startOperationDate,
-                                      self.__simulationTimeDay,
-                                      rate_day)
+def get_ram_table(rsubsysvalues, eleclayout=None):
 
-        if type(returnValue) == list and 1 <= len(returnValue):
-            self.__Poisson = returnValue
-        else:
-            self.__Poisson = []
+    '''get_ram_table function: Flatten the sub-system results of
+    dtocean-reliability into a table of failure rates and breakdowns.
 
-    def __readFromRAM(self):
+    Args:
+        rsubsysvalues (nested list): rsubsysvalues from RAM
+        eleclayout (str): electrical layout of array. If None assume radial
 
-        '''readFromRAM function: Read the necessary information from RAM.
+    Returns:
+        ramTable (dataframe): RAM table
 
-        '''
+    '''
 
-        ramDeviceIDList    = []
-        ramSubSystemList   = []
-        ramFailureRateList = []
-        ramBreakDownList   = []
+    # Electrical layout architecture. If None assume radial
+    if eleclayout is None: eleclayout = 'radial'
+    
+    # Keys of RAM table
+    ramTableKeys  = ['deviceID',
+                     'subSystem',
+                     'failureRate',
+                     'breakDown']
 
-        # read the failure rates from self.__rsubsysvalues
-        for iCnt in range(0, len(self.__rsubsysvalues)):
+    ramDeviceIDList    = []
+    ramSubSystemList   = []
+    ramFailureRateList = []
+    ramBreakDownList   = []
 
-            system = self.__rsubsysvalues[iCnt]
+    # read the failure rates from rsubsysvalues
+    for iCnt in range(0, len(rsubsysvalues)):
 
-            if (system[0] not in ["PAR", "SER"] and
-                system[0][1] in ['Export Cable', 'Substation']and
-                'array' in system[0][2]):
+        system = rsubsysvalues[iCnt]
 
-                ramFailureRateList.append(system[0][-1])
-                ramSubSystemList.append(system[0][1])
-                ramDeviceIDList.append('Array')
-                ramBreakDownList.append('All')
+        if (system[0] not in ["PAR", "SER"] and
+            system[0][1] in ['Export Cable', 'Substation']and
+            'array' in system[0][2]):
 
-                continue
-
-            if (self.__eleclayout == 'radial' or
-                self.__eleclayout == 'singlesidedstring' or
-                self.__eleclayout == 'doublesidedstring'):
+            ramFailureRateList.append(system[0][-1])
+            ramSubSystemList.append(system[0][1])
+            ramDeviceIDList.append('Array')
+            ramBreakDownList.append('All')
 
-                if not 'device' in system[0][0][2]:
+            continue
 
-                    msgStr = "Device not detected in system hierarchy"
-                    module_logger.debug(msgStr)
+        if (eleclayout == 'radial' or
+            eleclayout == 'singlesidedstring' or
+            eleclayout == 'doublesidedstring'):
 
-                    continue
+            if not 'device' in system[0][0][2]:
 
-                # Number of devices
-                for iCnt1 in range(0, len(system)):
+                msgStr = "Device not detected in system hierarchy"
+                module_logger.debug(msgStr)
 
-                    flagMFSubSystem = False
-                    subsystem = system[iCnt1]
+                continue
 
-                    # Number of subsystems
-                    for iCnt2 in range(0, len(subsystem)):
+            # Number of devices
+            for iCnt1 in range(0, len(system)):
 
-                        dummyStr = subsystem[iCnt2][1]
+                flagMFSubSystem = False
+                subsystem = system[iCnt1]
 
-                        # E-Mail of Sam
-                        # The first one is for the mooring/Foundation
-                        # (mooring line/anchor)
-                        if ('M&F sub-system' in dummyStr and
-                            flagMFSubSystem == False):
+                # Number of subsystems
+                for iCnt2 in range(0, len(subsystem)):
 
-                            dummyStr = dummyStr + ' mooring foundation'
-                            flagMFSubSystem = True
+                    dummyStr = subsystem[iCnt2][1]
 
-                        #  The second one is for the the umbilical
-                        # cable
-                        elif ('M&F sub-system' in dummyStr and
-                              flagMFSubSystem == True):
+                    # E-Mail of Sam
+                    # The first one is for the mooring/Foundation
+                    # (mooring line/anchor)
+                    if ('M&F sub-system' in dummyStr and
+                        flagMFSubSystem == False):
 
-                            dummyStr = dummyStr + ' dynamic cable'
+                        dummyStr = dummyStr + ' mooring foundation'
+                        flagMFSubSystem = True
 
-                        ramSubSystemList.append(dummyStr)
-                        ramDeviceIDList.append(subsystem[iCnt2][2])
+                    #  The second one is for the the umbilical
+                    # cable
+                    elif ('M&F sub-system' in dummyStr and
+                          flagMFSubSystem == True):
 
-                        # In case of 'singlesidedstring' or
-                        # 'doublesidedstring' failure rate is a list
-                        dummyList = subsystem[iCnt2][4]
+                        dummyStr = dummyStr + ' dynamic cable'
 
-                        if (type(dummyList) == list and
-                            subsystem[iCnt2][1] == 'Array elec sub-system'):
-                            ramFailureRateList.append(subsystem[iCnt2][4][1])
-                        else:
-                            ramFailureRateList.append(subsystem[iCnt2][4])
+                    ramSubSystemList.append(dummyStr)
+                    ramDeviceIDList.append(subsystem[iCnt2][2])
 
-                        # else part below
-                        if 'Array elec sub-system' in subsystem[iCnt2][1]:
+                    # In case of 'singlesidedstring' or
+                    # 'doublesidedstring' failure rate is a list
+                    dummyList = subsystem[iCnt2][4]
 
-                            dummyList = []
+                    if (type(dummyList) == list and
+                        subsystem[iCnt2][1] == 'Array elec sub-system'):
+                        ramFailureRateList.append(subsystem[iCnt2][4][1])
+                    else:
+                        ramFailureRateList.append(subsystem[iCnt2][4])
 
-                            if (self.__eleclayout == 'radial'):
+                    # else part below
+                    if 'Array elec sub-system' in subsystem[iCnt2][1]:
 
-                                for iCnt3 in range(0, iCnt1 + 1):
-                                    dummyList.append(system[iCnt3][iCnt2][2])
+                        dummyList = []
 
-                                ramBreakDownList.append(dummyList)
+                        if (eleclayout == 'radial'):
 
-                            else:
+                            for iCnt3 in range(0, iCnt1 + 1):
+                                dummyList.append(system[iCnt3][iCnt2][2])
 
-                                ramBreakDownList.append('-')
+                            ramBreakDownList.append(dummyList)
 
                         else:
 
-                            ramBreakDownList.append(subsystem[iCnt2][2])
+                            ramBreakDownList.append('-')
 
-            elif self.__eleclayout == 'multiplehubs':
+                    else:
 
-                if not 'subhub' in system[1][0][0][2]:
+                        ramBreakDownList.append(subsystem[iCnt2][2])
 
-                    msgStr = "Subhub not detected in system hierarchy"
-                    module_logger.debug(msgStr)
+        elif eleclayout == 'multiplehubs':
 
-                    continue
+            if not 'subhub' in system[1][0][0][2]:
 
-                for iCnt1 in range(0, len(system[1])):  # loop over subhubs
+                msgStr = "Subhub not detected in system hierarchy"
+                module_logger.debug(msgStr)
 
-                    subhub = system[1][iCnt1]
+                continue
 
-                    if ('Substation' in subhub[0][1] or
-                        'Elec sub-system' in subhub[0][1]):
+            for iCnt1 in range(0, len(system[1])):  # loop over subhubs
 
-                        ramFailureRateList.append(subhub[0][-1])
-                        ramSubSystemList.append(subhub[0][1])
-                        ramDeviceIDList.append(subhub[0][2])
+                subhub = system[1][iCnt1]
 
-                        # Which devices are conntected to the sub Hub
-                        dummyList = []
+                if ('Substation' in subhub[0][1] or
+                    'Elec sub-system' in subhub[0][1]):
 
-                        # loop over subhubs
-                        for ii1 in range(0, len(subhub)):
+                    ramFailureRateList.append(subhub[0][-1])
+                    ramSubSystemList.append(subhub[0][1])
+                    ramDeviceIDList.append(subhub[0][2])
 
-                            subhub2 = system[1][ii1]
+                    # Which devices are conntected to the sub Hub
+                    dummyList = []
 
-                            if not 'device' in subhub2[0][0][2]: continue
+                    # loop over subhubs
+                    for ii1 in range(0, len(subhub)):
 
-                            # Number of devices
-                            for ii2 in range(0, len(subhub2)):
+                        subhub2 = system[1][ii1]
 
-                                device = subhub2[ii2][0][2]
-                                dummyList.append(device)
+                        if not 'device' in subhub2[0][0][2]: continue
 
-                        ramBreakDownList.append(dummyList)
+                        # Number of devices
+                        for ii2 in range(0, len(subhub2)):
 
-                    else:
+                            device = subhub2[ii2][0][2]
+                            dummyList.append(device)
 
-                        # Number of devices
-                        for iCnt2 in range(0, len(subhub)):
+                    ramBreakDownList.append(dummyList)
 
-                            flagMFSubSystem = False
-                            device = subhub[iCnt2]
+                else:
+
+                    # Number of devices
+                    for iCnt2 in range(0, len(subhub)):
 
-                            # Number of subsystems
-                            for iCnt3 in range(0, len(subhub[0])):
+                        flagMFSubSystem = False
+                        device = subhub[iCnt2]
 
-                                subsystem = device[iCnt3]
+                        # Number of subsystems
+                        for iCnt3 in range(0, len(subhub[0])):
 
-                                dummyStr = subsystem[1]
+                            subsystem = device[iCnt3]
 
-                                # E-Mail of Sam
-                                #  the first one is for the mooring/Foundation
-                                if ('M&F sub-system' in dummyStr and
-                                    flagMFSubSystem == False):
+                            dummyStr = subsystem[1]
 
-                                    dummyStr = dummyStr + ' mooring foundation'
-                                    flagMFSubSystem = True
+                            # E-Mail of Sam
+                            #  the first one is for the mooring/Foundation
+                            if ('M&F sub-system' in dummyStr and
+                                flagMFSubSystem == False):
 
-                                # The second one is for the the umbilical
-                                # cable
-                                if ('M&F sub-system' in dummyStr and
-                                    flagMFSubSystem == True):
+                                dummyStr = dummyStr + ' mooring foundation'
+                                flagMFSubSystem = True
 
-                                    dummyStr = dummyStr + ' dynamic cable'
+                            # The second one is for the the umbilical
+                            # cable
+                            if ('M&F sub-system' in dummyStr and
+                                flagMFSubSystem == True):
 
-                                ramSubSystemList.append(dummyStr)
-                                ramDeviceIDList.append(subsystem[2])
-                                ramFailureRateList.append(subsystem[4])
+                                dummyStr = dummyStr + ' dynamic cable'
 
-                                # else part below
-                                if 'Array elec sub-system' in dummyStr:
+                            ramSubSystemList.append(dummyStr)
+                            ramDeviceIDList.append(subsystem[2])
+                            ramFailureRateList.append(subsystem[4])
 
-                                    dummyList = []
+                            # else part below
+                            if 'Array elec sub-system' in dummyStr:
 
-                                    for ii1 in range(0, iCnt2 + 1):
-                                        dummyList.append(subhub[ii1][0][2])
+                                dummyList = []
 
-                                    ramBreakDownList.append(dummyList)
+                                for ii1 in range(0, iCnt2 + 1):
+                                    dummyList.append(subhub[ii1][0][2])
 
-                                else:
+                                ramBreakDownList.append(dummyList)
 
-                                    ramBreakDownList.append(subsystem[2])
+                            else:
 
-        # [1/hour] -> [1/year]
-        for iCnt in range(0, len(ramFailureRateList)):
+                                ramBreakDownList.append(subsystem[2])
 
-            yearhours = self.__dayHours * self.__yearDays
-            ramFailureRateList[iCnt] = ramFailureRateList[iCnt] * yearhours
+    # [1/hour] -> [1/year]
+    for iCnt in range(0, len(ramFailureRateList)):
 
-        ramData = {self.__ramTableKeys[0]: ramDeviceIDList,
-                   self.__ramTableKeys[1]: ramSubSystemList,
-                   self.__ramTableKeys[2]: ramFailureRateList,
-                   self.__ramTableKeys[3]: ramBreakDownList}
+        yearhours = 24.0 * 365.25
+        ramFailureRateList[iCnt] = ramFailureRateList[iCnt] * yearhours
 
-        self.__ramTable = pd.DataFrame(ramData)
+    ramData = {ramTableKeys[0]: ramDeviceIDList,
+               ramTableKeys[1]: ramSubSystemList,
+               ramTableKeys[2]: ramFailureRateList,
+               ramTableKeys[3]: ramBreakDownList}
+
+    ramTable = pd.DataFrame(ramData)
+    
+    # Patch double counting of umbilical cable
+    dynamic_search = (ramTable['subSystem'] == "M&F sub-system dynamic cable")
+    array_elec_search = (ramTable['subSystem'] == "Array elec sub-system")
+    
+    if dynamic_search.any() and array_elec_search.any():
         
-        # Patch double counting of umbilical cable
-        dynamic_search = (self.__ramTable['subSystem'] ==
-                                              "M&F sub-system dynamic cable")
-        array_elec_search = (self.__ramTable['subSystem'] == 
-                                                     "Array elec sub-system")
+        umbilical_fr = ramTable.loc[dynamic_search, "failureRate"].iloc[0]
+        fix = ramTable.loc[array_elec_search, "failureRate"] - umbilical_fr
+        ramTable.loc[array_elec_search, "failureRate"] = fix
+    
+    return ramTable
+
+
+def get_ram_index(ramTable):
+
+    '''get_ram_index function: Index the rows of the RAM table by device and
+    sub-system.
+
+    Args:
+        ramTable (dataframe): RAM table
+
+    Returns:
+        ramIndex (dict): failure rate and breakdown of the rows of the RAM
+            table, in order, keyed by (deviceID, subSystem) and by
+            (deviceID, None)
+
+    '''
+    
+    ramIndex = {}
+    
+    for deviceID, subSystem, failureRate, breakDown in zip(
+                                            ramTable['deviceID'].values,
+                                            ramTable['subSystem'].values,
+                                            ramTable['failureRate'].values,
+                                            ramTable['breakDown'].values):
         
-        if dynamic_search.any() and array_elec_search.any():
+        for key in [(deviceID, subSystem), (deviceID, None)]:
             
-            umbilical_fr = self.__ramTable.loc[dynamic_search,
-                                               "failureRate"].iloc[0]
-            fix = self.__ramTable.loc[array_elec_search,
-                                      "failureRate"] - umbilical_fr
-            self.__ramTable.loc[array_elec_search, "failureRate"] = fix
-        
-        return
+            if key not in ramIndex: ramIndex[key] = []
+            ramIndex[key].append((failureRate, breakDown))
+    
+    return ramIndex
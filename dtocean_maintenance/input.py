@@ -324,6 +324,88 @@ class inputOM:
                 correctivePrepTime (float) [hour]:
                     time required to prepare vessels for corrective 
                     maintenance actions. Defaults to 48
+                numberOfWorkers (int) [-]:
+                    Number of processes used to calculate the statistical
+                    population in parallel. Optional, defaults to 1
+                randomSeed (int) [-]:
+                    Master seed for the random failure events. Each data
+                    point uses an independent stream derived from this seed
+                    and its index. Optional, defaults to None (not
+                    reproducible)
+                convergenceHalfWidth (float) [-]:
+                    If set, stop calculating data points when the confidence
+                    interval half-widths of the LCOEOpex, lifetimeOpex and
+                    arrayAvailability means, relative to the means, are
+                    less than this value. numberOfSimulations is then the
+                    maximum number of data points. Optional, defaults to None
+                convergenceConfidence (float) [-]:
+                    Confidence level of the convergence test, between 0 and
+                    1. Optional, defaults to 0.95
+                convergenceMinSimulations (int) [-]:
+                    Minimum number of data points before testing for
+                    convergence. Optional, defaults to 10
+                checkpointPath (str) [-]:
+                    Directory in which the results of the completed data
+                    points are periodically saved. Unless eventTablesPath is
+                    set, the event tables of each data point are written to
+                    the eventTables subdirectory once, on completion, and
+                    the eventTables output contains read-only handles, as
+                    for eventTablesPath. Optional, defaults to None
+                checkpointInterval (int) [-]:
+                    Number of data points between checkpoints. Must be at
+                    least 1. Optional, defaults to 10
+                resumeFromCheckpoint (bool) [-]:
+                    Skip the data points stored in the checkpoint in
+                    checkpointPath, if present. The results are only
+                    identical to an uninterrupted run if randomSeed is set.
+                    A ValueError is raised if numberOfSimulations,
+                    randomSeed or the convergence inputs differ from the
+                    checkpoint. Optional, defaults to False
+                eventTablesPath (str) [-]:
+                    Directory to which the event tables and metrics of each
+                    data point are written on completion. The eventTables
+                    output then contains read-only handles which load the
+                    tables on access. Optional, defaults to None
+                jobQueuePath (str) [-]:
+                    Directory of a job queue, shared by the hosts taking part
+                    in the calculation. If set, the data points are published
+                    to the queue and calculated by run_queue_worker processes
+                    rather than locally, and numberOfWorkers is ignored.
+                    A ValueError is raised if the queue is in use by another
+                    job. Optional, defaults to None
+                jobQueueLeaseTime (float) [s]:
+                    Time after which the data points claimed by a job queue
+                    worker which has stopped responding are returned to the
+                    queue. Optional, defaults to 60
+                jobQueueTimeout (float) [s]:
+                    Maximum time to wait for each data point published to the
+                    job queue before a RuntimeError is raised. Optional,
+                    defaults to None (wait indefinitely)
+                logisticsCacheSize (int) [-]:
+                    Maximum number of logistics solutions stored for reuse by
+                    identical operations, which are requested at the same
+                    time, in all data points. The least recently used
+                    solutions are discarded first. Optional, defaults to None
+                    (solutions are not stored)
+                logisticsCachePath (str) [-]:
+                    File in which the stored logistics solutions are saved at
+                    the end of a run, and from which they are loaded at the
+                    start of a run. The solutions of all the workers are
+                    collected and saved by the coordinating process. A
+                    fingerprint of the site, metocean data and logistics
+                    databases is saved with the solutions, and a file with a
+                    different fingerprint is discarded. Ignored unless
+                    logisticsCacheSize is set. Optional, defaults to None
+                metoceanMemmapPath (str) [-]:
+                    Directory to which the metocean time series of
+                    Logistic_Param is written, as compact memory mapped
+                    files, at the start of LCOE_Statistics.main. The run then
+                    uses a MappedMetocean table, which all the worker
+                    processes share rather than copy, and Logistic_Param is
+                    not modified. The time series must only have the date,
+                    Hs, Tp, Ws and Cs columns. The directory must be
+                    accessible to any run_queue_worker processes. Optional,
+                    defaults to None
                 
             Note:
 
@@ -46,9 +46,17 @@ The module can be described in different core sub-modules:
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import os
+import copy
+import bisect
 import timeit
+import hashlib
 import logging
 from os import path
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
 
 from dtocean_logistics.phases.operations import logOp_init
 from dtocean_logistics.phases.om import logPhase_om_init
@@ -58,6 +66,7 @@ from dtocean_logistics.selection.select_ve import select_e, select_v
 from dtocean_logistics.selection.match import compatibility_ve
 from dtocean_logistics.performance.optim_sol import opt_sol
 from dtocean_logistics.performance.schedule.schedule_om import sched_om
+from dtocean_logistics.performance.schedule.schedule_shared import WaitingTime
 from dtocean_logistics.performance.economic.eco import cost
 from dtocean_logistics.outputs.output_processing import out_process
 from dtocean_logistics.load.safe_factors import safety_factors
@@ -170,18 +179,81 @@ def om_logistics_main(vessels_0,
     # print 'Safety factors simulation time [s]: ' +
     # str(stop_time_sf - start_time_sf)
 
+    om_log = om_logistics_factored(vessels,
+                                   equipments,
+                                   ports,
+                                   schedule_OLC,
+                                   other_rates,
+                                   site,
+                                   metocean,
+                                   device,
+                                   sub_device,
+                                   entry_point,
+                                   layout,
+                                   collection_point,
+                                   dynamic_cable,
+                                   static_cable,
+                                   connectors,
+                                   om,
+                                   PRINT_FLAG,
+                                   optimise_delay,
+                                   custom_waiting)
+
+    return om_log
+
+
+def om_logistics_factored(vessels,
+                          equipments,
+                          ports,
+                          schedule_OLC,
+                          other_rates,
+                          site,
+                          metocean,
+                          device,
+                          sub_device,
+                          entry_point,
+                          layout,
+                          collection_point,
+                          dynamic_cable,
+                          static_cable,
+                          connectors,
+                          om,
+                          PRINT_FLAG,
+                          optimise_delay=False,
+                          custom_waiting=None,
+                          feasibility_cache=None):
+
+    """
+    Entry point of om_logistics_main for vessel, equipment and port databases
+    to which the safety factors have already been applied. The databases are
+    not modified, so they can be shared by all calls.
+
+    Parameters
+    ----------
+    vessels(DataFrame): Panda table containing the factored vessel database
+
+    equipments (DataFrame): Panda table containing the factored equipment
+        database
+
+    ports (DataFrame): Panda table containing the factored ports database
+
+    feasibility_cache (dict, optional): results of om_logistics_feasibility
+        for each static operation signature, see om_logistics_feasibility
+
+    Others as om_logistics_main.
+
+    Returns
+    -------
+
+    install (dict): as om_logistics_main
+    
+    """
+
     start_time = timeit.default_timer()
 
     if PRINT_FLAG:
         print 'START!'
 
-    # Collecting relevant port information
-
-    om_port_index = om['Port_Index [-]'].iloc[0]
-#    om_port_distance = om['Dist_port [km]'].iloc[0]
-    om_port = {}
-    om_port['Selected base port for installation'] = ports.iloc[om_port_index]
-
     # Check the presence of the lease area entry point
     
     # if this data does not exit use first position of the site data
@@ -193,54 +265,22 @@ def om_logistics_main(vessels_0,
         entry_point['soil type [-]'] = site['soil type [-]'].iloc[0]
 
 
-    # Initialising logistic operations and logistic phase
-    logOp = logOp_init(schedule_OLC)
-
-    logPhase_om = logPhase_om_init(logOp, vessels, equipments, om)
-
-    # Select the suitable Log phase id
-    log_phase_id = logPhase_select(om)
-    log_phase = logPhase_om[log_phase_id]
-    log_phase.op_ve_init = log_phase.op_ve
-
-    ## Assessing the O&M logistic phase requested
-
-    # Initialising the output dictionary to be passed to the O&M module
-    om_log = {'port': om_port,
-              'requirement': {},
-              'eq_select': {},
-              've_select': {},
-              'combi_select': {},
-              'cost': {},
-              'optimal': {},
-              'risk': {},
-              'envir': {},
-              'findSolution': {}
-              }
-
-    # Characterizing the logistic requirements
-    om_log['requirement'] = feas_om(log_phase,
-                                    log_phase_id,
-                                    om,
-                                    device,
-                                    sub_device,
-                                    collection_point,
-                                    connectors,
-                                    dynamic_cable,
-                                    static_cable)
-
-    # Selecting the maritime infrastructure satisfying the logistic
-    # requirements
-    om_log['eq_select'], log_phase = select_e(om_log, log_phase)
-    om_log['ve_select'], log_phase = select_v(om_log, log_phase)
-
-    # Matching requirements to ensure compatiblity of combinations of
-    # port/vessel(s)/equipment leading to feasible logistic solutions
-    port = om_port['Selected base port for installation']
-    
-    (om_log['combi_select'],
+    # Feasibility, selection and compatibility of the logistic solutions
+    (om_log,
      log_phase,
-     MATCH_FLAG) = compatibility_ve(om_log, log_phase, port)
+     log_phase_id,
+     MATCH_FLAG) = om_logistics_feasibility(vessels,
+                                            equipments,
+                                            ports,
+                                            schedule_OLC,
+                                            device,
+                                            sub_device,
+                                            collection_point,
+                                            dynamic_cable,
+                                            static_cable,
+                                            connectors,
+                                            om,
+                                            feasibility_cache)
 
     if MATCH_FLAG == 'NoSolutions':
         
@@ -330,3 +370,654 @@ def om_logistics_main(vessels_0,
         print 'FINISH!'
 
     return om_log
+
+
+def om_logistics_feasibility(vessels,
+                             equipments,
+                             ports,
+                             schedule_OLC,
+                             device,
+                             sub_device,
+                             collection_point,
+                             dynamic_cable,
+                             static_cable,
+                             connectors,
+                             om,
+                             feasibility_cache=None):
+
+    """
+    Characterizes the logistic requirements of an O&M operation and selects
+    the feasible combinations of port, vessels and equipment. These stages
+    do not depend on the requested start date of the operation, so, if a
+    cache is given, the results are stored for each static operation
+    signature (see get_feasibility_key) and copies of the stored results are
+    returned for later operations with the same signature. Only the parts of
+    the results which are modified by sched_om and cost are copied, see
+    _copy_feasibility.
+
+    Parameters
+    ----------
+    vessels(DataFrame): Panda table containing the factored vessel database
+
+    equipments (DataFrame): Panda table containing the factored equipment
+        database
+
+    ports (DataFrame): Panda table containing the factored ports database
+
+    om (DataFrame): operation requested by the maintenance module
+
+    feasibility_cache (dict, optional): stored results for each static
+        operation signature. Defaults to None.
+
+    Others as om_logistics_main.
+
+    Returns
+    -------
+
+    om_log (dict): logistics output dictionary with the 'port',
+        'requirement', 'eq_select', 've_select' and 'combi_select' entries
+        completed
+
+    log_phase (class): selected logistic phase
+
+    log_phase_id (str): id of the selected logistic phase
+
+    MATCH_FLAG (str): 'NoSolutions' if no compatible solution is found
+    
+    """
+
+    if feasibility_cache is not None:
+
+        key = get_feasibility_key(om)
+
+        if key in feasibility_cache:
+            return _copy_feasibility(feasibility_cache[key])
+
+    # Collecting relevant port information
+
+    om_port_index = om['Port_Index [-]'].iloc[0]
+#    om_port_distance = om['Dist_port [km]'].iloc[0]
+    om_port = {}
+    om_port['Selected base port for installation'] = ports.iloc[om_port_index]
+
+    # Initialising logistic operations and logistic phase
+    logOp = logOp_init(schedule_OLC)
+
+    logPhase_om = logPhase_om_init(logOp, vessels, equipments, om)
+
+    # Select the suitable Log phase id
+    log_phase_id = logPhase_select(om)
+    log_phase = logPhase_om[log_phase_id]
+    log_phase.op_ve_init = log_phase.op_ve
+
+    ## Assessing the O&M logistic phase requested
+
+    # Initialising the output dictionary to be passed to the O&M module
+    om_log = {'port': om_port,
+              'requirement': {},
+              'eq_select': {},
+              've_select': {},
+              'combi_select': {},
+              'cost': {},
+              'optimal': {},
+              'risk': {},
+              'envir': {},
+              'findSolution': {}
+              }
+
+    # Characterizing the logistic requirements
+    om_log['requirement'] = feas_om(log_phase,
+                                    log_phase_id,
+                                    om,
+                                    device,
+                                    sub_device,
+                                    collection_point,
+                                    connectors,
+                                    dynamic_cable,
+                                    static_cable)
+
+    # Selecting the maritime infrastructure satisfying the logistic
+    # requirements
+    om_log['eq_select'], log_phase = select_e(om_log, log_phase)
+    om_log['ve_select'], log_phase = select_v(om_log, log_phase)
+
+    # Matching requirements to ensure compatiblity of combinations of
+    # port/vessel(s)/equipment leading to feasible logistic solutions
+    port = om_port['Selected base port for installation']
+    
+    (om_log['combi_select'],
+     log_phase,
+     MATCH_FLAG) = compatibility_ve(om_log, log_phase, port)
+
+    result = (om_log, log_phase, log_phase_id, MATCH_FLAG)
+
+    if feasibility_cache is not None:
+        feasibility_cache[key] = result
+        result = _copy_feasibility(result)
+
+    return result
+
+
+def _copy_feasibility(result):
+
+    """
+    Copies a result of om_logistics_feasibility, so that it can be passed to
+    sched_om and cost without modifying the stored result. These functions
+    add the schedule and cost of each feasible solution to the solution
+    dictionaries of each vessel and equipment strategy of the logistic phase,
+    and om_logistics_factored replaces entries of om_log. Only these
+    containers are copied; the port, vessel and equipment data they refer
+    to are shared.
+
+    Parameters
+    ----------
+    result (tuple): om_log, log_phase, log_phase_id and MATCH_FLAG, as
+        returned by om_logistics_feasibility
+
+    Returns
+    -------
+
+    result (tuple): copy of result
+    
+    """
+
+    (om_log, log_phase, log_phase_id, MATCH_FLAG) = result
+
+    phase_copy = copy.copy(log_phase)
+    phase_copy.op_ve = _copy_items(log_phase.op_ve)
+
+    for strategy in _get_items(phase_copy.op_ve):
+        strategy.sol = _copy_items(strategy.sol)
+
+    # op_ve_init is set to op_ve before the selection stages
+    if getattr(log_phase, "op_ve_init", None) is log_phase.op_ve:
+        phase_copy.op_ve_init = phase_copy.op_ve
+
+    return (om_log.copy(), phase_copy, log_phase_id, MATCH_FLAG)
+
+
+def _copy_items(container):
+
+    if isinstance(container, dict):
+        return {key: copy.copy(value) for key, value in container.items()}
+
+    return [copy.copy(value) for value in container]
+
+
+def _get_items(container):
+
+    if isinstance(container, dict): return container.values()
+
+    return container
+
+
+def get_feasibility_key(om):
+
+    """
+    Returns the static signature of an O&M operation, being the values of
+    all the columns of the operation table except the requested start date
+    't_start [-]'. Missing values are replaced by None.
+
+    Parameters
+    ----------
+    om (DataFrame): operation requested by the maintenance module
+
+    Returns
+    -------
+
+    key (tuple): hashable signature of the operation
+    
+    """
+
+    key = []
+
+    for column in om.columns:
+
+        if column == 't_start [-]': continue
+
+        values = []
+
+        for value in om[column]:
+            if pd.isnull(value): value = None
+            values.append(value)
+
+        key.append((column, tuple(values)))
+
+    return tuple(key)
+
+
+def get_logistics_fingerprint(logistic_param, metocean=None):
+
+    """
+    Returns a digest of the logistics inputs which, with the requested
+    operation, determine the solution of the logistics module, i.e. the
+    site, metocean data and logistics databases.
+
+    Parameters
+    ----------
+    logistic_param (dict): Logistic_Param of inputOM
+    metocean (DataFrame): metocean time series used in place of the
+        metocean key of logistic_param. If None, the key is used
+
+    Returns
+    -------
+
+    fingerprint (str): hexadecimal digest of the inputs
+    
+    """
+
+    keys = ['vessels',
+            'equipments',
+            'ports',
+            'schedule_OLC',
+            'other_rates',
+            'site',
+            'metocean',
+            'device',
+            'sub_device',
+            'entry_point',
+            'layout',
+            'collection_point',
+            'dynamic_cable',
+            'static_cable',
+            'connectors']
+
+    digest = hashlib.sha1()
+
+    for key in keys:
+
+        if key == 'metocean' and metocean is not None:
+            value = metocean
+        else:
+            value = logistic_param.get(key)
+
+        digest.update(key)
+        _update_digest(digest, value)
+
+    return digest.hexdigest()
+
+
+def _update_digest(digest, value):
+
+    if isinstance(value, pd.DataFrame):
+
+        digest.update(repr(list(value.columns)))
+        hashes = pd.util.hash_pandas_object(value, index=True)
+        digest.update(hashes.values.tobytes())
+
+    elif isinstance(value, pd.Series):
+
+        digest.update(repr(value.name))
+        hashes = pd.util.hash_pandas_object(value, index=True)
+        digest.update(hashes.values.tobytes())
+
+    elif isinstance(value, np.ndarray):
+
+        digest.update(repr((value.dtype.str, value.shape)))
+        digest.update(np.ascontiguousarray(value).tobytes())
+
+    elif isinstance(value, dict):
+
+        for item_key in sorted(value, key=repr):
+            digest.update(repr(item_key))
+            _update_digest(digest, value[item_key])
+
+    elif isinstance(value, (list, tuple)):
+
+        digest.update(repr(len(value)))
+
+        for item in value:
+            _update_digest(digest, item)
+
+    else:
+
+        digest.update(repr(value))
+
+    return
+
+
+def get_olc_limits(values):
+
+    """
+    Converts the maximum Hs, Tp, Ws and Cs of a set of operational limit
+    conditions (OLC) to a hashable tuple of floats. Missing or non-numeric
+    values, which do not limit the operation, are replaced by None.
+
+    Parameters
+    ----------
+    values (sequence): maximum Hs, Tp, Ws and Cs
+
+    Returns
+    -------
+
+    limits (tuple): maximum Hs, Tp, Ws and Cs or None
+    
+    """
+
+    limits = []
+
+    for value in values:
+
+        try:
+            limit = float(value)
+        except (TypeError, ValueError):
+            limit = None
+
+        if limit is not None and np.isnan(limit): limit = None
+
+        limits.append(limit)
+
+    return tuple(limits)
+
+
+class IndexedWaitingTime(WaitingTime):
+    
+    """WaitingTime which looks up the next weather window of a set of
+    operational limit conditions (OLC) in a sorted index of the feasible
+    windows of the metocean time series, using a binary search, rather than
+    searching the time series for every operation. An index is built once
+    for each set of limits and is shared by all operation durations.
+    
+    Requests which the index can not answer, i.e. start dates outside of the
+    time series or operations with no later window in the time series, are
+    passed to WaitingTime.
+    
+    Args:
+        metocean (DataFrame): metocean time series with the 'year [-]',
+            'month [-]', 'day [-]', 'hour [-]', 'Hs [m]', 'Tp [s]',
+            'Ws [m/s]' and 'Cs [m/s]' columns, in date order
+        limits (list of tuple): sets of maximum Hs, Tp, Ws and Cs, see
+            get_olc_limits, for which the windows are found on
+            construction. The windows of other sets are found when first
+            requested.
+    
+    Attributes:
+        _origin (datetime.datetime): date of the first record
+        _hours (numpy.ndarray) [hour]: time of each record from the origin
+        _values (numpy.ndarray): Hs, Tp, Ws and Cs of each record, in the
+            dtype of the metocean table
+        _time_step (float) [hour]: duration of each record
+        _windows (dict): sorted start and end times of the feasible windows
+            and the position of the next longer window, for each set of
+            limits
+    """
+    
+    def __init__(self, metocean, limits=None):
+        
+        super(IndexedWaitingTime, self).__init__(metocean)
+        
+        dates = pd.to_datetime(pd.DataFrame(
+                                        {'year': metocean['year [-]'],
+                                         'month': metocean['month [-]'],
+                                         'day': metocean['day [-]'],
+                                         'hour': metocean['hour [-]']}))
+        
+        self._origin = dates.iloc[0].to_pydatetime()
+        self._hours = ((dates - dates.iloc[0]) /
+                                        np.timedelta64(1, 'h')).values
+        self._values = metocean[_olc_columns].values
+        
+        # Limits are compared in the stored dtype, as float32 values of a
+        # MappedMetocean may be larger than the float64 value of the limit
+        if not np.issubdtype(self._values.dtype, np.floating):
+            self._values = self._values.astype(float)
+        
+        if len(self._hours) > 1:
+            self._time_step = float(np.median(np.diff(self._hours)))
+        else:
+            self._time_step = 1.
+        
+        self._windows = {}
+        
+        if limits is None: return
+        
+        for olc_limits in limits:
+            self._get_windows(olc_limits)
+        
+        return
+    
+    def __call__(self, olc, duration, start_date):
+        
+        window = self.get_window(olc, duration, start_date)
+        
+        if window is None:
+            return super(IndexedWaitingTime, self).__call__(olc,
+                                                            duration,
+                                                            start_date)
+        
+        return window
+    
+    def get_window(self, olc, duration, start_date):
+        
+        """Find the first weather window of the given limits, at or after
+        the given date, which is at least as long as the given duration.
+        
+        Args:
+            olc (dict): operational limit conditions with the 'maxHs',
+                'maxTp', 'maxWs' and 'maxCs' keys
+            duration (float) [hour]: duration of the operation
+            start_date (datetime.datetime): requested start date
+        
+        Returns:
+            start (datetime.datetime): start date of the operation
+            waiting_time (float) [hour]: time from the requested start date
+                to the start of the operation
+            
+            or None if no window is found in the time series
+        """
+        
+        limits = get_olc_limits([olc[key] for key in _olc_keys])
+        time = (start_date - self._origin).total_seconds() / 3600.
+        
+        if time < 0 or time >= self._hours[-1] + self._time_step:
+            return None
+        
+        starts, ends, next_longer = self._get_windows(limits)
+        
+        # Last window starting at or before the requested date
+        i = bisect.bisect_right(starts, time) - 1
+        
+        if i >= 0 and ends[i] - time >= duration:
+            
+            waiting_time = 0.
+        
+        else:
+            
+            # Windows between a window and the next longer window are no
+            # longer than it, so they are skipped
+            j = i + 1
+            
+            while j < len(starts) and ends[j] - starts[j] < duration:
+                j = next_longer[j]
+            
+            if j == len(starts): return None
+            
+            waiting_time = starts[j] - time
+        
+        start = start_date + timedelta(hours=waiting_time)
+        
+        return start, waiting_time
+    
+    def _get_windows(self, limits):
+        
+        if limits in self._windows: return self._windows[limits]
+        
+        feasible = np.ones(len(self._hours), dtype=bool)
+        
+        with np.errstate(invalid='ignore'):
+            
+            for i, limit in enumerate(limits):
+                if limit is None: continue
+                limit = self._values.dtype.type(limit)
+                feasible &= self._values[:, i] <= limit
+        
+        feasible_idx = np.flatnonzero(feasible)
+        
+        if len(feasible_idx) == 0:
+            
+            windows = ([], [], [])
+            self._windows[limits] = windows
+            
+            return windows
+        
+        # Windows are split by infeasible records and gaps in the series
+        gaps = ~np.isclose(np.diff(self._hours[feasible_idx]),
+                           self._time_step)
+        split_idx = np.flatnonzero(gaps)
+        
+        first = feasible_idx[np.r_[0, split_idx + 1]]
+        last = feasible_idx[np.r_[split_idx, len(feasible_idx) - 1]]
+        
+        starts = self._hours[first].tolist()
+        ends = (self._hours[last] + self._time_step).tolist()
+        
+        # Position of the next window which is longer than each window, or
+        # the number of windows if there is none
+        lengths = [end - start for start, end in zip(starts, ends)]
+        next_longer = [len(lengths)] * len(lengths)
+        shorter = []
+        
+        for j, length in enumerate(lengths):
+            
+            while shorter and lengths[shorter[-1]] < length:
+                next_longer[shorter.pop()] = j
+            
+            shorter.append(j)
+        
+        windows = (starts, ends, next_longer)
+        self._windows[limits] = windows
+        
+        return windows
+
+
+class MappedMetocean(pd.DataFrame):
+    
+    """Metocean time series whose date and Hs, Tp, Ws and Cs columns are
+    views of memory mapped files, written by save_mapped_metocean. When
+    pickled, only the directory of the files is stored, so all the processes
+    which unpickle the table share one physical copy of the data.
+    
+    Tables derived from a MappedMetocean are ordinary DataFrames.
+    """
+    
+    _metadata = ['_mapped_path']
+    
+    @property
+    def _constructor(self):
+        
+        return pd.DataFrame
+    
+    def __reduce__(self):
+        
+        return (load_mapped_metocean, (self._mapped_path,))
+    
+    def get_mapped_path(self):
+        
+        return self._mapped_path
+
+
+def save_mapped_metocean(metocean, dir_path):
+    
+    """
+    Writes the date columns of a metocean time series as int32 values and
+    the Hs, Tp, Ws and Cs columns as float32 values to memory mappable files
+    and returns the mapped table. A ValueError is raised if the time series
+    has any other columns. The files are written to temporary paths first, so
+    processes which have mapped previous files are not affected.
+
+    Parameters
+    ----------
+    metocean (DataFrame): metocean time series with the 'year [-]',
+        'month [-]', 'day [-]', 'hour [-]', 'Hs [m]', 'Tp [s]', 'Ws [m/s]'
+        and 'Cs [m/s]' columns
+
+    dir_path (str): directory of the files
+
+    Returns
+    -------
+
+    mapped (MappedMetocean): table read from the files
+    
+    """
+
+    mapped_keys = [key for _, keys, _ in _mapped_metocean_files
+                                                            for key in keys]
+    other_keys = [key for key in metocean.columns if key not in mapped_keys]
+
+    if other_keys:
+
+        errMsg = ("Metocean columns {} can not be "
+                  "mapped").format(", ".join(str(x) for x in other_keys))
+        raise ValueError(errMsg)
+
+    if not os.path.isdir(dir_path): os.makedirs(dir_path)
+
+    for file_name, keys, dtype in _mapped_metocean_files:
+
+        file_path = os.path.join(dir_path, file_name)
+        temp_path = "{}.{}.tmp".format(file_path, os.getpid())
+
+        values = np.lib.format.open_memmap(temp_path,
+                                           mode='w+',
+                                           dtype=dtype,
+                                           shape=(len(metocean), len(keys)))
+
+        for i, key in enumerate(keys):
+            values[:, i] = metocean[key].values.astype(dtype)
+
+        values.flush()
+        del values
+
+        try:
+            os.rename(temp_path, file_path)
+        except OSError:
+            # Windows will not rename over an existing file
+            if not os.path.isfile(file_path): raise
+            os.remove(file_path)
+            os.rename(temp_path, file_path)
+
+    return load_mapped_metocean(dir_path)
+
+
+def load_mapped_metocean(dir_path):
+    
+    """
+    Maps the files written by save_mapped_metocean. The pages of the files
+    are copied on write, so the files are never modified.
+
+    Parameters
+    ----------
+    dir_path (str): directory of the files
+
+    Returns
+    -------
+
+    mapped (MappedMetocean): table of views of the mapped files
+    
+    """
+
+    tables = []
+
+    for file_name, keys, _ in _mapped_metocean_files:
+
+        file_path = os.path.join(dir_path, file_name)
+        values = np.load(file_path, mmap_mode='c')
+
+        tables.append(pd.DataFrame(values, columns=keys, copy=False))
+
+    mapped = MappedMetocean(pd.concat(tables, axis=1, copy=False),
+                            copy=False)
+    mapped._mapped_path = dir_path
+
+    return mapped
+
+
+_mapped_metocean_files = [("metocean_dates.npy",
+                           ['year [-]', 'month [-]', 'day [-]', 'hour [-]'],
+                           np.int32),
+                          ("metocean_values.npy",
+                           ['Hs [m]', 'Tp [s]', 'Ws [m/s]', 'Cs [m/s]'],
+                           np.float32)]
+
+_olc_keys = ['maxHs', 'maxTp', 'maxWs', 'maxCs']
+_olc_columns = ['Hs [m]', 'Tp [s]', 'Ws [m/s]', 'Cs [m/s]']
@@ -26,12 +26,18 @@
 """
 
 # Standard modules
+import os
 import copy
 import math
+import time
 import string
 import timeit
+import bisect
 import logging
 import datetime
+import traceback
+import multiprocessing
+from collections import defaultdict
 from datetime import timedelta
 
 # 3rd party modules
@@ -39,32 +45,44 @@ import numpy as np
 import pandas as pd
 
 # DTOcean modules
-from dtocean_logistics.feasibility.feasability_om import feas_om
 from dtocean_logistics.load.safe_factors import safety_factors
-from dtocean_logistics.performance.schedule.schedule_shared import WaitingTime
 from dtocean_logistics.phases import select_port_OM
-from dtocean_logistics.phases.om import logPhase_om_init
-from dtocean_logistics.phases.om.select_logPhase import logPhase_select
-from dtocean_logistics.phases.operations import logOp_init
-from dtocean_logistics.selection.select_ve import select_e, select_v
-from dtocean_logistics.selection.match import compatibility_ve
 from dtocean_reliability.main import Variables, Main
 
 # Internal modules
-from .array import Array
-from .logistics import om_logistics_main
+from .array import Array, get_ram_table
+from .input import inputOM
+from .logistics import (IndexedWaitingTime,
+                        MappedMetocean,
+                        get_logistics_fingerprint,
+                        get_olc_limits,
+                        om_logistics_factored,
+                        om_logistics_feasibility,
+                        save_mapped_metocean)
 from .static import (Availability,
+                     ConvergenceMonitor,
+                     CorrectiveEventQueue,
                      Energy,
+                     EventTablesStore,
+                     JobQueue,
+                     LogisticsCache,
+                     StatisticsAccumulator,
                      get_uptime_df,
                      get_device_energy_df,
                      get_opex_per_year,
                      get_opex_lcoe,
                      get_number_of_journeys,
-                     poisson_process)
+                     get_parameter_records,
+                     get_random_state,
+                     poisson_process,
+                     _to_pickle_atomic)
 
 # Set up logging
 module_logger = logging.getLogger(__name__)
 
+# Per process state for parallel data point calculation
+_worker_state = {}
+
 
 class LCOE_Statistics(object):
     
@@ -73,124 +91,1643 @@ class LCOE_Statistics(object):
     Args:
         inputOMPtr (class): pointer of class inputOM
 
-    Attributes:
-        self.__inputOMPTR (class): Instance pointer of inputOM
-    """
+    Attributes:
+        self.__inputOMPTR (class): Instance pointer of inputOM
+    """
+
+    def __init__(self, inputOMPtr):
+
+        # Instance pointer of inputOM
+        self.__inputOMPtr = inputOMPtr
+
+        return
+
+    def __call__(self):
+
+        '''__call__ function: call function
+
+        Returns:
+            output_dict (dict): Output of WP6
+
+        '''
+
+        output_dict = self.main()
+            
+        return output_dict
+
+    def main(self):
+
+        '''Calls LCOE_Calculator for the calculation of of O&M plan for the
+        required population size and accumulates the results.
+
+        Returns:
+            output_dict (dict): Output of WP6
+
+        '''
+
+        control_param = self.__inputOMPtr.get_Control_Param()
+
+        # Population size
+        n_sims = control_param['numberOfSimulations']
+        
+        if n_sims < 1:
+            
+            errMsg = ("At least one data point must be evaluated; however, "
+                      "parameter numberOfSimulations is set to "
+                      "{}").format(n_sims)
+            raise ValueError(errMsg)
+        
+        # Number of worker processes
+        if ("numberOfWorkers" in control_param and
+            control_param["numberOfWorkers"] is not None):
+            
+            n_workers = control_param["numberOfWorkers"]
+        
+        else:
+        
+            n_workers = 1
+            
+        if n_workers < 1:
+            
+            errMsg = ("At least one worker process is required; however, "
+                      "parameter numberOfWorkers is set to "
+                      "{}").format(n_workers)
+            raise ValueError(errMsg)
+        
+        # Master seed for the random number streams of the data points
+        if ("randomSeed" in control_param and
+            control_param["randomSeed"] is not None):
+            
+            seed = control_param["randomSeed"]
+            
+            if (not isinstance(seed, (int, long, np.integer)) or
+                isinstance(seed, bool) or
+                not 0 <= seed < 2 ** 32):
+                
+                errMsg = ("Parameter randomSeed must be an integer between 0 "
+                          "and 2 ** 32 - 1; however, it is set to "
+                          "{}").format(seed)
+                raise ValueError(errMsg)
+        
+        else:
+            
+            seed = None
+        
+        # Checkpoints
+        if ("checkpointPath" in control_param and
+            control_param["checkpointPath"] is not None):
+            
+            checkpoint_path = control_param["checkpointPath"]
+        
+        else:
+            
+            checkpoint_path = None
+        
+        if ("checkpointInterval" in control_param and
+            control_param["checkpointInterval"] is not None):
+            
+            checkpoint_interval = control_param["checkpointInterval"]
+        
+        else:
+            
+            checkpoint_interval = 10
+        
+        if checkpoint_interval < 1:
+            
+            errMsg = ("At least one data point is required between "
+                      "checkpoints; however, parameter checkpointInterval "
+                      "is set to {}").format(checkpoint_interval)
+            raise ValueError(errMsg)
+        
+        if ("resumeFromCheckpoint" in control_param and
+            control_param["resumeFromCheckpoint"] is not None):
+            
+            resume = control_param["resumeFromCheckpoint"]
+        
+        else:
+            
+            resume = False
+        
+        # Write the event tables of each data point once, so that the
+        # checkpoints only hold handles to them
+        if (checkpoint_path is not None and
+            ("eventTablesPath" not in control_param or
+             control_param["eventTablesPath"] is None)):
+            
+            checkpoint_tables_path = os.path.join(checkpoint_path,
+                                                  "eventTables")
+        
+        else:
+            
+            checkpoint_tables_path = None
+        
+        # Distributed calculation using a job queue
+        if ("jobQueuePath" in control_param and
+            control_param["jobQueuePath"] is not None):
+            
+            queue_path = control_param["jobQueuePath"]
+        
+        else:
+            
+            queue_path = None
+        
+        if ("jobQueueLeaseTime" in control_param and
+            control_param["jobQueueLeaseTime"] is not None):
+            
+            lease_time = control_param["jobQueueLeaseTime"]
+        
+        else:
+            
+            lease_time = 60.
+        
+        if ("jobQueueTimeout" in control_param and
+            control_param["jobQueueTimeout"] is not None):
+            
+            queue_timeout = control_param["jobQueueTimeout"]
+        
+        else:
+            
+            queue_timeout = None
+        
+        # Adaptive population size. numberOfSimulations becomes the maximum
+        if ("convergenceHalfWidth" in control_param and
+            control_param["convergenceHalfWidth"] is not None):
+            
+            if ("convergenceConfidence" in control_param and
+                control_param["convergenceConfidence"] is not None):
+                
+                confidence = control_param["convergenceConfidence"]
+            
+            else:
+                
+                confidence = 0.95
+            
+            if ("convergenceMinSimulations" in control_param and
+                control_param["convergenceMinSimulations"] is not None):
+                
+                min_sims = control_param["convergenceMinSimulations"]
+            
+            else:
+                
+                min_sims = 10
+            
+            convergence = {
+                "convergenceHalfWidth": control_param["convergenceHalfWidth"],
+                "convergenceConfidence": confidence,
+                "convergenceMinSimulations": min_sims}
+            
+            monitor = ConvergenceMonitor(
+                                control_param["convergenceHalfWidth"],
+                                confidence,
+                                min_sims)
+        
+        else:
+            
+            convergence = {"convergenceHalfWidth": None,
+                           "convergenceConfidence": None,
+                           "convergenceMinSimulations": None}
+            monitor = None
+        
+        accumulator = StatisticsAccumulator(n_sims)
+        
+        if (checkpoint_path is not None and resume and
+            os.path.isfile(self.__get_checkpoint_file(checkpoint_path))):
+            
+            (accumulator,
+             monitor) = self.__load_checkpoint(checkpoint_path,
+                                               n_sims,
+                                               seed,
+                                               convergence,
+                                               monitor)
+        
+        n_start = accumulator.get_n_points()
+        
+        if monitor is not None and monitor.is_converged():
+            n_start = n_sims
+        
+        # Share a memory mapped copy of the metocean time series. The copy is
+        # only used by this run.
+        mapped_metocean = None
+        
+        if ("metoceanMemmapPath" in control_param and
+            control_param["metoceanMemmapPath"] is not None):
+            
+            logistic_param = self.__inputOMPtr.get_Logistic_Param()
+            metocean = logistic_param['metocean']
+            
+            if not isinstance(metocean, MappedMetocean):
+                
+                mapped_metocean = save_mapped_metocean(
+                                        metocean,
+                                        control_param["metoceanMemmapPath"])
+                
+                msg = ('Mapped metocean time series to directory '
+                       '{}').format(control_param["metoceanMemmapPath"])
+                module_logger.info(msg)
+        
+        # Calculate the results which are common to all data points
+        context = LCOE_Context(self.__inputOMPtr)
+                
+        # Run simulations and collect results
+        if queue_path is None:
+            
+            data_points = self.__get_data_points(n_start,
+                                                 n_sims,
+                                                 n_workers,
+                                                 context,
+                                                 mapped_metocean)
+        
+        else:
+            
+            data_points = self.__get_queued_data_points(n_start,
+                                                        n_sims,
+                                                        queue_path,
+                                                        context,
+                                                        lease_time,
+                                                        queue_timeout,
+                                                        mapped_metocean)
+        
+        for data_point in data_points:
+            
+            if checkpoint_tables_path is not None:
+                data_point = _store_event_tables(checkpoint_tables_path,
+                                                 accumulator.get_n_points(),
+                                                 data_point)
+            
+            accumulator.add_data_point(data_point)
+            n_points = accumulator.get_n_points()
+            
+            if monitor is not None and monitor.update(data_point):
+                
+                msg = ('Statistics converged after {} data '
+                       'points').format(n_points)
+                module_logger.info(msg)
+                
+                break
+            
+            if (checkpoint_path is not None and
+                n_points % checkpoint_interval == 0):
+                
+                self.__save_checkpoint(checkpoint_path,
+                                       n_sims,
+                                       seed,
+                                       convergence,
+                                       accumulator,
+                                       monitor)
+        
+        # Stop any outstanding calculations
+        data_points.close()
+        
+        if checkpoint_path is not None:
+            
+            self.__save_checkpoint(checkpoint_path,
+                                   n_sims,
+                                   seed,
+                                   convergence,
+                                   accumulator,
+                                   monitor)
+        
+        output_dict = accumulator.get_output()
+        
+        if monitor is not None:
+            output_dict["convergenceTrace [-]"] = monitor.get_trace_df()
+                    
+        return output_dict
+    
+    def execute_data_point(self, sim_number,
+                                 custom_waiting=None,
+                                 context=None,
+                                 logistics_cache=None,
+                                 metocean=None):
+        
+        '''Calculate a single data point of the statistical population. If
+        the randomSeed parameter is set, the data point is reproducible and
+        can be recalculated in isolation. If the eventTablesPath parameter is
+        set, the event tables are written to disk and replaced by a
+        StoredEventTables handle.
+
+        Args:
+            sim_number (int) [-]: index of the data point
+            custom_waiting (WaitingTime) [-]: shared WaitingTime instance.
+                If None, a new IndexedWaitingTime instance is created.
+            context (LCOE_Context) [-]: shared deterministic results. If
+                None, a new instance is created.
+            logistics_cache (LogisticsCache) [-]: shared store of logistics
+                solutions. If None, the solutions are not stored.
+            metocean (DataFrame) [-]: metocean time series used in place of
+                the metocean of Logistic_Param. If None, Logistic_Param is
+                used.
+
+        Returns:
+            data_point (dict): output of LCOE_Calculator.executeCalc
+
+        '''
+        
+        control_param = self.__inputOMPtr.get_Control_Param()
+        
+        if ("randomSeed" in control_param and
+            control_param["randomSeed"] is not None):
+            
+            seed = control_param["randomSeed"]
+        
+        else:
+        
+            seed = None
+        
+        if custom_waiting is None:
+            
+            custom_waiting = _get_waiting_time(self.__get_metocean(metocean),
+                                               context)
+        
+        msg = ('Executing data point number {}').format(sim_number)
+        module_logger.info(msg)
+        
+        random_state = get_random_state(seed, sim_number)
+        calculator = LCOE_Calculator(self.__inputOMPtr,
+                                     custom_waiting=custom_waiting,
+                                     random_state=random_state,
+                                     context=context,
+                                     logistics_cache=logistics_cache,
+                                     metocean=metocean)
+        data_point = calculator.executeCalc()
+        
+        if logistics_cache is not None:
+            
+            stats = logistics_cache.get_stats()
+            
+            msg = ('Logistics cache hit rate {:.1%} ({} hits, {} misses, {} '
+                   'solutions)').format(stats["hitRate"],
+                                        stats["hits"],
+                                        stats["misses"],
+                                        stats["size"])
+            module_logger.info(msg)
+        
+        # Replace the event tables with a handle to the stored copy
+        if ("eventTablesPath" in control_param and
+            control_param["eventTablesPath"] is not None):
+            
+            data_point = _store_event_tables(control_param["eventTablesPath"],
+                                             sim_number,
+                                             data_point)
+        
+        return data_point
+    
+    def __get_data_points(self, n_start,
+                                n_sims,
+                                n_workers,
+                                context,
+                                metocean=None):
+        
+        '''Generate the results of each data point, in order, either serially
+        or using a pool of worker processes.
+
+        Args:
+            n_start (int) [-]: index of the first data point to calculate
+            n_sims (int) [-]: total number of data points
+            n_workers (int) [-]: number of worker processes
+            context (LCOE_Context) [-]: shared deterministic results
+            metocean (DataFrame) [-]: metocean time series used in place of
+                the metocean of Logistic_Param, or None
+
+        Returns:
+            data_points (generator): output of LCOE_Calculator.executeCalc
+                for each data point
+
+        '''
+        
+        if n_workers == 1:
+            
+            # Use a single WaitingTime class for all simulations
+            custom_waiting = _get_waiting_time(self.__get_metocean(metocean),
+                                               context)
+            
+            # Use a single store of logistics solutions, if requested
+            logistics_cache = _get_logistics_cache(self.__inputOMPtr,
+                                                   metocean)
+            
+            try:
+                
+                for sim_number in xrange(n_start, n_sims):
+                    yield self.execute_data_point(sim_number,
+                                                  custom_waiting,
+                                                  context,
+                                                  logistics_cache,
+                                                  metocean)
+            
+            finally:
+                
+                _save_logistics_cache(logistics_cache)
+                
+            return
+        
+        msg = ('Executing {} data points using {} worker '
+               'processes').format(n_sims - n_start, n_workers)
+        module_logger.info(msg)
+        
+        # Collect the new logistics solutions of the workers for saving
+        logistics_cache = _get_logistics_cache(self.__inputOMPtr, metocean)
+        
+        # Only pass the mapped copy of the metocean time series
+        if metocean is None:
+            worker_input = self.__inputOMPtr
+        else:
+            worker_input = _get_metocean_input(self.__inputOMPtr, metocean)
+        
+        pool = multiprocessing.Pool(n_workers,
+                                    _init_worker,
+                                    (worker_input, context, metocean))
+        
+        try:
+            
+            # imap returns the results in the order of the data points
+            for sim_number, (data_point, solutions) in enumerate(
+                                    pool.imap(_execute_data_point,
+                                              xrange(n_start, n_sims)),
+                                    n_start):
+                
+                msg = ('Collected data point number {}').format(sim_number)
+                module_logger.info(msg)
+                
+                if solutions: logistics_cache.update(solutions)
+                
+                yield data_point
+            
+            pool.close()
+        
+        finally:
+            
+            pool.terminate()
+            pool.join()
+            _save_logistics_cache(logistics_cache)
+        
+        return
+    
+    def __get_queued_data_points(self, n_start,
+                                       n_sims,
+                                       queue_path,
+                                       context,
+                                       lease_time=60.,
+                                       timeout=None,
+                                       metocean=None):
+        
+        '''Publish the data points to a job queue and generate the results,
+        in order, as they are returned by the queue workers. Outstanding
+        tasks are removed from the queue when the generator is closed.
+
+        Args:
+            n_start (int) [-]: index of the first data point to calculate
+            n_sims (int) [-]: total number of data points
+            queue_path (str) [-]: job queue directory
+            context (LCOE_Context) [-]: shared deterministic results
+            lease_time (float) [s]: time after which the unrenewed claims of
+                the queue workers are returned to the queue
+            timeout (float) [s]: maximum time to wait for each data point,
+                or None to wait indefinitely
+            metocean (MappedMetocean) [-]: metocean time series used in
+                place of the metocean of Logistic_Param, or None. It is
+                published in place of the Logistic_Param time series.
+
+        Returns:
+            data_points (generator): output of LCOE_Calculator.executeCalc
+                for each data point
+
+        '''
+        
+        # Collect the new logistics solutions of the workers for saving
+        logistics_cache = _get_logistics_cache(self.__inputOMPtr, metocean)
+        
+        # Only publish the mapped copy of the metocean time series
+        if metocean is None:
+            job_input = self.__inputOMPtr
+        else:
+            job_input = _get_metocean_input(self.__inputOMPtr, metocean)
+        
+        queue = JobQueue(queue_path, lease_time=lease_time)
+        job = {"inputOM": job_input,
+               "context": context,
+               "metocean": metocean}
+        
+        job_id = queue.publish(job, xrange(n_start, n_sims))
+        
+        msg = ('Published {} data points to job queue '
+               '{}').format(n_sims - n_start, queue_path)
+        module_logger.info(msg)
+        
+        try:
+            
+            for sim_number in xrange(n_start, n_sims):
+                
+                result = queue.wait_for_result(job_id, sim_number, timeout)
+                
+                if result["error"] is not None:
+                    
+                    errMsg = ("Data point number {} failed in a job queue "
+                              "worker:\n{}").format(sim_number,
+                                                     result["error"])
+                    raise RuntimeError(errMsg)
+                
+                msg = ('Collected data point number {}').format(sim_number)
+                module_logger.info(msg)
+                
+                if result["logistics_solutions"]:
+                    logistics_cache.update(result["logistics_solutions"])
+                
+                yield result["data_point"]
+        
+        finally:
+            
+            queue.clear()
+            _save_logistics_cache(logistics_cache)
+        
+        return
+    
+    def __get_metocean(self, metocean=None):
+        
+        if metocean is not None: return metocean
+        
+        logistic_param = self.__inputOMPtr.get_Logistic_Param()
+        
+        return logistic_param['metocean']
+    
+    @classmethod
+    def __get_checkpoint_file(cls, checkpoint_path):
+        
+        return os.path.join(checkpoint_path, "checkpoint.pkl")
+    
+    @classmethod
+    def __save_checkpoint(cls, checkpoint_path,
+                               n_sims,
+                               seed,
+                               convergence,
+                               accumulator,
+                               monitor):
+        
+        '''Save the accumulated results of the completed data points. The
+        checkpoint is written to a temporary file first, so an interrupted
+        write never corrupts the previous checkpoint.
+
+        Args:
+            checkpoint_path (str) [-]: checkpoint directory
+            n_sims (int) [-]: number of data points requested
+            seed (int) [-]: master random seed
+            convergence (dict) [-]: convergence control parameters
+            accumulator (StatisticsAccumulator) [-]: accumulated results
+            monitor (ConvergenceMonitor) [-]: convergence monitor or None
+
+        '''
+        
+        if not os.path.isdir(checkpoint_path):
+            os.makedirs(checkpoint_path)
+        
+        checkpoint = {"numberOfSimulations": n_sims,
+                      "randomSeed": seed,
+                      "accumulator": accumulator,
+                      "monitor": monitor}
+        checkpoint.update(convergence)
+        
+        checkpoint_file = cls.__get_checkpoint_file(checkpoint_path)
+        _to_pickle_atomic(checkpoint, checkpoint_file)
+        
+        msg = ('Saved checkpoint after {} data '
+               'points').format(accumulator.get_n_points())
+        module_logger.info(msg)
+        
+        return
+    
+    @classmethod
+    def __load_checkpoint(cls, checkpoint_path,
+                               n_sims,
+                               seed,
+                               convergence,
+                               monitor):
+        
+        '''Load the accumulated results of a previous run.
+
+        Args:
+            checkpoint_path (str) [-]: checkpoint directory
+            n_sims (int) [-]: number of data points requested
+            seed (int) [-]: master random seed
+            convergence (dict) [-]: convergence control parameters
+            monitor (ConvergenceMonitor) [-]: convergence monitor or None
+
+        Returns:
+            accumulator (StatisticsAccumulator) [-]: accumulated results
+            monitor (ConvergenceMonitor) [-]: convergence monitor or None
+
+        '''
+        
+        checkpoint_file = cls.__get_checkpoint_file(checkpoint_path)
+        checkpoint = pd.read_pickle(checkpoint_file)
+        
+        convergence_changed = any(checkpoint.get(key) != value
+                                      for key, value in convergence.items())
+        
+        if (checkpoint["numberOfSimulations"] != n_sims or
+            checkpoint["randomSeed"] != seed or
+            convergence_changed or
+            (checkpoint["monitor"] is None) != (monitor is None)):
+            
+            errMsg = ("Checkpoint {} was created with different "
+                      "statistical parameters").format(checkpoint_file)
+            raise ValueError(errMsg)
+        
+        accumulator = checkpoint["accumulator"]
+        
+        msg = ('Resuming from checkpoint after {} data '
+               'points').format(accumulator.get_n_points())
+        module_logger.info(msg)
+        
+        return accumulator, checkpoint["monitor"]
+
+
+def _init_worker(inputOMPtr, context, metocean=None):
+    
+    '''Initialise a worker process for the parallel calculation of data
+    points.
+
+    Args:
+        inputOMPtr (class): pointer of class inputOM
+        context (LCOE_Context): shared deterministic results
+        metocean (DataFrame): metocean time series used in place of the
+            metocean of Logistic_Param, or None
+
+    '''
+    
+    if metocean is None:
+        waiting_metocean = inputOMPtr.get_Logistic_Param()['metocean']
+    else:
+        waiting_metocean = metocean
+    
+    _worker_state["statistics"] = LCOE_Statistics(inputOMPtr)
+    _worker_state["custom_waiting"] = _get_waiting_time(waiting_metocean,
+                                                        context)
+    _worker_state["context"] = context
+    _worker_state["logistics_cache"] = _get_logistics_cache(inputOMPtr,
+                                                            metocean)
+    _worker_state["metocean"] = metocean
+    
+    return
+
+
+def _execute_data_point(sim_number):
+    
+    '''Calculate a single data point in a worker process.
+
+    Args:
+        sim_number (int) [-]: index of the data point
+
+    Returns:
+        data_point (dict): output of LCOE_Calculator.executeCalc
+        solutions (list): logistics solutions added by the data point, to be
+            saved by the coordinating process, or None if they are not saved
+
+    '''
+    
+    statistics = _worker_state["statistics"]
+    logistics_cache = _worker_state["logistics_cache"]
+    
+    data_point = statistics.execute_data_point(
+                                sim_number,
+                                _worker_state["custom_waiting"],
+                                _worker_state["context"],
+                                logistics_cache,
+                                _worker_state["metocean"])
+    
+    if (logistics_cache is not None and
+        logistics_cache.get_file_path() is not None):
+        
+        solutions = logistics_cache.pop_new_solutions()
+    
+    else:
+        
+        solutions = None
+    
+    return data_point, solutions
+
+
+def _store_event_tables(path, sim_number, data_point):
+    
+    '''Write the event tables of a data point to an EventTablesStore and
+    replace them with a handle to the stored copy. Data points without event
+    tables, or whose tables are already stored, are returned unchanged.
+
+    Args:
+        path (str): directory of the EventTablesStore
+        sim_number (int) [-]: index of the data point
+        data_point (dict): output of LCOE_Calculator.executeCalc
+
+    Returns:
+        data_point (dict): output of LCOE_Calculator.executeCalc with a
+            StoredEventTables handle in place of the event tables
+
+    '''
+    
+    if not isinstance(data_point['eventTables [-]'], dict):
+        return data_point
+    
+    store = EventTablesStore(path)
+    handle = store.add_data_point(sim_number, data_point)
+    
+    data_point = data_point.copy()
+    data_point['eventTables [-]'] = handle
+    
+    return data_point
+
+
+def _get_waiting_time(metocean, context=None):
+    
+    '''Create the WaitingTime instance shared by the data points calculated
+    by a process. The weather windows of the operational limits of the
+    repair actions and inspections of the context are indexed on creation.
+
+    Args:
+        metocean (DataFrame): metocean time series
+        context (LCOE_Context): shared deterministic results or None
+
+    Returns:
+        custom_waiting (IndexedWaitingTime): shared WaitingTime instance
+
+    '''
+    
+    if context is None:
+        limits = None
+    else:
+        limits = context.get_olcLimits()
+    
+    return IndexedWaitingTime(metocean, limits)
+
+
+def _get_logistics_cache(inputOMPtr, metocean=None):
+    
+    '''Create the store of logistics solutions requested by the
+    logisticsCacheSize and logisticsCachePath parameters. If a file is given,
+    the stored solutions are fingerprinted with the logistics inputs.
+
+    Args:
+        inputOMPtr (class): pointer of class inputOM
+        metocean (DataFrame): metocean time series used in place of the
+            metocean of Logistic_Param, or None
+
+    Returns:
+        logistics_cache (LogisticsCache): store of logistics solutions or
+            None if logisticsCacheSize is not set
+
+    '''
+    
+    control_param = inputOMPtr.get_Control_Param()
+    
+    if ("logisticsCacheSize" not in control_param or
+        control_param["logisticsCacheSize"] is None):
+        
+        return None
+    
+    if ("logisticsCachePath" in control_param and
+        control_param["logisticsCachePath"] is not None):
+        
+        cache_path = control_param["logisticsCachePath"]
+    
+    else:
+        
+        cache_path = None
+    
+    if cache_path is not None:
+        
+        logistic_param = inputOMPtr.get_Logistic_Param()
+        fingerprint = get_logistics_fingerprint(logistic_param, metocean)
+    
+    else:
+        
+        fingerprint = None
+    
+    logistics_cache = LogisticsCache(control_param["logisticsCacheSize"],
+                                     cache_path,
+                                     fingerprint)
+    
+    return logistics_cache
+
+
+def _save_logistics_cache(logistics_cache):
+    
+    '''Save a store of logistics solutions, if it has a file path.
+
+    Args:
+        logistics_cache (LogisticsCache): store of logistics solutions or
+            None
+
+    '''
+    
+    if logistics_cache is None or logistics_cache.get_file_path() is None:
+        return
+    
+    logistics_cache.save()
+    
+    msg = ('Saved {} logistics solutions to file '
+           '{}').format(len(logistics_cache), logistics_cache.get_file_path())
+    module_logger.info(msg)
+    
+    return
+
+
+def _get_metocean_input(inputOMPtr, metocean):
+    
+    '''Copy an inputOM instance, sharing all the inputs apart from the
+    metocean time series of Logistic_Param, which is replaced.
+
+    Args:
+        inputOMPtr (class): pointer of class inputOM
+        metocean (DataFrame): replacement metocean time series
+
+    Returns:
+        inputOMPtr (class): pointer of the new inputOM instance
+
+    '''
+    
+    logistic_param = inputOMPtr.get_Logistic_Param().copy()
+    logistic_param['metocean'] = metocean
+    
+    metocean_input = inputOM(inputOMPtr.get_Farm_OM(),
+                             inputOMPtr.get_Component(),
+                             inputOMPtr.get_Failure_Mode(),
+                             inputOMPtr.get_Repair_Action(),
+                             inputOMPtr.get_Inspection(),
+                             inputOMPtr.get_RAM_Param(),
+                             logistic_param,
+                             inputOMPtr.get_Simu_Param(),
+                             inputOMPtr.get_Control_Param())
+    
+    return metocean_input
+
+
+def run_queue_worker(queue_path, max_idle_time=None):
+    
+    '''Calculate the data points published to a job queue by LCOE_Statistics
+    (see the jobQueuePath parameter of inputOM). Any number of workers, on
+    any host which can access the queue directory, may be run at once.
+
+    Args:
+        queue_path (str): job queue directory
+        max_idle_time (float) [s]: return once no task has been available for
+            this time. If None, the worker runs until it is stopped.
+
+    Returns:
+        n_points (int): number of data points calculated
+
+    '''
+    
+    queue = JobQueue(queue_path)
+    
+    job_id = None
+    n_points = 0
+    idle_start = time.time()
+    
+    while True:
+        
+        task = queue.claim_task()
+        
+        if task is None:
+            
+            idle_time = time.time() - idle_start
+            
+            if max_idle_time is not None and idle_time >= max_idle_time:
+                break
+            
+            time.sleep(queue.poll_interval)
+            
+            continue
+        
+        task_job_id, sim_number = task
+        
+        # Load the inputs of a new job
+        if task_job_id != job_id:
+            
+            job = queue.get_job()
+            
+            # The task belongs to a cancelled job
+            if job is None or job["id"] != task_job_id:
+                queue.release_task(task_job_id, sim_number)
+                continue
+            
+            _init_worker(job["job"]["inputOM"],
+                         job["job"]["context"],
+                         job["job"].get("metocean"))
+            queue.lease_time = job["lease_time"]
+            job_id = task_job_id
+        
+        heartbeat = queue.start_heartbeat(job_id, sim_number)
+        
+        try:
+            
+            data_point, solutions = _execute_data_point(sim_number)
+            error = None
+        
+        except Exception:
+            
+            msg = ('Data point number {} failed').format(sim_number)
+            module_logger.exception(msg)
+            
+            data_point = None
+            solutions = None
+            error = traceback.format_exc()
+        
+        finally:
+            
+            heartbeat.stop()
+        
+        queue.put_result(job_id,
+                         sim_number,
+                         data_point=data_point,
+                         error=error,
+                         logistics_solutions=solutions)
+        
+        n_points += 1
+        idle_start = time.time()
+    
+    return n_points
+
+
+class LCOE_Context(object):
+    
+    '''Deterministic results which are shared, read-only, by all the data
+    points of an O&M calculation. The column labels of the Component,
+    Failure_Mode, Repair_Action, Inspection and arrayInfoLogistic tables of
+    inputOM are changed in place. The feasible logistic solutions of each
+    static operation are also stored, as they are found, for all the data
+    points calculated by a process.
+
+    Args:
+        inputOMPtr (class): pointer of class inputOM
+
+    Attributes:
+        logisticKeys (list of str) [-]: keys of the logistic input table
+        self.__Component (DataFrame) [-]: relabelled Component table
+        self.__Failure_Mode (DataFrame) [-]: relabelled Failure_Mode table
+        self.__Repair_Action (DataFrame) [-]: relabelled Repair_Action table
+        self.__Inspection (DataFrame) [-]: relabelled Inspection table
+        self.__componentRecords (dict) [-]: typed values of the Component
+            table for each component, see static.get_parameter_records
+        self.__failureModeRecords (dict) [-]: typed values of the
+            Failure_Mode table for each failure mode
+        self.__repairActionRecords (dict) [-]: typed values of the
+            Repair_Action table for each failure mode
+        self.__inspectionRecords (dict) [-]: typed values of the Inspection
+            table for each failure mode
+        self.__rsubsysvalues (nested list) [-]: rsubsysvalues from RAM
+        self.__rcompvalues (nested list) [-]: rcompvalues from RAM
+        self.__ramTable (DataFrame) [-]: flattened RAM table used by Array
+        self.__capexOfArray (float) [Euro]: CAPEX of array in case of
+            condition based maintenance strategy
+        self.__femTemplate (dict) [-]: arrayDict template and failure rates
+            of the failure modes, see Array.compileFEM
+        self.__portDistIndex (dict) [-]: 'Dist_port [km]' and
+            'Port_Index [-]' of the ports for inspection and repair
+        self.__repairDelays (numpy.ndarray) [hour]: delay of the repair
+            action after a failure event, for each failure mode of
+            femTemplate
+        self.__factoredPorts (DataFrame) [-]: ports database with the
+            safety factors applied
+        self.__factoredVessels (dict) [-]: vessels database with the
+            safety factors applied
+        self.__factoredEquipments (dict) [-]: equipments database with the
+            safety factors applied
+        self.__feasibilityCache (dict) [-]: results of the feasibility,
+            selection and compatibility stages of the logistics for each
+            static operation signature
+        self.__olcLimits (list of tuple) [-]: distinct maximum Hs, Tp, Ws
+            and Cs of the access and maintenance stages of the repair
+            actions and inspections, see logistics.get_olc_limits
+    '''
+    
+    logisticKeys = ['ID [-]',
+                    'element_type [-]',
+                    'element_subtype [-]',
+                    'element_ID [-]',
+                    'depth [m]',
+                    'x coord [m]',
+                    'y coord [m]',
+                    'zone [-]',
+                    't_start [-]',
+                    'd_acc [hour]',
+                    'd_om [hour]',
+                    'helideck [-]',
+                    'Hs_acc [m]',
+                    'Tp_acc [s]',
+                    'Ws_acc [m/s]',
+                    'Cs_acc [m/s]',
+                    'Hs_om [m]',
+                    'Tp_om [s]',
+                    'Ws_om [m/s]',
+                    'Cs_om [m/s]',
+                    'technician [-]',
+                    'sp_dry_mass [kg]',
+                    'sp_length [m]',
+                    'sp_width [m]',
+                    'sp_height [m]',
+                    'Dist_port [km]',
+                    'Port_Index [-]',
+                    'Bathymetry [m]',
+                    'Soil type [-]',
+                    'Prep_time [h]']
+
+    def __init__(self, inputOMPtr):
+        
+        Farm_OM = inputOMPtr.get_Farm_OM()
+        RAM_Param = inputOMPtr.get_RAM_Param()
+        Logistic_Param = inputOMPtr.get_Logistic_Param()
+        Simu_Param = inputOMPtr.get_Simu_Param()
+        Control_Param = inputOMPtr.get_Control_Param()
+        
+        # Relabelled tables
+        self.__Component = inputOMPtr.get_Component()
+        self.__Failure_Mode = inputOMPtr.get_Failure_Mode()
+        self.__Repair_Action = inputOMPtr.get_Repair_Action()
+        self.__Inspection = inputOMPtr.get_Inspection()
+        
+        self.__changeOfLabels(self.__Component,
+                              self.__Failure_Mode,
+                              self.__Repair_Action,
+                              self.__Inspection,
+                              Simu_Param['arrayInfoLogistic'])
+        
+        # Typed parameters for each component and failure mode
+        self.__componentRecords = get_parameter_records(self.__Component)
+        self.__failureModeRecords = get_parameter_records(self.__Failure_Mode)
+        self.__repairActionRecords = get_parameter_records(
+                                                        self.__Repair_Action)
+        self.__inspectionRecords = get_parameter_records(self.__Inspection)
+        
+        # RAM results
+        (self.__rcompvalues,
+         self.__rsubsysvalues) = self.__calcRAM(RAM_Param,
+                                                Simu_Param['missionTime'])
+        
+        self.__ramTable = get_ram_table(self.__rsubsysvalues,
+                                        RAM_Param['eleclayout'])
+        
+        # CAPEX of array
+        self.__capexOfArray = self.__calcCapexOfArray(Farm_OM,
+                                                      self.__Failure_Mode)
+        
+        # Failure rates of the failure modes
+        operationTimeDay = Simu_Param['missionTime'] * 365.25
+        
+        arrayPTR = Array(Simu_Param['startOperationDate'],
+                         operationTimeDay,
+                         self.__rcompvalues,
+                         self.__rsubsysvalues,
+                         RAM_Param['eleclayout'],
+                         RAM_Param['systype'],
+                         None,
+                         None,
+                         Control_Param['dtocean_maintenance_PRINT_FLAG'],
+                         self.__ramTable)
+        
+        self.__femTemplate = arrayPTR.compileFEM(
+                                self.__Component,
+                                self.__Failure_Mode,
+                                Simu_Param['annual_Energy_Production_perD'])
+        
+        # Ports for inspection and repair
+        self.__portDistIndex = self.__calcPortDistIndex(
+                                        self.__femTemplate['failureModes'],
+                                        self.__failureModeRecords,
+                                        Logistic_Param['entry_point'],
+                                        Logistic_Param['ports'])
+        
+        # Delays of the unplanned repair actions
+        self.__repairDelays = self.__calcRepairDelays(
+                                        self.__femTemplate['failureModes'],
+                                        self.__repairActionRecords,
+                                        self.__inspectionRecords)
+        
+        # Logistics databases with the safety factors applied
+        (self.__factoredPorts,
+         self.__factoredVessels,
+         self.__factoredEquipments) = safety_factors(
+                                copy.deepcopy(Logistic_Param['ports']),
+                                copy.deepcopy(Logistic_Param['vessels']),
+                                copy.deepcopy(Logistic_Param['equipments']),
+                                copy.deepcopy(Logistic_Param['port_sf']),
+                                copy.deepcopy(Logistic_Param['vessel_sf']),
+                                copy.deepcopy(Logistic_Param['eq_sf']))
+        
+        # Feasible logistic solutions for each static operation
+        self.__feasibilityCache = {}
+        
+        # Operational limits for which the weather windows are indexed
+        self.__olcLimits = self.__calcOlcLimits(self.__repairActionRecords,
+                                                self.__inspectionRecords)
+        
+        return
+    
+    def get_Component(self):
+        
+        return self.__Component
+    
+    def get_Failure_Mode(self):
+        
+        return self.__Failure_Mode
+    
+    def get_Repair_Action(self):
+        
+        return self.__Repair_Action
+    
+    def get_Inspection(self):
+        
+        return self.__Inspection
+    
+    def get_componentRecords(self):
+        
+        return self.__componentRecords
+    
+    def get_failureModeRecords(self):
+        
+        return self.__failureModeRecords
+    
+    def get_repairActionRecords(self):
+        
+        return self.__repairActionRecords
+    
+    def get_inspectionRecords(self):
+        
+        return self.__inspectionRecords
+    
+    def get_rcompvalues(self):
+        
+        return self.__rcompvalues
+    
+    def get_rsubsysvalues(self):
+        
+        return self.__rsubsysvalues
+    
+    def get_ramTable(self):
+        
+        return self.__ramTable
+    
+    def get_capexOfArray(self):
+        
+        return self.__capexOfArray
+    
+    def get_femTemplate(self):
+        
+        return self.__femTemplate
+    
+    def get_portDistIndex(self):
+        
+        return self.__portDistIndex
+    
+    def get_repairDelays(self):
+        
+        return self.__repairDelays
+    
+    def get_factoredPorts(self):
+        
+        return self.__factoredPorts
+    
+    def get_factoredVessels(self):
+        
+        return self.__factoredVessels
+    
+    def get_factoredEquipments(self):
+        
+        return self.__factoredEquipments
+    
+    def get_feasibilityCache(self):
+        
+        return self.__feasibilityCache
+    
+    def get_olcLimits(self):
+        
+        return self.__olcLimits
+    
+    @classmethod
+    def __changeOfLabels(cls, Component,
+                              Failure_Mode,
+                              Repair_Action,
+                              Inspection,
+                              arrayInfoLogistic):
+
+        '''__changeOfLabels function: changes the labels of some tables
+
+        Args:
+            Component (DataFrame) [-]: Component table of inputOM
+            Failure_Mode (DataFrame) [-]: Failure_Mode table of inputOM
+            Repair_Action (DataFrame) [-]: Repair_Action table of inputOM
+            Inspection (DataFrame) [-]: Inspection table of inputOM
+            arrayInfoLogistic (DataFrame) [-]: arrayInfoLogistic of inputOM
+
+        '''
+
+        # Component -> Component_ID
+        # Component
+        col_map = dict(zip(Component.columns,
+                           list(Component.loc['Component_ID'])))
+
+        Component.rename(columns=col_map, inplace=True)
+
+        # Component -> Component_ID
+        # Simu_Param
+        components = arrayInfoLogistic.loc['Component_ID']
+        col_map = dict(zip(arrayInfoLogistic.columns, list(components)))
+
+        arrayInfoLogistic.rename(columns=col_map, inplace=True)
+
+        # Repair_Action
+        nuOfColumnsRA = Repair_Action.shape[1]
+        idListRA = list(Repair_Action.loc['Component_ID'])
+        fmListRA = list(Repair_Action.loc['FM_ID'])
+
+        newColumnsRA = []
+        for iCnt in range(0,nuOfColumnsRA):
+            newColumnsRA.append('dummy')
+
+        # Inspection
+        nuOfColumnsInsp = Inspection.shape[1]
+        idListInsp = list(Inspection.loc['Component_ID'])
+        fmListInsp = list(Inspection.loc['FM_ID'])
+        newColumnsInsp = []
+        for iCnt in range(0,nuOfColumnsInsp):
+            newColumnsInsp.append('dummy')
+
+        # Failure_Mode
+        nuOfColumns = Failure_Mode.shape[1]
+        idList = list(Failure_Mode.loc['Component_ID'])
+        fmList = list(Failure_Mode.loc['FM_ID'])
+
+        newColumns = []
+        for iCnt in range(0,nuOfColumns):
+            if len(newColumns) == 0:
+                newColumns.append(idList[iCnt] + '_1')
+
+            else:
+                index = 0
+                for iCnt1 in range(0,len(newColumns)):
+                    if idList[iCnt] == string.rsplit(newColumns[iCnt1],'_')[0]:
+                         index = index + 1
+
+                if index == 0:
+                    newColumns.append(idList[iCnt] + '_1')
+                else:
+                    newColumns.append(idList[iCnt] + '_' + str(index + 1))
+
+            indexList = -1
+
+            for iCnt1 in range(0, nuOfColumnsRA):
+
+                if (idListRA[iCnt1] == idList[iCnt] and
+                    fmListRA[iCnt1] == fmList[iCnt]):
+
+                    indexList = iCnt1
+                    break
+
+            if indexList != -1:
+                newColumnsRA[indexList] = newColumns[-1]
+
+            indexList = -1
+
+            for iCnt1 in range(0, nuOfColumnsInsp):
+
+                if (idListInsp[iCnt1] == idList[iCnt] and
+                    fmListInsp[iCnt1] == fmList[iCnt]):
+
+                    indexList = iCnt1
+                    break
+
+            if indexList != -1:
+                newColumnsInsp[indexList] = newColumns[-1]
+
+        # Failure_Mode
+        col_map = dict(zip(Failure_Mode.columns, newColumns))
+        Failure_Mode.rename(columns=col_map, inplace=True)
+
+        # Repair_Action
+        col_map = dict(zip(Repair_Action.columns, newColumnsRA))
+        Repair_Action.rename(columns=col_map, inplace=True)
+
+        # Inspection
+        col_map = dict(zip(Inspection.columns, newColumnsInsp))
+        Inspection.rename(columns=col_map, inplace=True)
+
+        return
+
+    @classmethod
+    def __calcOlcLimits(cls, repairActionRecords, inspectionRecords):
+
+        '''__calcOlcLimits function: finds the distinct operational limit
+        conditions of the repair actions and inspections
+
+        Args:
+            repairActionRecords (dict) [-]: typed values of the Repair_Action
+                table for each failure mode
+            inspectionRecords (dict) [-]: typed values of the Inspection
+                table for each failure mode
+
+        Returns:
+            olcLimits (list of tuple) [-]: distinct maximum Hs, Tp, Ws and Cs
+
+        '''
+
+        olcLimits = set()
+
+        for records in [repairActionRecords, inspectionRecords]:
+
+            for record in records.values():
+
+                for stage in ['acc', 'om']:
+
+                    values = [record['wave_height_max_' + stage],
+                              record['wave_periode_max_' + stage],
+                              record['wind_speed_max_' + stage],
+                              record['current_speed_max_' + stage]]
+
+                    olcLimits.add(get_olc_limits(values))
+
+        return sorted(olcLimits)
+
+    @classmethod
+    def __calcCapexOfArray(cls, Farm_OM, Failure_Mode):
+
+        '''__calcCapexOfArray function: sums the CAPEX of the condition
+        based maintenance of all failure modes
+
+        Args:
+            Farm_OM (dict) [-]: Farm_OM parameters of inputOM
+            Failure_Mode (DataFrame) [-]: relabelled Failure_Mode table
+
+        Returns:
+            capexOfArray (float) [Euro]: CAPEX of array
+
+        '''
+
+        capexOfArray = 0
+
+        # determine the CAPEX of the array
+        if Farm_OM['condition_based_maintenance'] == True:
+
+            for iCnt in range(0,Failure_Mode.shape[1]):
+
+                column = Failure_Mode.columns.values[iCnt]
+                failure_mode = Failure_Mode[column]
+                failure_mode = failure_mode.apply(pd.to_numeric,
+                                                  errors="ignore")
+                
+                capex_condition = failure_mode[
+                                         'CAPEX_condition_based_maintenance']
+
+                if not math.isnan(capex_condition) and capex_condition > 0:
+                    capexOfArray = capexOfArray + capex_condition
+
+        return capexOfArray
+
+    @classmethod
+    def __calcRepairDelays(cls, failureModes,
+                                repairActionRecords,
+                                inspectionRecords):
+
+        '''__calcRepairDelays function: delay of the repair action after a
+        failure event, i.e. the largest of the spare part delay and the crew
+        and organisation delays, for each failure mode
+
+        Args:
+            failureModes (list of tuple) [-]: failureModes of compileFEM
+            repairActionRecords (dict) [-]: typed values of the relabelled
+                Repair_Action table
+            inspectionRecords (dict) [-]: typed values of the relabelled
+                Inspection table
+
+        Returns:
+            repairDelays (numpy.ndarray) [hour]: delay of each failure mode
+
+        '''
+
+        repairDelays = np.zeros(len(failureModes))
+
+        for iCnt, failureMode in enumerate(failureModes):
+
+            ComponentID = failureMode[4]
+            FM_ID = failureMode[5]
+            indexFM = failureMode[6]
+            CompIDWithIndex = ComponentID + '_' + str(indexFM)
+
+            if 'Insp' in FM_ID:
+
+                # inspection
+                inspection = inspectionRecords[CompIDWithIndex]
+
+                shiftHoursDummy1 = 0
+
+                delay_crew = inspection['delay_crew']
+                delay_org = inspection['delay_organisation']
+                shiftHoursDummy2 = delay_crew + delay_org
+
+            else:
+
+                # repairAction
+                repair_action = repairActionRecords[CompIDWithIndex]
+
+                shiftHoursDummy1 = repair_action['delay_spare']
+
+                delay_crew = repair_action['delay_crew']
+                delay_org = repair_action['delay_organisation']
+                shiftHoursDummy2 = delay_crew + delay_org
+
+            repairDelays[iCnt] = float(max(shiftHoursDummy1,
+                                           shiftHoursDummy2))
+
+        return repairDelays
+
+    @classmethod
+    def __calcPortDistIndex(cls, failureModes,
+                                 failureModeRecords,
+                                 entry_point,
+                                 ports):
+
+        '''__calcPortDistIndex function: selects the ports for inspections
+        and repairs based on the largest spare part of all failure modes
+
+        Args:
+            failureModes (list of tuple) [-]: failureModes of compileFEM
+            failureModeRecords (dict) [-]: typed values of the relabelled
+                Failure_Mode table
+            entry_point (DataFrame) [-]: lease area entry point
+            ports (DataFrame) [-]: ports database
+
+        Returns:
+            portDistIndex (dict) [-]: 'Dist_port [km]' and 'Port_Index [-]'
+                for the keys 'inspection' and 'repair'
+
+        '''
+
+        outputsForPortSelection = pd.DataFrame(index=[0],
+                                               columns=cls.logisticKeys)
+
+        sp_dry_mass_dummy       = 0.01
+        sp_length_dummy         = 0.01
+        sp_width_dummy          = 0.01
+        sp_height_dummy         = 0.01
+
+        portDistIndex = {}
+        portDistIndex['inspection'] = []
+        portDistIndex['repair']     = []
+
+        for failureMode in failureModes:
+
+            ComponentID = failureMode[4]
+            indexFM = failureMode[6]
+            CompIDWithIndex = ComponentID + '_' + str(indexFM)
+            
+            failure_mode = failureModeRecords[CompIDWithIndex]
+
+            # max of values
+            sp_dry_mass = failure_mode['spare_mass']
+
+            if sp_dry_mass_dummy < sp_dry_mass:
+                sp_dry_mass_dummy = sp_dry_mass
+
+            sp_length = failure_mode['spare_length']
+
+            if sp_length_dummy < sp_length:
+                sp_length_dummy = sp_length
+
+            sp_width = failure_mode['spare_width']
 
-    def __init__(self, inputOMPtr):
+            if sp_width_dummy < sp_width:
+                sp_width_dummy = sp_width
 
-        # Instance pointer of inputOM
-        self.__inputOMPtr = inputOMPtr
+            sp_height = failure_mode['spare_height']
 
-        return
+            if sp_height_dummy < sp_height:
+                sp_height_dummy = sp_height
 
-    def __call__(self):
+        # Inspection case
+        # *****************************************************************
+        # *****************************************************************
+        # *****************************************************************
+        values = ['INS_PORT',
+                  '',
+                  '',
+                  '',
+                  '',
+                  entry_point['x coord [m]'].iloc[0],
+                  entry_point['y coord [m]'].iloc[0],
+                  entry_point['zone [-]'].iloc[0],
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  sp_dry_mass_dummy,
+                  sp_length_dummy,
+                  sp_width_dummy,
+                  sp_height_dummy,
+                  '',
+                  '',
+                  '',
+                  '',
+                  0]
 
-        '''__call__ function: call function
+        outputsForPortSelection.iloc[0] = values
 
-        Returns:
-            output_dict (dict): Output of WP6
+        om_port = select_port_OM.OM_port(outputsForPortSelection,
+                                         ports)
 
-        '''
+        portDistIndex['inspection'].append(
+                om_port['Distance port-site [km]'])
+        portDistIndex['inspection'].append(
+                om_port['Port database index [-]'])
 
-        output_dict = self.main()
-            
-        return output_dict
+        # Repair case
+        # *****************************************************************
+        # *****************************************************************
+        # *****************************************************************
+        values = ['OM_PORT',
+                  '',
+                  '',
+                  '',
+                  '',
+                  entry_point['x coord [m]'].iloc[0],
+                  entry_point['y coord [m]'].iloc[0],
+                  entry_point['zone [-]'].iloc[0],
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  '',
+                  sp_dry_mass_dummy,
+                  sp_length_dummy,
+                  sp_width_dummy,
+                  sp_height_dummy,
+                  '',
+                  '',
+                  '',
+                  '',
+                  0]
 
-    def main(self):
+        outputsForPortSelection.iloc[0] = values
 
-        '''Calls LCOE_Calculator for the calculation of of O&M plan for the
-        required population size and accumulates the results.
+        # Port Selection based on input
+        om_port = select_port_OM.OM_port(outputsForPortSelection,
+                                         ports)
+
+        portDistIndex['repair'].append(
+                om_port['Distance port-site [km]'])
+        portDistIndex['repair'].append(
+                om_port['Port database index [-]'])
+        
+        return portDistIndex
+
+    @classmethod
+    def __calcRAM(cls, RAM_Param, missionTime):
+
+        '''__calcRAM function: calls of dtocean-reliability and returns the
+        results
+
+        Args:
+            RAM_Param (dict) [-]: RAM parameters of inputOM
+            missionTime (float) [year]: Simulation time
 
         Returns:
-            output_dict (dict): Output of WP6
+            rcompvalues (nested list) [-]: rcompvalues from RAM
+            rsubsysvalues (nested list) [-]: rsubsysvalues from RAM
 
         '''
+        
+        # mission time in hours
+        mission_time = float(missionTime) * 365.25 * 24.0
 
-        control_param = self.__inputOMPtr.get_Control_Param()
+        input_variables = Variables(mission_time,
+                                    RAM_Param['systype'],
+                                    RAM_Param['db'],
+                                    None,
+                                    RAM_Param['eleclayout'],
+                                    RAM_Param['elechierdict'],
+                                    RAM_Param['elecbomeg'],
+                                    RAM_Param['moorhiereg'],
+                                    RAM_Param['moorbomeg'],
+                                    RAM_Param['userhiereg'],
+                                    RAM_Param['userbomeg'])
+
+        # Make an instance of RAM and execute its call method
+        ramPTR = Main(input_variables)
+        ramPTR()
+
+        return ramPTR.rcompvalues3, ramPTR.rsubsysvalues3
 
-        # Population size
-        n_sims = control_param['numberOfSimulations']
-        
-        if n_sims < 1:
-            
-            errMsg = ("At least one data point must be evaluated; however, "
-                      "parameter numberOfSimulations is set to "
-                      "{}").format(n_sims)
-            raise ValueError(errMsg)
-        
-        metrics_dict = {"lifetimeOpex [Euro]": [],
-                        "lifetimeEnergy [Wh]": [],
-                        "LCOEOpex [Euro/kWh]": [],
-                        "arrayDowntime [hour]": [],
-                        "arrayAvailability [-]": [],
-                        "numberOfJourneys [-]": []}
-        year_opex_df = pd.DataFrame()
-        year_energies_df = pd.DataFrame()
-        device_downtime_df = pd.DataFrame()
-        device_energies_df = pd.DataFrame()
-        events_table_dicts = []
-        
-        # Use a single WaitingTime class for all simulations
-        logistic_param = self.__inputOMPtr.get_Logistic_Param()
-        metocean = logistic_param['metocean']
-        
-        custom_waiting = WaitingTime(metocean)
-                
-        # Run simulations and collect results
-        for sim_number in xrange(n_sims):
-            
-            msg = ('Executing data point number {}').format(sim_number)
-            module_logger.info(msg)
-                        
-            calculator = LCOE_Calculator(self.__inputOMPtr,
-                                         custom_waiting=custom_waiting)
-            data_point = calculator.executeCalc()
-                                    
-            for key in metrics_dict.keys():
-                metrics_dict[key].append(data_point[key])
-            
-            year_opex = data_point["OpexPerYear [Euro]"].set_index("Year")
-            year_opex.columns = ["Cost {} [Euro]".format(sim_number)]
-            year_opex_df = pd.concat([year_opex_df, year_opex],
-                                     axis=1)
-            
-            year_energies = data_point["energyPerYear [Wh]"].set_index("Year")
-            year_energies.columns = ["Energy {} [Wh]".format(sim_number)]
-            year_energies_df = pd.concat([year_energies_df, year_energies],
-                                         axis=1)
-            
-            downtime_dict = {k: v for k, v in 
-                                data_point["downtimePerDevice [hour]"].items()}
-            downtime_dict = {"Downtime {} [hours]".format(sim_number):
-                                                                downtime_dict}
-            downtime_df = pd.DataFrame(downtime_dict)
-            device_downtime_df = pd.concat([device_downtime_df, downtime_df],
-                                           axis=1)
-            
-            energies_dict = {k: v for k, v in 
-                                data_point["energyPerDevice [Wh]"].items()}
-            energies_dict = {"Energy {} [Wh]".format(sim_number):
-                                                                energies_dict}
-            energies_df = pd.DataFrame(energies_dict)
-            device_energies_df = pd.concat([device_energies_df, energies_df],
-                                           axis=1)
-            
-            events_table_dicts.append(data_point['eventTables [-]'])
-            
-        metrics_df = pd.DataFrame(metrics_dict)
-        
-        output_dict = {"MetricsTable [-]": metrics_df,
-                       "OpexPerYear [Euro]": year_opex_df,
-                       "energyPerYear [Wh]": year_energies_df,
-                       "downtimePerDevice [hour]": device_downtime_df,
-                       "energyPerDevice [Wh]": device_energies_df,
-                       'eventTables [-]': events_table_dicts,
-                       "CapexOfArray [Euro]":
-                           data_point["CapexOfArray [Euro]"]}
-                    
-        return output_dict
-    
 
 class LCOE_Calculator(object):
 
@@ -461,6 +1998,88 @@ class LCOE_Calculator(object):
                 numberOfParallelActions (int) [-]:
                     Maximum number of operations that can be completed by one
                     vessel. Optional, defaults to 10
+                numberOfWorkers (int) [-]:
+                    Number of processes used to calculate the statistical
+                    population in parallel. Optional, defaults to 1
+                randomSeed (int) [-]:
+                    Master seed for the random failure events. Each data
+                    point uses an independent stream derived from this seed
+                    and its index. Optional, defaults to None (not
+                    reproducible)
+                convergenceHalfWidth (float) [-]:
+                    If set, stop calculating data points when the confidence
+                    interval half-widths of the LCOEOpex, lifetimeOpex and
+                    arrayAvailability means, relative to the means, are
+                    less than this value. numberOfSimulations is then the
+                    maximum number of data points. Optional, defaults to None
+                convergenceConfidence (float) [-]:
+                    Confidence level of the convergence test, between 0 and
+                    1. Optional, defaults to 0.95
+                convergenceMinSimulations (int) [-]:
+                    Minimum number of data points before testing for
+                    convergence. Optional, defaults to 10
+                checkpointPath (str) [-]:
+                    Directory in which the results of the completed data
+                    points are periodically saved. Unless eventTablesPath is
+                    set, the event tables of each data point are written to
+                    the eventTables subdirectory once, on completion, and
+                    the eventTables output contains read-only handles, as
+                    for eventTablesPath. Optional, defaults to None
+                checkpointInterval (int) [-]:
+                    Number of data points between checkpoints. Must be at
+                    least 1. Optional, defaults to 10
+                resumeFromCheckpoint (bool) [-]:
+                    Skip the data points stored in the checkpoint in
+                    checkpointPath, if present. The results are only
+                    identical to an uninterrupted run if randomSeed is set.
+                    A ValueError is raised if numberOfSimulations,
+                    randomSeed or the convergence inputs differ from the
+                    checkpoint. Optional, defaults to False
+                eventTablesPath (str) [-]:
+                    Directory to which the event tables and metrics of each
+                    data point are written on completion. The eventTables
+                    output then contains read-only handles which load the
+                    tables on access. Optional, defaults to None
+                jobQueuePath (str) [-]:
+                    Directory of a job queue, shared by the hosts taking part
+                    in the calculation. If set, the data points are published
+                    to the queue and calculated by run_queue_worker processes
+                    rather than locally, and numberOfWorkers is ignored.
+                    A ValueError is raised if the queue is in use by another
+                    job. Optional, defaults to None
+                jobQueueLeaseTime (float) [s]:
+                    Time after which the data points claimed by a job queue
+                    worker which has stopped responding are returned to the
+                    queue. Optional, defaults to 60
+                jobQueueTimeout (float) [s]:
+                    Maximum time to wait for each data point published to the
+                    job queue before a RuntimeError is raised. Optional,
+                    defaults to None (wait indefinitely)
+                logisticsCacheSize (int) [-]:
+                    Maximum number of logistics solutions stored for reuse by
+                    identical operations, which are requested at the same
+                    time, in all data points. The least recently used
+                    solutions are discarded first. Optional, defaults to None
+                    (solutions are not stored)
+                logisticsCachePath (str) [-]:
+                    File in which the stored logistics solutions are saved at
+                    the end of a run, and from which they are loaded at the
+                    start of a run. The solutions of all the workers are
+                    collected and saved by the coordinating process. A
+                    fingerprint of the site, metocean data and logistics
+                    databases is saved with the solutions, and a file with a
+                    different fingerprint is discarded. Ignored unless
+                    logisticsCacheSize is set. Optional, defaults to None
+                metoceanMemmapPath (str) [-]:
+                    Directory to which the metocean time series of
+                    Logistic_Param is written, as compact memory mapped
+                    files, at the start of LCOE_Statistics.main. The run then
+                    uses a MappedMetocean table, which all the worker
+                    processes share rather than copy, and Logistic_Param is
+                    not modified. The time series must only have the date,
+                    Hs, Tp, Ws and Cs columns. The directory must be
+                    accessible to any run_queue_worker processes. Optional,
+                    defaults to None
                 
                 ###############################################################
                 ###############################################################
@@ -500,7 +2119,6 @@ class LCOE_Calculator(object):
 
 
         self.__strFormat1 (str) [-]: converting between datetime and string
-        self.__strFormat2 (str) [-]: converting between datetime and string
         self.__dayHours (float) [-]: Hours in one day
         self.__yearDays (float) [-]: Days in one year
         self.__delayEventsAfterCaBaMaHour (float) [hour]:
@@ -524,6 +2142,10 @@ class LCOE_Calculator(object):
         self.__NoPoisson_eventsTableKeys (list of str) [-]:
             Keys of eventsTableNoPoisson
         self.__UnCoMa_eventsTable (DataFrame) [-]: eventsTable (UnCoMa)
+        self.__UnCoMa_eventQueue (CorrectiveEventQueue) [-]:
+            queue of the pending events of eventsTable (UnCoMa)
+        self.__UnCoMa_outputEvents (list) [-]:
+            rows of eventsTable for output (UnCoMa)
         self.__UnCoMa_outputEventsTable (DataFrame) [-]:
             eventsTable for output (UnCoMa)
         self.__eventsTableNoPoisson (DataFrame) [-]: eventsTable (NoPoisson)
@@ -542,9 +2164,15 @@ class LCOE_Calculator(object):
         self.__om_logistic (dict) [-]: output of logistic
         self.__OUTPUT_dict_logistic (dict) [-]: output of logistic
         self.__logPhase_om (class) [-]: logistic parameter
-        self.__vessels (dict) [-]: logistic parameter
-        self.__equipments (dict) [-]: logistic parameter
-        self.__ports (DataFrame) [-]: logistic parameter
+        self.__feasibilityCache (dict) [-]: results of the feasibility,
+            selection and compatibility stages of the logistics for each
+            static operation signature, shared with LCOE_Context
+        self.__vessels (dict) [-]: logistic parameter with the safety
+            factors applied, shared read-only with LCOE_Context
+        self.__equipments (dict) [-]: logistic parameter with the safety
+            factors applied, shared read-only with LCOE_Context
+        self.__ports (DataFrame) [-]: logistic parameter with the safety
+            factors applied, shared read-only with LCOE_Context
         self.__portDistIndex (dict) [-]: logistic parameter
         self.__phase_order (DataFrame) [-]: logistic parameter
         self.__site (DataFrame) [-]: logistic parameter
@@ -567,16 +2195,19 @@ class LCOE_Calculator(object):
             keys of dataframe for logistic functions
         self.__wp6_outputsForLogistic (DataFrame) [-]:
             input for logistic module
-        self.__ramPTR (class) [-]: pointer of RAM
+        self.__context (LCOE_Context) [-]: shared deterministic results
+        self.__logisticsCache (LogisticsCache) [-]: shared store of the
+            solutions of the logistics module or None
+        self.__componentRecords (dict) [-]: typed values of the Component
+            table, see LCOE_Context
+        self.__failureModeRecords (dict) [-]: typed values of the
+            Failure_Mode table
+        self.__repairActionRecords (dict) [-]: typed values of the
+            Repair_Action table
+        self.__inspectionRecords (dict) [-]: typed values of the Inspection
+            table
         self.__eleclayout (str) [-]: Electrical layout architecture
         self.__systype (str) [-]: Type of system
-        self.__elechierdict (str) [-]: RAM parameter
-        self.__elecbomeg (str) [-]: RAM parameter
-        self.__moorhiereg (str) [-]: RAM parameter
-        self.__moorbomeg (str) [-]: RAM parameter
-        self.__userhiereg (str) [-]: RAM parameter
-        self.__userbomeg (str) [-]: RAM parameter
-        self.__db (str) [-]: RAM parameter
         self.__rsubsysvalues (nested list) [-]: rsubsysvalues from RAM
         self.__rcompvalues (nested list) [-]: rcompvalues from RAM
         self.__arrayPTR (class) [-]: pointer of arrayClass
@@ -592,8 +2223,16 @@ class LCOE_Calculator(object):
         self.__CaBaMa_eventsTableKeys (list of str) [-]:
             keys of table CaBaMa_eventsTableKeys
         self.__CaBaMa_eventsTable (DataFrame) [-]: table CaBaMa_eventsTable
+        self.__CaBaMa_rowIndex (dict) [-]:
+            positions of the rows of CaBaMa_eventsTable for each combination
+            of column values, per set of columns
+        self.__CaBaMa_endDateIndex (dict) [-]:
+            sorted current end dates of the rows of CaBaMa_eventsTable for
+            each combination of column values
         self.__CaBaMa_outputEventsTableKeys (list of str) [-]:
             keys of table CaBaMa_eventsTableKeys
+        self.__CaBaMa_outputEvents (list) [-]:
+            rows of table CaBaMa_eventsTable
         self.__CaBaMa_outputEventsTable (DataFrame) [-]:
             table CaBaMa_eventsTable
         self.__CoBaMa_nrOfMaxActions (int) [-]:
@@ -602,6 +2241,8 @@ class LCOE_Calculator(object):
             keys of table CoBaMa_eventsTableKeys
         self.__CoBaMa_outputEventsTableKeys (list of str) [-]:
             keys of table CaBaMa_eventsTableKeys
+        self.__CoBaMa_outputEvents (list) [-]:
+            rows of table CoBaMa_eventsTable
         self.__CoBaMa_outputEventsTable (DataFrame) [-]:
             table CoBaMa_eventsTable
         self.__CoBaMa_eventsTable (DataFrame) [-]: table CoBaMa_eventsTable
@@ -663,12 +2304,28 @@ class LCOE_Calculator(object):
     '''
 
     def __init__(self, inputOMPTR,
-                       custom_waiting=None):
+                       custom_waiting=None,
+                       random_state=None,
+                       context=None,
+                       logistics_cache=None,
+                       metocean=None):
 
         '''__init__ function: Saves the arguments in internal variabels.
 
         Args:
             inputOMPTR (class): pointer of inputOM class
+            custom_waiting (WaitingTime): shared WaitingTime instance
+            random_state (numpy.random.RandomState): random number stream
+                for the failure events. If None the global numpy random state
+                is used
+            context (LCOE_Context): deterministic results shared by all
+                data points. If None a new context is created
+            logistics_cache (LogisticsCache): solutions of the logistics
+                module shared by all data points. If None the logistics
+                module is called for every operation
+            metocean (DataFrame): metocean time series used in place of the
+                metocean key of Logistic_Param, such as a MappedMetocean. If
+                None the key is used
 
 
         Returns:
@@ -684,20 +2341,40 @@ class LCOE_Calculator(object):
         
         # Set custom WaitingTime class
         self.__custom_waiting = custom_waiting
+        
+        # Set random number stream
+        self.__random_state = random_state
+        
+        # Set shared store of logistics solutions
+        self.__logisticsCache = logistics_cache
+        
+        # Set shared metocean time series
+        self.__customMetocean = metocean
+        
+        # Set shared deterministic results
+        if context is None:
+            self.__context = LCOE_Context(inputOMPTR)
+        else:
+            self.__context = context
 
         # Read the inputs from core
         self.__Farm_OM          = self.__inputOMPTR.get_Farm_OM()
-        self.__Component        = self.__inputOMPTR.get_Component()
-        self.__Failure_Mode     = self.__inputOMPTR.get_Failure_Mode()
-        self.__Repair_Action    = self.__inputOMPTR.get_Repair_Action()
-        self.__Inspection       = self.__inputOMPTR.get_Inspection()
+        self.__Component        = self.__context.get_Component()
+        self.__Failure_Mode     = self.__context.get_Failure_Mode()
+        self.__Repair_Action    = self.__context.get_Repair_Action()
+        self.__Inspection       = self.__context.get_Inspection()
         self.__RAM_Param        = self.__inputOMPTR.get_RAM_Param()
         self.__Logistic_Param   = self.__inputOMPTR.get_Logistic_Param()
         self.__Simu_Param       = self.__inputOMPTR.get_Simu_Param()
         self.__Control_Param    = self.__inputOMPTR.get_Control_Param()
-
-        self.__changeOfLabels()
         # end: Read from inputOM
+        
+        # Typed parameters for the event loops
+        self.__componentRecords = self.__context.get_componentRecords()
+        self.__failureModeRecords = self.__context.get_failureModeRecords()
+        self.__repairActionRecords = \
+                                self.__context.get_repairActionRecords()
+        self.__inspectionRecords = self.__context.get_inspectionRecords()
         #######################################################################
 
         #######################################################################
@@ -705,8 +2382,6 @@ class LCOE_Calculator(object):
 
         # For converting between datetime and string
         self.__strFormat1 = "%d:%m:%Y %H:%M:%S"
-        self.__strFormat2 = "%Y-%m-%d %H:%M:%S"
-        self.__strFormat3 = "%Y-%m-%d %H:%M:%S.%f"
 
         # Hours in one day
         self.__dayHours = 24.0
@@ -765,6 +2440,7 @@ class LCOE_Calculator(object):
 
         # eventsTable
         self.__UnCoMa_eventsTable = None
+        self.__UnCoMa_eventQueue = None
 
         # event table for output
         self.__UnCoMa_outputEventsTableKeys = ['failureRate [1/year]',
@@ -787,9 +2463,8 @@ class LCOE_Calculator(object):
                                                'nameOfvessel [-]']
 
 
-        self.__UnCoMa_outputEventsTable = pd.DataFrame(
-                                index=[0],
-                                columns=self.__UnCoMa_outputEventsTableKeys)
+        self.__UnCoMa_outputEvents = []
+        self.__UnCoMa_outputEventsTable = None
 
         # Keys of eventsTableNoPoisson
         self.__NoPoisson_eventsTableKeys  = ['repairActionEvents',
@@ -862,27 +2537,9 @@ class LCOE_Calculator(object):
 
         # CAPEX of array in case of condition based maintenance strategy
         # (float) [Euro]
-        self.__outputsOfWP6['CapexOfArray [Euro]'] = 0
+        self.__outputsOfWP6['CapexOfArray [Euro]'] = \
+                                            self.__context.get_capexOfArray()
 
-        # determine the CAPEX of the array
-        if self.__Farm_OM['condition_based_maintenance'] == True:
-
-            for iCnt in range(0,self.__Failure_Mode.shape[1]):
-
-                column = self.__Failure_Mode.columns.values[iCnt]
-                failure_mode = self.__Failure_Mode[column]
-                failure_mode = failure_mode.apply(pd.to_numeric,
-                                                  errors="ignore")
-                
-                capex_condition = failure_mode[
-                                         'CAPEX_condition_based_maintenance']
-
-                if not math.isnan(capex_condition) and capex_condition > 0:
-
-                    self.__outputsOfWP6['CapexOfArray [Euro]'] = \
-                        self.__outputsOfWP6['CapexOfArray [Euro]'] + \
-                            capex_condition
-                            
         # Other metrics
         self.__outputsOfWP6["lifetimeOpex [Euro]"] = None
         self.__outputsOfWP6["lifetimeEnergy [W]"] = None
@@ -909,20 +2566,19 @@ class LCOE_Calculator(object):
         # Declaration of variable for logistic (class)
         self.__logPhase_om = None
 
-         # Declaration of variable for logistic (?)
-        self.__vessels = self.__Logistic_Param['vessels']
-
-        # Declaration of variable for logistic (?)
-        self.__equipments = self.__Logistic_Param['equipments']
+        # Feasible logistic solutions for each static operation (dict),
+        # shared by all data points
+        self.__feasibilityCache = self.__context.get_feasibilityCache()
 
-        # Declaration of variable for logistic (dataframe)
-        self.__ports = self.__Logistic_Param['ports']
+        # Declaration of variables for logistic, with the safety factors
+        # applied (read-only)
+        self.__vessels = self.__context.get_factoredVessels()
+        self.__equipments = self.__context.get_factoredEquipments()
+        self.__ports = self.__context.get_factoredPorts()
 
         # 'Dist_port [km]', 'Port_Index [-]'
         # Information about ports
-        self.__portDistIndex = {}
-        self.__portDistIndex['inspection'] = []
-        self.__portDistIndex['repair']     = []
+        self.__portDistIndex = self.__context.get_portDistIndex()
 
 #        # Default values for port
 #        self.__dummyDist_port   = 0.1#190
@@ -938,7 +2594,12 @@ class LCOE_Calculator(object):
 
         self.__phase_order = self.__Logistic_Param['phase_order']
         self.__site = self.__Logistic_Param['site']
-        self.__metocean = self.__Logistic_Param['metocean']
+        
+        if self.__customMetocean is None:
+            self.__metocean = self.__Logistic_Param['metocean']
+        else:
+            self.__metocean = self.__customMetocean
+        
         self.__device = self.__Logistic_Param['device']
         self.__sub_device = self.__Logistic_Param['sub_device']
         self.__landfall = self.__Logistic_Param['landfall']
@@ -955,46 +2616,13 @@ class LCOE_Calculator(object):
         self.__external_protection = self.__Logistic_Param[
                                                         'external_protection']
         self.__topology = self.__Logistic_Param['topology']
-        self.__port_sf = self.__Logistic_Param['port_sf']
-        self.__vessel_sf = self.__Logistic_Param['vessel_sf']
-        self.__eq_sf = self.__Logistic_Param['eq_sf']
         self.__schedule_OLC = self.__Logistic_Param['schedule_OLC']
         self.__other_rates = self.__Logistic_Param['other_rates']
 
         # Initialise logistic operations and logistic phase
 
         # keys of dataframe for logistic functions
-        self.__logisticKeys = ['ID [-]',
-                               'element_type [-]',
-                               'element_subtype [-]',
-                               'element_ID [-]',
-                               'depth [m]',
-                               'x coord [m]',
-                               'y coord [m]',
-                               'zone [-]',
-                               't_start [-]',
-                               'd_acc [hour]',
-                               'd_om [hour]',
-                               'helideck [-]',
-                               'Hs_acc [m]',
-                               'Tp_acc [s]',
-                               'Ws_acc [m/s]',
-                               'Cs_acc [m/s]',
-                               'Hs_om [m]',
-                               'Tp_om [s]',
-                               'Ws_om [m/s]',
-                               'Cs_om [m/s]',
-                               'technician [-]',
-                               'sp_dry_mass [kg]',
-                               'sp_length [m]',
-                               'sp_width [m]',
-                               'sp_height [m]',
-                               'Dist_port [km]',
-                               'Port_Index [-]',
-                               'Bathymetry [m]',
-                               'Soil type [-]',
-                               'Prep_time [h]'
-                               ]
+        self.__logisticKeys = LCOE_Context.logisticKeys
 
         self.__wp6_outputsForLogistic = pd.DataFrame(
                                                 index=[0],
@@ -1006,9 +2634,6 @@ class LCOE_Calculator(object):
         #######################################################################
         # start: Declaration of variables for RAM
 
-        # This variable will be used for saving of RAM instance.
-        self.__ramPTR = None
-
         # Eleclayout -> radial, singlesidedstring, doublesidedstring,
         # multiplehubs
         self.__eleclayout = self.__RAM_Param['eleclayout']
@@ -1016,30 +2641,6 @@ class LCOE_Calculator(object):
         # systype -> 'tidefloat', 'tidefixed', 'wavefloat', 'wavefixed'
         self.__systype = self.__RAM_Param['systype']
 
-        # elechierdict
-        self.__elechierdict = self.__RAM_Param['elechierdict']
-
-        # elecbomeg
-        self.__elecbomeg = self.__RAM_Param['elecbomeg']
-
-        # moorhiereg
-        self.__moorhiereg = self.__RAM_Param['moorhiereg']
-
-        # moorbomeg
-        self.__moorbomeg = self.__RAM_Param['moorbomeg']
-
-        # userhiereg
-        self.__userhiereg = self.__RAM_Param['userhiereg']
-
-        # userbomeg
-        self.__userbomeg = self.__RAM_Param['userbomeg']
-
-        # db
-        self.__db = self.__RAM_Param['db']
-
-
-        # Declaration of output of RAM
-        #self.__ram = {}
 
         # list rsubsysvalues from RAM
         self.__rsubsysvalues = []
@@ -1137,6 +2738,10 @@ class LCOE_Calculator(object):
                                         index=[0],
                                         columns=self.__CaBaMa_eventsTableKeys)
 
+        # Indices of CaBaMa_eventsTable
+        self.__CaBaMa_rowIndex = {}
+        self.__CaBaMa_endDateIndex = {}
+
         # CaBaMa_eventsTableKeys
         self.__CaBaMa_outputEventsTableKeys = ['repairActionRequestDate [-]',
                                                'repairActionDate [-]',
@@ -1153,9 +2758,8 @@ class LCOE_Calculator(object):
                                                 'costOM_Spare [Euro]',
                                                 'nameOfvessel [-]']
 
-        self.__CaBaMa_outputEventsTable = pd.DataFrame(
-                                index=[0],
-                                columns=self.__CaBaMa_outputEventsTableKeys)
+        self.__CaBaMa_outputEvents = []
+        self.__CaBaMa_outputEventsTable = None
 
         # Condition based maintenance: Number of parallel actions [-]
         self.__CoBaMa_nrOfMaxActions = 10
@@ -1200,9 +2804,8 @@ class LCOE_Calculator(object):
                                                'costOM_Spare [Euro]',
                                                'nameOfvessel [-]']
 
-        self.__CoBaMa_outputEventsTable = pd.DataFrame(
-                                index=[0],
-                                columns=self.__CoBaMa_outputEventsTableKeys)
+        self.__CoBaMa_outputEvents = []
+        self.__CoBaMa_outputEventsTable = None
 
         # actual index of UnCoMa_eventsTable
         self.__actIdxOfUnCoMa = 0
@@ -1232,121 +2835,21 @@ class LCOE_Calculator(object):
         # [hours]
         self.__timeExtensionDeratingCoBaMaHour = 3 *30 * self.__dayHours
 
-        # end: Declaration of internally parameters for mainCalc
-        #######################################################################
-
-
-        #######################################################################
-        # Start: Flags for dtocean_maintenance test purposes
-
-        self.__checkNoSolution = self.__Control_Param['checkNoSolution']
-        self.__curtailDevices = self.__Control_Param['curtailDevices']
-        self.__dtocean_maintenance_PRINT_FLAG = self.__Control_Param[
-                                            'dtocean_maintenance_PRINT_FLAG']
-        self.__dtocean_logistics_PRINT_FLAG = self.__Control_Param[
-                                            'dtocean_logistics_PRINT_FLAG']
-        self.__dtocean_maintenance_TEST_FLAG = self.__Control_Param[
-                                            'dtocean_maintenance_TEST_FLAG']
-
-        return
-
-    def __changeOfLabels(self):
-
-        '''__changeOfLabels function: changes the labels of some tables
-
-        '''
-
-        # Component -> Component_ID
-        # Component
-        col_map = dict(zip(self.__Component.columns,
-                           list(self.__Component.loc['Component_ID'])))
-
-        self.__Component.rename(columns=col_map, inplace=True)
-
-        # Component -> Component_ID
-        # Simu_Param
-        components = self.__Simu_Param['arrayInfoLogistic'].loc['Component_ID']
-        col_map = dict(zip(self.__Simu_Param['arrayInfoLogistic'].columns,
-                           list(components)))
-
-        self.__Simu_Param['arrayInfoLogistic'].rename(columns=col_map,
-                                                      inplace=True)
-
-        # Repair_Action
-        nuOfColumnsRA = self.__Repair_Action.shape[1]
-        idListRA = list(self.__Repair_Action.loc['Component_ID'])
-        fmListRA = list(self.__Repair_Action.loc['FM_ID'])
-
-        newColumnsRA = []
-        for iCnt in range(0,nuOfColumnsRA):
-            newColumnsRA.append('dummy')
-
-        # Inspection
-        nuOfColumnsInsp = self.__Inspection.shape[1]
-        idListInsp = list(self.__Inspection.loc['Component_ID'])
-        fmListInsp = list(self.__Inspection.loc['FM_ID'])
-        newColumnsInsp = []
-        for iCnt in range(0,nuOfColumnsInsp):
-            newColumnsInsp.append('dummy')
-
-        # Failure_Mode
-        nuOfColumns = self.__Failure_Mode.shape[1]
-        idList = list(self.__Failure_Mode.loc['Component_ID'])
-        fmList = list(self.__Failure_Mode.loc['FM_ID'])
-
-        newColumns = []
-        for iCnt in range(0,nuOfColumns):
-            if len(newColumns) == 0:
-                newColumns.append(idList[iCnt] + '_1')
-
-            else:
-                index = 0
-                for iCnt1 in range(0,len(newColumns)):
-                    if idList[iCnt] == string.rsplit(newColumns[iCnt1],'_')[0]:
-                         index = index + 1
-
-                if index == 0:
-                    newColumns.append(idList[iCnt] + '_1')
-                else:
-                    newColumns.append(idList[iCnt] + '_' + str(index + 1))
-
-            indexList = -1
-
-            for iCnt1 in range(0, nuOfColumnsRA):
-
-                if (idListRA[iCnt1] == idList[iCnt] and
-                    fmListRA[iCnt1] == fmList[iCnt]):
-
-                    indexList = iCnt1
-                    break
-
-            if indexList != -1:
-                newColumnsRA[indexList] = newColumns[-1]
-
-            indexList = -1
-
-            for iCnt1 in range(0, nuOfColumnsInsp):
-
-                if (idListInsp[iCnt1] == idList[iCnt] and
-                    fmListInsp[iCnt1] == fmList[iCnt]):
-
-                    indexList = iCnt1
-                    break
-
-            if indexList != -1:
-                newColumnsInsp[indexList] = newColumns[-1]
+        # end: Declaration of internally parameters for mainCalc
+        #######################################################################
 
-        # Failure_Mode
-        col_map = dict(zip(self.__Failure_Mode.columns, newColumns))
-        self.__Failure_Mode.rename(columns=col_map, inplace=True)
 
-        # Repair_Action
-        col_map = dict(zip(self.__Repair_Action.columns, newColumnsRA))
-        self.__Repair_Action.rename(columns=col_map, inplace=True)
+        #######################################################################
+        # Start: Flags for dtocean_maintenance test purposes
 
-        # Inspection
-        col_map = dict(zip(self.__Inspection.columns, newColumnsInsp))
-        self.__Inspection.rename(columns=col_map, inplace=True)
+        self.__checkNoSolution = self.__Control_Param['checkNoSolution']
+        self.__curtailDevices = self.__Control_Param['curtailDevices']
+        self.__dtocean_maintenance_PRINT_FLAG = self.__Control_Param[
+                                            'dtocean_maintenance_PRINT_FLAG']
+        self.__dtocean_logistics_PRINT_FLAG = self.__Control_Param[
+                                            'dtocean_logistics_PRINT_FLAG']
+        self.__dtocean_maintenance_TEST_FLAG = self.__Control_Param[
+                                            'dtocean_maintenance_TEST_FLAG']
 
         return
 
@@ -1373,7 +2876,6 @@ class LCOE_Calculator(object):
 
         # Initialisation
         self.__initCalc()
-        self.__initPorts()
 
         if self.__checkNoSolution == True:
 
@@ -1463,27 +2965,9 @@ class LCOE_Calculator(object):
 
         '''
 
-        # mission time in hours
-        mission_time = self.__operationTimeYear * self.__yearDays * \
-                                                            self.__dayHours
-
-        input_variables = Variables(mission_time,
-                                    self.__systype,
-                                    self.__db,
-                                    None,
-                                    self.__eleclayout,
-                                    self.__elechierdict,
-                                    self.__elecbomeg,
-                                    self.__moorhiereg,
-                                    self.__moorbomeg,
-                                    self.__userhiereg,
-                                    self.__userbomeg)
-
-        # Make an instance of RAM
-        self.__ramPTR = Main(input_variables)
-
-        # calculation of RAM
-        self.__ram = self.__calcRAM()
+        # results of RAM are shared by all data points
+        self.__rsubsysvalues = self.__context.get_rsubsysvalues()
+        self.__rcompvalues = self.__context.get_rcompvalues()
 
         # make instance of arrayClass
         self.__arrayPTR = Array(self.__startOperationDate,
@@ -1494,7 +2978,14 @@ class LCOE_Calculator(object):
                                 self.__systype,
                                 self.__UnCoMa_eventsTableKeys,
                                 self.__NoPoisson_eventsTableKeys,
-                                self.__dtocean_maintenance_PRINT_FLAG)
+                                self.__dtocean_maintenance_PRINT_FLAG,
+                                self.__context.get_ramTable())
+
+        # The unplanned repair actions are delayed from the failure events
+        if self.__Farm_OM['corrective_maintenance'] == True:
+            repairDelays = self.__context.get_repairDelays()
+        else:
+            repairDelays = None
 
         # Read from RAM and calculate the poisson events of failure rates
         (self.__arrayDict,
@@ -1507,7 +2998,10 @@ class LCOE_Calculator(object):
                                          self.__Failure_Mode,
                                          self.__Repair_Action,
                                          self.__Inspection,
-                                         self.__annual_Energy_Production_perD)
+                                         self.__annual_Energy_Production_perD,
+                                         self.__random_state,
+                                         self.__context.get_femTemplate(),
+                                         repairDelays)
 
         if (self.__Farm_OM['calendar_based_maintenance'] == True or
             self.__Farm_OM['condition_based_maintenance'] == True):
@@ -1527,8 +3021,7 @@ class LCOE_Calculator(object):
                 indexFM = self.__eventsTableNoPoisson.indexFM[iCnt]
                 failureRate = self.__eventsTableNoPoisson.failureRate[iCnt]
                 
-                component = self.__Component[ComponentID]
-                component = component.apply(pd.to_numeric, errors="ignore")
+                component = self.__componentRecords[ComponentID]
                 interval = component['interval_calendar_based_maintenance']
                 threshold_percent = component['soh_threshold']
                 
@@ -1630,7 +3123,8 @@ class LCOE_Calculator(object):
 
                         poissonValue = poisson_process(currentStartActionDate,
                                                        self.__operationTimeDay,
-                                                       frate)
+                                                       frate,
+                                                       self.__random_state)
 
                         self.__arrayDict[ComponentID] \
                                         ['CoBaMa_FR List'] \
@@ -1689,6 +3183,10 @@ class LCOE_Calculator(object):
                 # start index with 0
                 self.__CaBaMa_eventsTable.reset_index(drop=True, inplace=True)
 
+                # indices are rebuilt for the sorted table
+                self.__CaBaMa_rowIndex = {}
+                self.__CaBaMa_endDateIndex = {}
+
             # sort of condition_based_maintenance
             if (self.__Farm_OM['condition_based_maintenance'] == True and
                 0 < len(self.__CoBaMa_eventsTable)):
@@ -1739,213 +3237,6 @@ class LCOE_Calculator(object):
                 self.__UnCoMa_eventsTable.reset_index(drop=True,
                                                       inplace=True)
 
-            # change of self.__UnCoMa_eventsTable concerning
-            for iCnt in range(0, len(self.__UnCoMa_eventsTable)):
-
-                # shift repairActionEvents
-                failureEvents   = self.__UnCoMa_eventsTable.failureEvents[iCnt]
-                ComponentID     = self.__UnCoMa_eventsTable.ComponentID[iCnt]
-                FM_ID           = self.__UnCoMa_eventsTable.FM_ID[iCnt]
-                indexFM         = self.__UnCoMa_eventsTable.indexFM[iCnt]
-                CompIDWithIndex = ComponentID + '_' + str(indexFM)
-
-                shiftHoursDummy1 = 0
-                logic = 'Insp' in FM_ID
-
-                if not logic:
-                
-                    repair_action = self.__Repair_Action[CompIDWithIndex]
-                    repair_action = repair_action.apply(pd.to_numeric,
-                                                        errors="ignore")
-                    # repairAction
-                    shiftHoursDummy1 = repair_action['delay_spare']
-
-                    delay_crew = repair_action['delay_crew']
-                    delay_org = repair_action['delay_organisation']
-                    shiftHoursDummy2 = delay_crew + delay_org
-
-                else:
-                    
-                    # inspection
-                    inspection = self.__Inspection[CompIDWithIndex]
-                    inspection = inspection.apply(pd.to_numeric,
-                                                  errors="ignore")
-                    
-                    shiftHoursDummy1 = 0
-
-                    delay_crew = inspection['delay_crew']
-                    delay_org = inspection['delay_organisation']
-                    shiftHoursDummy2 = delay_crew + delay_org
-
-                shiftHours = float(max(shiftHoursDummy1, shiftHoursDummy2))
-                shiftDate = failureEvents + timedelta(hours=shiftHours)
-
-                self.__UnCoMa_eventsTable.loc[iCnt,
-                                              'repairActionEvents'] = shiftDate
-
-            # sort of eventsTable
-            self.__UnCoMa_eventsTable.sort_values(by='repairActionEvents',
-                                                  inplace=True)
-
-            # start index with 0
-            self.__UnCoMa_eventsTable.reset_index(drop=True, inplace=True)
-
-        return
-
-    def __calcRAM(self):
-
-        '''__calcRAM function: calls of dtocean-reliability and saves the
-        results
-
-        '''
-
-        # Execute call method of RAM
-        self.__ramPTR()
-
-        # list rsubsysvalues from RAM
-        self.__rsubsysvalues = self.__ramPTR.rsubsysvalues3
-
-        # list rcompvalues from RAM
-        self.__rcompvalues = self.__ramPTR.rcompvalues3
-
-        return
-    
-    def __initPorts(self):
-        
-        outputsForPortSelection = pd.DataFrame(index=[0],
-                                               columns=self.__logisticKeys)
-
-        sp_dry_mass_dummy       = 0.01
-        sp_length_dummy         = 0.01
-        sp_width_dummy          = 0.01
-        sp_height_dummy         = 0.01
-
-        self.__portDistIndex['inspection'] = []
-        self.__portDistIndex['repair']     = []
-
-        for iCnt in range(0,len(self.__eventsTableNoPoisson)):
-
-            ComponentID = self.__eventsTableNoPoisson.ComponentID[iCnt]
-
-            indexFM = self.__eventsTableNoPoisson.indexFM[iCnt]
-            CompIDWithIndex = ComponentID + '_' + str(indexFM)
-            
-            failure_mode = self.__Failure_Mode[CompIDWithIndex]
-            failure_mode = failure_mode.apply(pd.to_numeric,
-                                              errors="ignore")
-
-            # max of values
-            sp_dry_mass = failure_mode['spare_mass']
-
-            if sp_dry_mass_dummy < sp_dry_mass:
-                sp_dry_mass_dummy = sp_dry_mass
-
-            sp_length = failure_mode['spare_length']
-
-            if sp_length_dummy < sp_length:
-                sp_length_dummy = sp_length
-
-            sp_width = failure_mode['spare_width']
-
-            if sp_width_dummy < sp_width:
-                sp_width_dummy = sp_width
-
-            sp_height = failure_mode['spare_height']
-
-            if sp_height_dummy < sp_height:
-                sp_height_dummy = sp_height
-
-        # Inspection case
-        # *****************************************************************
-        # *****************************************************************
-        # *****************************************************************
-        values = ['INS_PORT',
-                  '',
-                  '',
-                  '',
-                  '',
-                  self.__entry_point['x coord [m]'].iloc[0],
-                  self.__entry_point['y coord [m]'].iloc[0],
-                  self.__entry_point['zone [-]'].iloc[0],
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  sp_dry_mass_dummy,
-                  sp_length_dummy,
-                  sp_width_dummy,
-                  sp_height_dummy,
-                  '',
-                  '',
-                  '',
-                  '',
-                  0]
-
-        outputsForPortSelection.iloc[0] = values
-
-        om_port = select_port_OM.OM_port(outputsForPortSelection,
-                                         self.__ports)
-
-        self.__portDistIndex['inspection'].append(
-                om_port['Distance port-site [km]'])
-        self.__portDistIndex['inspection'].append(
-                om_port['Port database index [-]'])
-
-        # Repair case
-        # *****************************************************************
-        # *****************************************************************
-        # *****************************************************************
-        values = ['OM_PORT',
-                  '',
-                  '',
-                  '',
-                  '',
-                  self.__entry_point['x coord [m]'].iloc[0],
-                  self.__entry_point['y coord [m]'].iloc[0],
-                  self.__entry_point['zone [-]'].iloc[0],
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  '',
-                  sp_dry_mass_dummy,
-                  sp_length_dummy,
-                  sp_width_dummy,
-                  sp_height_dummy,
-                  '',
-                  '',
-                  '',
-                  '',
-                  0]
-
-        outputsForPortSelection.iloc[0] = values
-
-        # Port Selection based on input
-        om_port = select_port_OM.OM_port(outputsForPortSelection,
-                                         self.__ports)
-
-        self.__portDistIndex['repair'].append(
-                om_port['Distance port-site [km]'])
-        self.__portDistIndex['repair'].append(
-                om_port['Port database index [-]'])
-        
         return
 
     def __initCheck(self):
@@ -1973,9 +3264,7 @@ class LCOE_Calculator(object):
             CompIDWithIndex = ComponentID + \
                     '_' + str(self.__eventsTableNoPoisson.indexFM[iCnt])
             
-            failure_mode = self.__Failure_Mode[CompIDWithIndex]
-            failure_mode = failure_mode.apply(pd.to_numeric,
-                                              errors="ignore")
+            failure_mode = self.__failureModeRecords[CompIDWithIndex]
             
             # for logistic
             sp_dry_mass = failure_mode['spare_mass']
@@ -1997,9 +3286,7 @@ class LCOE_Calculator(object):
 
             if 'Insp' in FM_ID:
                 
-                inspection = self.__Inspection[CompIDWithIndex]
-                inspection = inspection.apply(pd.to_numeric,
-                                              errors="ignore")
+                inspection = self.__inspectionRecords[CompIDWithIndex]
 
                 # for logistic
                 technician = inspection['number_technicians'] + \
@@ -2009,9 +3296,7 @@ class LCOE_Calculator(object):
 
             else:
                 
-                repair_action = self.__Repair_Action[CompIDWithIndex]
-                repair_action = repair_action.apply(pd.to_numeric,
-                                                    errors="ignore")
+                repair_action = self.__repairActionRecords[CompIDWithIndex]
                 # for logistic
                 technician = repair_action['number_technicians'] + \
                              repair_action['number_specialists']
@@ -2129,87 +3414,29 @@ class LCOE_Calculator(object):
             #self.__om_logistic_outputs = pd.DataFrame(index=[0],columns=keys)
             self.__wp6_outputsForLogistic.iloc[0] = values
 
-            # apply dafety factors in vessels parameters
-            (ports,
-             vessels,
-             equipments) = safety_factors(copy.deepcopy(self.__ports),
-                                          copy.deepcopy(self.__vessels),
-                                          copy.deepcopy(self.__equipments),
-                                          copy.deepcopy(self.__port_sf),
-                                          copy.deepcopy(self.__vessel_sf),
-                                          copy.deepcopy(self.__eq_sf))
-
-            # Collecting relevant port information
-            om_port_index = \
-                self.__wp6_outputsForLogistic['Port_Index [-]'].iloc[0]
-
-            om_port = {}
-            om_port['Selected base port for installation'] = \
-                                                ports.iloc[om_port_index]
-                                                
-                                                
             # Convert to numeric if possible
             self.__wp6_outputsForLogistic = \
                 self.__wp6_outputsForLogistic.apply(pd.to_numeric,
                                                     errors='ignore')
 
-#                """
-#                 Initialising logistic operations and logistic phase
-#                """
-            logOp = logOp_init(self.__schedule_OLC)
-
-            logPhase_om = logPhase_om_init(logOp,
-                                           vessels,
-                                           equipments,
-                                           self.__wp6_outputsForLogistic)
-
-            # Select the suitable Log phase id
-            log_phase_id = logPhase_select(self.__wp6_outputsForLogistic)
-            log_phase = logPhase_om[log_phase_id]
-            log_phase.op_ve_init = log_phase.op_ve
-
-#                """
-#                 Assessing the O&M logistic phase requested
-#                """
-
-            # Initialising the output dictionary to be passed to the O&M
-            # module
-            om_log = {'port': om_port,
-                      'requirement': {},
-                      'eq_select': {},
-                      've_select': {},
-                      'combi_select': {},
-                      'cost': {},
-                      'optimal': {},
-                      'risk': {},
-                      'envir': {},
-                      'findSolution': {}
-                      }
-
-            # Characterizing the logistic requirements
-            om_log['requirement'] = feas_om(log_phase,
-                                            log_phase_id,
-                                            self.__wp6_outputsForLogistic,
+            # Feasibility, selection and compatibility of the logistic
+            # solutions, which are stored for the following operations
+            (om_log,
+             log_phase,
+             log_phase_id,
+             MATCH_FLAG) = om_logistics_feasibility(
+                                            self.__vessels,
+                                            self.__equipments,
+                                            self.__ports,
+                                            self.__schedule_OLC,
                                             self.__device,
                                             self.__sub_device,
                                             self.__collection_point,
-                                            self.__connectors,
                                             self.__dynamic_cable,
-                                            self.__static_cable)
-
-            # Selecting the maritime infrastructure satisfying the logistic requirements
-            om_log['eq_select'], log_phase = select_e(om_log, log_phase)
-            om_log['ve_select'], log_phase = select_v(om_log, log_phase)
-
-            # Matching requirements to ensure compatiblity of combinations of
-            # port/vessel(s)/equipment leading to feasible logistic solutions
-            port = om_port['Selected base port for installation']
-
-            (om_log['combi_select'],
-             log_phase,
-             MATCH_FLAG) = compatibility_ve(om_log,
-                                            log_phase,
-                                            port)
+                                            self.__static_cable,
+                                            self.__connectors,
+                                            self.__wp6_outputsForLogistic,
+                                            self.__feasibilityCache)
 
             stop_time_logistic = timeit.default_timer()
             
@@ -2327,6 +3554,10 @@ class LCOE_Calculator(object):
         self.__actIdxOfUnCoMa = 0
         self.__actIdxOfCaBaMa = 0
         self.__actIdxOfCoBaMa = 0
+        
+        # pending corrective maintenance events in order of repair date
+        self.__UnCoMa_eventQueue = CorrectiveEventQueue(
+                                                    self.__UnCoMa_eventsTable)
 
         # set the local loops to zero
         loop = 0
@@ -2421,7 +3652,7 @@ class LCOE_Calculator(object):
                                                  flagCalcCoBaMa,
                                                  flagCalcUnCoMa)
 
-                if self.__actIdxOfUnCoMa == len(self.__UnCoMa_eventsTable):
+                if len(self.__UnCoMa_eventQueue) == 0:
 
                     flagCalcUnCoMa = False
                     loop = 0
@@ -2455,14 +3686,8 @@ class LCOE_Calculator(object):
         CompIDWithIndex = ComponentID + '_' + str(indexFM)
         currentAlarmDateStr = currentAlarmDate.strftime(self.__strFormat1)
         
-        try:
-            self.__repairActionDate = datetime.datetime.strptime(
-                                                        str(currentAlarmDate),
-                                                        self.__strFormat3)
-        except ValueError:
-            self.__repairActionDate = datetime.datetime.strptime(
-                                                        str(currentAlarmDate),
-                                                        self.__strFormat2)
+        self.__repairActionDate = pd.Timestamp(
+                                            currentAlarmDate).to_pydatetime()
 
         # break condition
         module_logger.debug((self.__endOperationDate, type(self.__endOperationDate)))
@@ -2514,8 +3739,7 @@ class LCOE_Calculator(object):
 
         # Calculate the cost of operation at alarm date
         # independent from inspection or repair action
-        failure_mode = self.__Failure_Mode[CompIDWithIndex]
-        failure_mode = failure_mode.apply(pd.to_numeric, errors="ignore")
+        failure_mode = self.__failureModeRecords[CompIDWithIndex]
         
         sp_dry_mass = failure_mode['spare_mass']
         sp_length   = failure_mode['spare_length']
@@ -2523,13 +3747,11 @@ class LCOE_Calculator(object):
         sp_height   = failure_mode['spare_height']
 
         if 'Insp' in FM_ID:
-            series = self.__Inspection[CompIDWithIndex]
+            series = self.__inspectionRecords[CompIDWithIndex]
             action = 'inspection'
         else:
-            series = self.__Repair_Action[CompIDWithIndex]
+            series = self.__repairActionRecords[CompIDWithIndex]
             action = 'repair'
-            
-        series = series.apply(pd.to_numeric, errors="ignore")
         
         if 'Insp' in FM_ID:
             d_om = series['duration_inspection']
@@ -2758,20 +3980,23 @@ class LCOE_Calculator(object):
 
             if 'subhub' in ComponentType:
 
-                dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                        (self.__CaBaMa_eventsTable['ComponentType'] == \
-                                            CaBaMaTableQueryDeviceID) & \
-                        (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                        (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+                dummyCaBaMaTable = self.__getCaBaMaRows(
+                                        ('ComponentType', 'FM_ID', 'indexFM'),
+                                        (CaBaMaTableQueryDeviceID,
+                                         FM_ID,
+                                         indexFM))
 
             else:
 
-                dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                    (self.__CaBaMa_eventsTable['RA_ID'] == RA_ID) & \
-                    (self.__CaBaMa_eventsTable['ComponentSubType'] == \
-                                       CaBaMaTableQuerySubSystem) & \
-                     (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                     (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+                dummyCaBaMaTable = self.__getCaBaMaRows(
+                                        ('RA_ID',
+                                         'ComponentSubType',
+                                         'FM_ID',
+                                         'indexFM'),
+                                        (RA_ID,
+                                         CaBaMaTableQuerySubSystem,
+                                         FM_ID,
+                                         indexFM))
 
             indexDummyCaBaMaTable = 0
 
@@ -2996,22 +4221,17 @@ class LCOE_Calculator(object):
             (flagCaBaMa == False and
                  self.__Farm_OM['calendar_based_maintenance'] == True)):
             
-            try:
-                alarmstr = datetime.datetime.strptime(str(currentAlarmDate),
-                                                      self.__strFormat3)
-            except ValueError:
-                alarmstr = datetime.datetime.strptime(str(currentAlarmDate),
-                                                      self.__strFormat2)
+            alarmDate = pd.Timestamp(currentAlarmDate)
                 
             vessel_equip = self.__om_logistic['optimal']['vessel_equipment']
             vessel_name = vessel_equip[0][2]["Name"]
             
             valuesForOutput = [failureRate,
-                               alarmstr,
-                               alarmstr,
-                               str(self.__departOpDate.replace(second=0)),
+                               alarmDate,
+                               alarmDate,
+                               self.__departOpDate.replace(second=0),
                                int(totalDownTimeHours),
-                               '',
+                               downtimeDeviceList,
                                ComponentType,
                                ComponentSubType,
                                ComponentID,
@@ -3023,11 +4243,7 @@ class LCOE_Calculator(object):
                                int(omCostValueSpare),
                                vessel_name]
 
-            self.__CoBaMa_outputEventsTable.loc[
-                                loopValuesForOutput_CoBaMa] = valuesForOutput
-            self.__CoBaMa_outputEventsTable.loc[
-                                loopValuesForOutput_CoBaMa,
-                                'downtimeDeviceList [-]'] = downtimeDeviceList
+            self.__CoBaMa_outputEvents.append(valuesForOutput)
 
             # loopValuesForOutput
             loopValuesForOutput_CoBaMa = loopValuesForOutput_CoBaMa + 1
@@ -3105,6 +4321,65 @@ class LCOE_Calculator(object):
 
         return loop, loopValuesForOutput_CoBaMa, flagCalcCoBaMa
 
+    def __getCaBaMaRows(self, keys, values):
+
+        '''__getCaBaMaRows function: selects the rows of CaBaMa_eventsTable
+        with the given values in the given columns. The positions of the rows
+        are looked up in an index of the table, which is built once for each
+        set of columns.
+
+        Args:
+            keys (tuple of str) [-]: columns of CaBaMa_eventsTable
+            values (tuple) [-]: values of the columns
+
+        Returns:
+            dummyCaBaMaTable (DataFrame) [-]: matching rows, in table order
+
+        '''
+
+        if keys not in self.__CaBaMa_rowIndex:
+
+            rowIndex = defaultdict(list)
+            columns = [self.__CaBaMa_eventsTable[key].tolist()
+                                                            for key in keys]
+
+            for row, rowValues in enumerate(zip(*columns)):
+                rowIndex[rowValues].append(row)
+
+            self.__CaBaMa_rowIndex[keys] = dict(rowIndex)
+
+        rows = self.__CaBaMa_rowIndex[keys].get(values, [])
+
+        return self.__CaBaMa_eventsTable.iloc[rows]
+
+    def __getCaBaMaEndDates(self, keys, values):
+
+        '''__getCaBaMaEndDates function: returns the current end dates of the
+        rows of CaBaMa_eventsTable with the given values in the given columns,
+        in ascending order. The dates are kept until the end dates of the
+        table are next updated.
+
+        Args:
+            keys (tuple of str) [-]: columns of CaBaMa_eventsTable
+            values (tuple) [-]: values of the columns
+
+        Returns:
+            endDates (list) [-]: sorted current end dates of the rows
+
+        '''
+
+        indexKey = (keys, values)
+
+        if indexKey not in self.__CaBaMa_endDateIndex:
+
+            dummyCaBaMaTable = self.__getCaBaMaRows(keys, values)
+            endDates = sorted(
+                        dummyCaBaMaTable['currentEndActionDate'].tolist())
+
+            self.__CaBaMa_endDateIndex[indexKey] = endDates
+
+        return self.__CaBaMa_endDateIndex[indexKey]
+
     def __switch_to_calendar(self, CaBaMaSolution,
                                    dummyCaBaMaTable,
                                    ComponentID,
@@ -3217,24 +4492,29 @@ class LCOE_Calculator(object):
 
         if 'subhub' in ComponentType:
 
-            dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                (self.__CaBaMa_eventsTable['ComponentType'] ==
-                                                CaBaMaTableQueryDeviceID) & \
-                (self.__CaBaMa_eventsTable['startActionDate'] ==
-                                                startActionDate) & \
-                (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+            dummyCaBaMaTable = self.__getCaBaMaRows(
+                                        ('ComponentType',
+                                         'startActionDate',
+                                         'FM_ID',
+                                         'indexFM'),
+                                        (CaBaMaTableQueryDeviceID,
+                                         startActionDate,
+                                         FM_ID,
+                                         indexFM))
 
         else:
 
-            dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                (self.__CaBaMa_eventsTable['RA_ID'] == RA_ID) & \
-                (self.__CaBaMa_eventsTable['ComponentSubType'] ==
-                                                 CaBaMaTableQuerySubSystem) & \
-                (self.__CaBaMa_eventsTable['startActionDate'] ==
-                                                 startActionDate) & \
-                (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+            dummyCaBaMaTable = self.__getCaBaMaRows(
+                                        ('RA_ID',
+                                         'ComponentSubType',
+                                         'startActionDate',
+                                         'FM_ID',
+                                         'indexFM'),
+                                        (RA_ID,
+                                         CaBaMaTableQuerySubSystem,
+                                         startActionDate,
+                                         FM_ID,
+                                         indexFM))
           
         # Exit if no actions are required.
         if dummyCaBaMaTable.empty:
@@ -3270,8 +4550,7 @@ class LCOE_Calculator(object):
             currentStartActionDate = \
                                 dummyCaBaMaTable.currentStartActionDate[bidx]
 
-            actiondt = datetime.datetime.strptime(str(currentStartActionDate),
-                                                  self.__strFormat3)
+            actiondt = pd.Timestamp(currentStartActionDate).to_pydatetime()
 
             # Date of logistic request
             self.__repairActionDate = actiondt
@@ -3321,8 +4600,7 @@ class LCOE_Calculator(object):
 
                 if iCnt == 0:
 
-                    failure = self.__Failure_Mode[CompIDWithIndex]
-                    failure = failure.apply(pd.to_numeric, errors="ignore")
+                    failure = self.__failureModeRecords[CompIDWithIndex]
 
                     # independent from inspection or repair action
                     sp_dry_mass = failure['spare_mass']
@@ -3332,9 +4610,7 @@ class LCOE_Calculator(object):
 
                     if 'Insp' in FM_ID:
 
-                        inspection = self.__Inspection[CompIDWithIndex]
-                        inspection = inspection.apply(pd.to_numeric,
-                                                      errors="ignore")
+                        inspection = self.__inspectionRecords[CompIDWithIndex]
 
                         # For logistic
                         d_acc = inspection['duration_accessibility']
@@ -3356,8 +4632,7 @@ class LCOE_Calculator(object):
 
                     else:
 
-                        repair = self.__Repair_Action[CompIDWithIndex]
-                        repair = repair.apply(pd.to_numeric, errors="ignore")
+                        repair = self.__repairActionRecords[CompIDWithIndex]
 
                         # for logistic
                         d_acc = repair['duration_accessibility']
@@ -3602,6 +4877,9 @@ class LCOE_Calculator(object):
                 self.__CaBaMa_eventsTable.loc[tidx,
                                               'logisticCost'] = logisticcost
                 self.__CaBaMa_eventsTable.loc[tidx, 'omCost'] = omcost
+
+            # the current end dates have changed
+            self.__CaBaMa_endDateIndex = {}
             
             # Save the cost of operation
             if belongsTo == 'Array':
@@ -3709,10 +4987,10 @@ class LCOE_Calculator(object):
 
             for iCnt1 in range(0, blockNumber):
 
-                valuesForOutput = [str(currentStartActionDate),
-                                   str(currentStartActionDateList[iCnt1]),
+                valuesForOutput = [currentStartActionDate,
+                                   currentStartActionDateList[iCnt1],
                                    totalDownTimeHours,
-                                   '',
+                                   downtimeDeviceList[iCnt1],
                                    str(ComponentTypeList[iCnt1]),
                                    str(ComponentSubTypeList[iCnt1]),
                                    str(ComponentIDList[iCnt1]),
@@ -3724,12 +5002,7 @@ class LCOE_Calculator(object):
                                    round(omCostValueSpare, 2),
                                    vessel_name]
 
-                self.__CaBaMa_outputEventsTable.loc[
-                        loopValuesForOutput_CaBaMa] = valuesForOutput
-                self.__CaBaMa_outputEventsTable.loc[
-                                        loopValuesForOutput_CaBaMa,
-                                        'downtimeDeviceList [-]'] = \
-                                                downtimeDeviceList[iCnt1]
+                self.__CaBaMa_outputEvents.append(valuesForOutput)
 
                 loopValuesForOutput_CaBaMa = loopValuesForOutput_CaBaMa + 1
 
@@ -3755,7 +5028,7 @@ class LCOE_Calculator(object):
                                    flagCalcUnCoMa):
         
         # Skip empty tables
-        if self.__UnCoMa_eventsTable.empty:
+        if len(self.__UnCoMa_eventQueue) == 0:
         
             return (loop,
                     loopValuesForOutput_UnCoMa,
@@ -3764,20 +5037,20 @@ class LCOE_Calculator(object):
             
         start_time_UnCoMa = timeit.default_timer()
 
-        # actualIndexOfRepairTable is determined
+        # the next event in the queue is determined
         # do the the reapir
-        idx = self.__actIdxOfUnCoMa
+        event = self.__UnCoMa_eventQueue.peek()
             
-        ComponentType = str(self.__UnCoMa_eventsTable.ComponentType[idx])
-        ComponentSubType = str(self.__UnCoMa_eventsTable.ComponentSubType[idx])
-        ComponentID = str(self.__UnCoMa_eventsTable.ComponentID[idx])
-        RA_ID = str(self.__UnCoMa_eventsTable.RA_ID[idx])
-        FM_ID = str(self.__UnCoMa_eventsTable.FM_ID[idx])
-        belongsTo = str(self.__UnCoMa_eventsTable.belongsTo[idx])
-        failureEvents = self.__UnCoMa_eventsTable.failureEvents[idx]
-        repairActionEvents = self.__UnCoMa_eventsTable.repairActionEvents[idx]
-        failureRate = self.__UnCoMa_eventsTable.failureRate[idx]
-        indexFM = self.__UnCoMa_eventsTable.indexFM[self.__actIdxOfUnCoMa]
+        ComponentType = str(event['ComponentType'])
+        ComponentSubType = str(event['ComponentSubType'])
+        ComponentID = str(event['ComponentID'])
+        RA_ID = str(event['RA_ID'])
+        FM_ID = str(event['FM_ID'])
+        belongsTo = str(event['belongsTo'])
+        failureEvents = event['failureEvents']
+        repairActionEvents = event['repairActionEvents']
+        failureRate = event['failureRate']
+        indexFM = event['indexFM']
 
         # simulate or not
         simulateFlag = True
@@ -3799,6 +5072,7 @@ class LCOE_Calculator(object):
 
         if simulateFlag == False:
 
+            self.__UnCoMa_eventQueue.pop()
             self.__actIdxOfUnCoMa = self.__actIdxOfUnCoMa + 1
 
             return (loop,
@@ -3807,17 +5081,11 @@ class LCOE_Calculator(object):
                     flagCalcUnCoMa)
             
         # Date of failure event      
-        try:
-            failureDate = datetime.datetime.strptime(str(failureEvents),
-                                                     self.__strFormat3)
-        except ValueError:
-            failureDate = datetime.datetime.strptime(str(failureEvents),
-                                                     self.__strFormat2)
+        failureDate = pd.Timestamp(failureEvents).to_pydatetime()
             
         # Check for nullification of failure from CaBaMa if the interval is
         # greater than zero
-        component = self.__Component[ComponentID]
-        component = component.apply(pd.to_numeric, errors="ignore")
+        component = self.__componentRecords[ComponentID]
         interval = component['interval_calendar_based_maintenance']
 
         if (self.__Farm_OM['calendar_based_maintenance'] == True and
@@ -3851,44 +5119,41 @@ class LCOE_Calculator(object):
     
                 if 'subhub' in ComponentType:
     
-                    dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                         (self.__CaBaMa_eventsTable['ComponentType'] == \
-                                                 CaBaMaTableQueryDeviceID) & \
-                         (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                         (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+                    endDates = self.__getCaBaMaEndDates(
+                                        ('ComponentType', 'FM_ID', 'indexFM'),
+                                        (CaBaMaTableQueryDeviceID,
+                                         FM_ID,
+                                         indexFM))
     
                 else:
     
-                    dummyCaBaMaTable = self.__CaBaMa_eventsTable.loc[
-                            (self.__CaBaMa_eventsTable['RA_ID'] == RA_ID) & \
-                            (self.__CaBaMa_eventsTable['ComponentSubType'] == \
-                                                 CaBaMaTableQuerySubSystem) & \
-                            (self.__CaBaMa_eventsTable['FM_ID'] == FM_ID) & \
-                            (self.__CaBaMa_eventsTable['indexFM'] == indexFM)]
+                    endDates = self.__getCaBaMaEndDates(
+                                        ('RA_ID',
+                                         'ComponentSubType',
+                                         'FM_ID',
+                                         'indexFM'),
+                                        (RA_ID,
+                                         CaBaMaTableQuerySubSystem,
+                                         FM_ID,
+                                         indexFM))
                     
-                if len(dummyCaBaMaTable) > 1:                
-                
-                    # sort of eventsTable
-                    dummyCaBaMaTable.sort_values(by='currentEndActionDate',
-                                                 inplace=True)
+                if len(endDates) > 1:
                     
-                    # start index with 0
-                    dummyCaBaMaTable.reset_index(drop=True, inplace=True)
-
-                    for iCnt in range(0, len(dummyCaBaMaTable)):
-
-                        enddate = dummyCaBaMaTable.currentEndActionDate[iCnt]
+                    # latest calendar action completed before the repair
+                    iEnd = bisect.bisect_right(endDates, repairActionEvents)
+                    
+                    if iEnd > 0:
+                        
+                        enddate = endDates[iEnd - 1]
                         secs = (repairActionEvents - enddate).total_seconds()
                         dummyTime = secs // 3600
-
-                        if dummyTime < 0: break
                         
                         if dummyTime < mttf_hours:
                             foundDeleteFlag = True
-                            break
 
             if foundDeleteFlag == True:
     
+                self.__UnCoMa_eventQueue.pop()
                 self.__actIdxOfUnCoMa = self.__actIdxOfUnCoMa + 1
     
                 return (loop,
@@ -3898,9 +5163,9 @@ class LCOE_Calculator(object):
             
         # Should the next operation be shifted? 
         if (loopValuesForOutput_UnCoMa > 0 and
-            self.__actIdxOfUnCoMa < len(self.__UnCoMa_eventsTable) - 1):
+            len(self.__UnCoMa_eventQueue) > 1):
 
-            next_rep = self.__UnCoMa_eventsTable.repairActionEvents[idx] + \
+            next_rep = repairActionEvents + \
                                   timedelta(hours=-self.__totalActionDelayHour)
                                   
             secs = (next_rep - self.__endOpDate).total_seconds()
@@ -3916,23 +5181,12 @@ class LCOE_Calculator(object):
 
         # delay of repairActionEvents in repair plan
         if self.__totalActionDelayHour < 0:
-            shiftDate = self.__UnCoMa_eventsTable.loc[idx,
-                                                      'repairActionEvents'] + \
+            repairActionEvents = repairActionEvents + \
                                   timedelta(hours=-self.__totalActionDelayHour)
-            self.__UnCoMa_eventsTable.loc[idx,
-                                          'repairActionEvents'] = shiftDate
-            repairActionEvents = \
-                self.__UnCoMa_eventsTable.repairActionEvents[idx]
 
         # Date of logistic request
-        try:
-            repairdate = datetime.datetime.strptime(str(repairActionEvents),
-                                                    self.__strFormat3)
-        except ValueError:
-            repairdate = datetime.datetime.strptime(str(repairActionEvents),
-                                                    self.__strFormat2)
-        
-        self.__repairActionDate = repairdate
+        self.__repairActionDate = pd.Timestamp(
+                                            repairActionEvents).to_pydatetime()
 
         repairActionDateStr = repairActionEvents.strftime(self.__strFormat1)
         CompIDWithIndex = ComponentID + '_' + str(indexFM)
@@ -3951,6 +5205,9 @@ class LCOE_Calculator(object):
                     loopValuesForOutput_UnCoMa,
                     flagCalcCoBaMa,
                     flagCalcUnCoMa)
+        
+        # the event is carried out
+        self.__UnCoMa_eventQueue.pop()
 
         if self.__dtocean_maintenance_PRINT_FLAG == True:
 
@@ -3961,8 +5218,7 @@ class LCOE_Calculator(object):
             print 'WP6: FM_ID = ', FM_ID
 
         # independent from inspection or repair action
-        failure = self.__Failure_Mode[CompIDWithIndex]
-        failure = failure.apply(pd.to_numeric, errors="ignore")
+        failure = self.__failureModeRecords[CompIDWithIndex]
 
         sp_dry_mass = failure['spare_mass']
         sp_length = failure['spare_length']
@@ -3972,8 +5228,7 @@ class LCOE_Calculator(object):
         if 'Insp' in FM_ID:
 
             # For logistic
-            inspection = self.__Inspection[CompIDWithIndex]
-            inspection = inspection.apply(pd.to_numeric, errors="ignore")
+            inspection = self.__inspectionRecords[CompIDWithIndex]
 
             d_acc = inspection['duration_accessibility']
             d_om = inspection['duration_inspection']
@@ -3995,8 +5250,7 @@ class LCOE_Calculator(object):
         else:
 
             # for logistic
-            repair = self.__Repair_Action[CompIDWithIndex]
-            repair = repair.apply(pd.to_numeric, errors="ignore")
+            repair = self.__repairActionRecords[CompIDWithIndex]
 
             d_acc = repair['duration_accessibility']
             d_om = repair['duration_maintenance']
@@ -4228,7 +5482,7 @@ class LCOE_Calculator(object):
 
         # Update poisson events in eventTables as device downtime increases
         # lifetime of components
-        self.__updatePoissonEvents()
+        self.__updatePoissonEvents(belongsTo, ComponentID)
 
         # for environmental team
         self.__env_assess(loop,
@@ -4241,13 +5495,13 @@ class LCOE_Calculator(object):
         vessel_name = vessel_equip[0][2]["Name"]
 
         valuesForOutput = [failureRate,
-                           str(failureEvents.replace(second=0)),
-                           str(repairActionEvents.replace(second=0)),
-                           str(self.__departOpDate.replace(second=0)),
+                           failureEvents.replace(second=0),
+                           repairActionEvents.replace(second=0),
+                           self.__departOpDate.replace(second=0),
                            int(totalDownTimeHours),
                            self.__totalSeaTimeHour,
                            totalWaitingTimeHours,
-                           '',
+                           downtimeDeviceList,
                            ComponentType,
                            ComponentSubType,
                            ComponentID,
@@ -4259,12 +5513,7 @@ class LCOE_Calculator(object):
                            int(omCostValueSpare),
                            vessel_name]
 
-        self.__UnCoMa_outputEventsTable.loc[loopValuesForOutput_UnCoMa] = \
-                                                            valuesForOutput
-        
-        self.__UnCoMa_outputEventsTable.set_value(loopValuesForOutput_UnCoMa,
-                                                  'downtimeDeviceList [-]',
-                                                  downtimeDeviceList)
+        self.__UnCoMa_outputEvents.append(valuesForOutput)
         
         # loopValuesForOutput
         loopValuesForOutput_UnCoMa = loopValuesForOutput_UnCoMa + 1
@@ -4292,19 +5541,28 @@ class LCOE_Calculator(object):
     def __calcLogistic(self, optimise_delay=False):
 
         '''__calcLogistic function: calls of dtocean-logistics and saves the
-        results
+        results. If a logistics cache is set, the solutions of previously
+        requested identical operations are reused.
 
         '''
 
-        self.__om_logistic = om_logistics_main(
-                                           copy.deepcopy(self.__vessels),
-                                           copy.deepcopy(self.__equipments),
-                                           copy.deepcopy(self.__ports),
+        if self.__logisticsCache is not None:
+
+            cacheKey = self.__logisticsCache.get_key(
+                                            self.__wp6_outputsForLogistic,
+                                            optimise_delay)
+            solution = self.__logisticsCache.get(cacheKey)
+
+            if solution is not None:
+                self.__om_logistic = solution
+                return
+
+        self.__om_logistic = om_logistics_factored(
+                                           self.__vessels,
+                                           self.__equipments,
+                                           self.__ports,
                                            self.__schedule_OLC,
                                            self.__other_rates,
-                                           copy.deepcopy(self.__port_sf),
-                                           copy.deepcopy(self.__vessel_sf),
-                                           copy.deepcopy(self.__eq_sf),
                                            self.__site,
                                            self.__metocean,
                                            self.__device,
@@ -4318,7 +5576,15 @@ class LCOE_Calculator(object):
                                            self.__wp6_outputsForLogistic,
                                            self.__dtocean_logistics_PRINT_FLAG,
                                            optimise_delay,
-                                           self.__custom_waiting)
+                                           self.__custom_waiting,
+                                           self.__feasibilityCache)
+
+        if self.__logisticsCache is not None:
+
+            # Only the solution is read from the logistics output
+            solution = {'findSolution': self.__om_logistic['findSolution'],
+                        'optimal': self.__om_logistic['optimal']}
+            self.__logisticsCache.add(cacheKey, solution)
 
         return
 
@@ -4453,16 +5719,14 @@ class LCOE_Calculator(object):
 
         if 'Insp' in FM_ID:
             
-            inspection = self.__Inspection[CompIDWithIndex]
-            inspection = inspection.apply(pd.to_numeric, errors="ignore")
+            inspection = self.__inspectionRecords[CompIDWithIndex]
 
             number_technicians = inspection['number_technicians']
             number_specialists = inspection['number_specialists']
 
         else:
             
-            repair_action = self.__Repair_Action[CompIDWithIndex]
-            repair_action = repair_action.apply(pd.to_numeric, errors="ignore")
+            repair_action = self.__repairActionRecords[CompIDWithIndex]
 
             number_technicians = repair_action['number_technicians']
             number_specialists = repair_action['number_specialists']
@@ -4472,8 +5736,7 @@ class LCOE_Calculator(object):
         wage_technician_day = self.__Farm_OM['wage_technician_day']
         wage_technician_night = self.__Farm_OM['wage_technician_night']
         
-        failure_mode = self.__Failure_Mode[CompIDWithIndex]
-        failure_mode = failure_mode.apply(pd.to_numeric, errors="ignore")
+        failure_mode = self.__failureModeRecords[CompIDWithIndex]
 
         # cost of OM for the current action [unit]
         cost_spare = failure_mode['cost_spare']
@@ -4552,68 +5815,67 @@ class LCOE_Calculator(object):
 
         return
 
-    def __updatePoissonEvents(self):
+    def __updatePoissonEvents(self, belongsTo, ComponentID):
 
         '''__updatePoissonEvents function: Updates the poisson events
 
+        Args:
+            belongsTo (str) : device or array of the repaired component
+            ComponentID (str) : ID of the repaired component
+
         '''
 
-        idx = self.__actIdxOfUnCoMa
-        belongsTo = self.__UnCoMa_eventsTable.belongsTo[idx]
-        ComponentID = self.__UnCoMa_eventsTable.ComponentID[idx]
+        breakdown = self.__arrayDict[ComponentID]['Breakdown']
 
-        if (belongsTo == 'Array' and
-            'All' in self.__arrayDict[ComponentID]['Breakdown']):
+        # shift of the pending events, which are resorted by the queue
+        if belongsTo == 'Array' and 'All' in breakdown:
+            self.__UnCoMa_eventQueue.shift(self.__totalSeaTimeHour)
+        else:
+            self.__UnCoMa_eventQueue.shift(self.__totalSeaTimeHour,
+                                           ComponentID,
+                                           breakdown)
 
-            # shift of the rows of eventTables
-            for iCnt in range(idx + 1, len(self.__UnCoMa_eventsTable)):
+        return
 
-                shiftDate = self.__UnCoMa_eventsTable.failureEvents[iCnt] + \
-                                    timedelta(hours=self.__totalSeaTimeHour)
+    @classmethod
+    def __getOutputEventsTable(cls, records, keys):
 
-                self.__UnCoMa_eventsTable.loc[iCnt,
-                                              'failureEvents'] = shiftDate
+        '''__getOutputEventsTable function: builds an output events table
+        from its rows. An empty table has a single row of missing values.
 
-                shiftDate = \
-                    self.__UnCoMa_eventsTable.repairActionEvents[iCnt] + \
-                                    timedelta(hours=self.__totalSeaTimeHour)
+        Args:
+            records (list of list) [-]: rows of the output events table
+            keys (list of str) [-]: keys of the output events table
 
-                self.__UnCoMa_eventsTable.loc[iCnt,
-                                              'repairActionEvents'] = shiftDate
+        Returns:
+            table (DataFrame) [-]: output events table
 
-        else:
+        '''
 
-            # shift of the rows of eventTables
-            for iCnt in range(idx + 1, len(self.__UnCoMa_eventsTable)):
+        if not records:
+            table = pd.DataFrame(index=[0], columns=keys)
+        else:
+            table = pd.DataFrame(records, columns=keys, dtype=object)
 
-                if not (self.__UnCoMa_eventsTable.loc[
-                         iCnt, 'ComponentID'] == ComponentID and
-                    self.__UnCoMa_eventsTable.loc[iCnt, 'belongsTo'] in
-                                self.__arrayDict[ComponentID]['Breakdown']):
+        return table
 
-                    continue
+    @classmethod
+    def __formatOutputDates(cls, table, keys):
 
-                shiftDate = self.__UnCoMa_eventsTable.failureEvents[iCnt] + \
-                                    timedelta(hours=self.__totalSeaTimeHour)
+        '''__formatOutputDates function: converts the dates of an output
+        events table to strings. Empty cells are not changed.
 
-                self.__UnCoMa_eventsTable.loc[iCnt,
-                                              'failureEvents'] = shiftDate
+        Args:
+            table (DataFrame) [-]: output events table
+            keys (list of str) [-]: keys of the columns to convert
 
-                shiftDate = \
-                    self.__UnCoMa_eventsTable.repairActionEvents[iCnt] + \
-                                    timedelta(hours=self.__totalSeaTimeHour)
+        '''
 
-                self.__UnCoMa_eventsTable.loc[iCnt,
-                                              'repairActionEvents'] = shiftDate
+        for key in keys:
 
-        # sort of eventsTable after current index
-        nidx = idx + 1
-        newTable = self.__UnCoMa_eventsTable[:nidx]
-        endSort = self.__UnCoMa_eventsTable[nidx:].sort_values(
-                                                    by='repairActionEvents')
-        
-        self.__UnCoMa_eventsTable = newTable.append(endSort,
-                                                    ignore_index=True)
+            values = [value if pd.isnull(value) else str(value)
+                                    for value in table[key].astype(object)]
+            table[key] = pd.Series(values, index=table.index, dtype=object)
 
         return
 
@@ -4636,7 +5898,27 @@ class LCOE_Calculator(object):
             self.__outputsOfWP6['env_assess [-]']['CoBaMa_eventsTable'] = \
                                         pd.Series(self.__CoBaMa_dictEnvAssess)
 
-        # Events tables
+        # Events tables, with dates formatted for export
+        self.__UnCoMa_outputEventsTable = self.__getOutputEventsTable(
+                                        self.__UnCoMa_outputEvents,
+                                        self.__UnCoMa_outputEventsTableKeys)
+        self.__CaBaMa_outputEventsTable = self.__getOutputEventsTable(
+                                        self.__CaBaMa_outputEvents,
+                                        self.__CaBaMa_outputEventsTableKeys)
+        self.__CoBaMa_outputEventsTable = self.__getOutputEventsTable(
+                                        self.__CoBaMa_outputEvents,
+                                        self.__CoBaMa_outputEventsTableKeys)
+        
+        self.__formatOutputDates(self.__UnCoMa_outputEventsTable,
+                                 ['failureDate [-]',
+                                  'repairActionRequestDate [-]',
+                                  'repairActionDate [-]'])
+        self.__formatOutputDates(self.__CaBaMa_outputEventsTable,
+                                 ['repairActionRequestDate [-]',
+                                  'repairActionDate [-]'])
+        self.__formatOutputDates(self.__CoBaMa_outputEventsTable,
+                                 ['repairActionDate [-]'])
+        
         events_tables_dict = {}
         
         events_tables_dict['UnCoMa_eventsTable'] = \
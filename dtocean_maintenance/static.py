@@ -26,10 +26,18 @@ classes.
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import os
+import copy
 import math
+import time
+import uuid
+import heapq
+import threading
 import bisect
-import random
+import logging
+import numbers
 import datetime
+import collections
 
 import numpy as np
 import pandas as pd
@@ -37,6 +45,12 @@ from dateutil.relativedelta import relativedelta
 
 from dtocean_economics.functions import get_present_values, get_lcoe
 
+# Set up logging
+module_logger = logging.getLogger(__name__)
+
+# Permitted numbers of events of poisson_process per expected number
+_poisson_numbers_cache = {}
+
 
 class Availability(object):
     
@@ -110,66 +124,1058 @@ class Availability(object):
 
 class Energy(object):
     
-    def __init__(self, device_energy_df):
+    def __init__(self, device_energy_df):
+        
+        self._device_energy_df = device_energy_df
+        self._device_energy_series = None
+        
+        return
+
+    def get_device_energy_series(self):
+        
+        if self._device_energy_series is None:
+            self._device_energy_series = self._calc_device_energy_series(
+                                                        self._device_energy_df)
+        
+        return self._device_energy_series
+    
+    def get_energy_per_device(self, device_ids):
+        
+        device_energy_series = self.get_device_energy_series()
+        dev_energy_dict = {device_id: device_energy_series[device_id] for
+                                                       device_id in device_ids}
+        
+        return dev_energy_dict
+    
+    def get_project_energy_df(self, start_date,
+                                    commissioning_date,
+                                    mission_time):
+        
+        start_year = start_date.year
+        commisioning_year = commissioning_date.year
+        end_year = commisioning_year + int(mission_time)
+        
+        years = range(start_year, end_year + 1)
+        n_years = len(years)
+        year_idxs = range(n_years)
+        year_map = {year: idx for year, idx in zip(years, year_idxs)}
+        
+        array_energy_df = self._device_energy_df.loc[:, ["Year", "Energy"]]
+        array_energy_df["Year"] = array_energy_df["Year"].replace(year_map)
+        array_energy_df = array_energy_df.set_index("Year")
+        
+        base_energy_dict = {"Year": year_map.values(),
+                            "Energy": [0] * len(year_map)}
+        base_energy_df = pd.DataFrame(base_energy_dict)
+        base_energy_df = base_energy_df.set_index("Year")
+        
+        base_energy_df.update(array_energy_df)
+        base_energy_df = base_energy_df.reset_index()
+                
+        base_energy_df["Year"] = base_energy_df["Year"].astype(int)
+        base_energy_df = base_energy_df.sort_values("Year")
+        
+        return base_energy_df
+
+    @classmethod        
+    def _calc_device_energy_series(cls, device_energy_df):
+        
+        dev_energy_year_df = device_energy_df.set_index("Year")
+        dev_energy_series = dev_energy_year_df.sum()
+        
+        return dev_energy_series
+
+
+class StatisticsAccumulator(object):
+    
+    """Collect the results of the data points of LCOE_Statistics in
+    preallocated arrays, which are converted to tables once, on request."""
+    
+    metric_keys = ["lifetimeOpex [Euro]",
+                   "lifetimeEnergy [Wh]",
+                   "LCOEOpex [Euro/kWh]",
+                   "arrayDowntime [hour]",
+                   "arrayAvailability [-]",
+                   "numberOfJourneys [-]"]
+    
+    def __init__(self, n_sims):
+        
+        self._n_sims = n_sims
+        self._n_points = 0
+        self._metrics = None
+        self._years = None
+        self._year_opex = None
+        self._year_energy = None
+        self._devices = None
+        self._device_downtime = None
+        self._device_energy = None
+        self._event_tables = []
+        self._capex = None
+        
+        return
+    
+    def get_n_points(self):
+        
+        return self._n_points
+    
+    def add_data_point(self, data_point):
+        
+        if self._n_points == self._n_sims:
+            
+            errMsg = ("Accumulator is full; all {} data points have been "
+                      "added").format(self._n_sims)
+            raise ValueError(errMsg)
+        
+        if self._metrics is None:
+            self._init_arrays()
+        
+        sim_idx = self._n_points
+        
+        for key in self.metric_keys:
+            self._metrics[key][sim_idx] = data_point[key]
+        
+        year_opex = data_point["OpexPerYear [Euro]"].set_index("Year")
+        year_energy = data_point["energyPerYear [Wh]"].set_index("Year")
+        
+        self._add_years(year_opex.index)
+        self._add_years(year_energy.index)
+        
+        rows = self._years.get_indexer(year_opex.index)
+        self._year_opex[rows, sim_idx] = year_opex.iloc[:, 0].values
+        
+        rows = self._years.get_indexer(year_energy.index)
+        self._year_energy[rows, sim_idx] = year_energy.iloc[:, 0].values
+        
+        device_downtime = pd.Series(data_point["downtimePerDevice [hour]"])
+        device_energy = pd.Series(data_point["energyPerDevice [Wh]"])
+        
+        self._add_devices(device_downtime.index)
+        self._add_devices(device_energy.index)
+        
+        rows = self._devices.get_indexer(device_downtime.index)
+        self._device_downtime[rows, sim_idx] = device_downtime.values
+        
+        rows = self._devices.get_indexer(device_energy.index)
+        self._device_energy[rows, sim_idx] = device_energy.values
+        
+        self._event_tables.append(data_point['eventTables [-]'])
+        self._capex = data_point["CapexOfArray [Euro]"]
+        self._n_points += 1
+        
+        return
+    
+    def get_output(self):
+        
+        n_points = self._n_points
+        sim_idxs = range(n_points)
+        
+        metrics_dict = {key: values[:n_points]
+                                for key, values in self._metrics.items()}
+        metrics_df = pd.DataFrame(metrics_dict)
+        
+        year_index = pd.Index(self._years, name="Year")
+        
+        year_opex_df = pd.DataFrame(
+                        self._year_opex[:, :n_points],
+                        index=year_index,
+                        columns=["Cost {} [Euro]".format(i) for i in sim_idxs])
+        
+        year_energy_df = pd.DataFrame(
+                        self._year_energy[:, :n_points],
+                        index=year_index,
+                        columns=["Energy {} [Wh]".format(i) for i in sim_idxs])
+        
+        downtime_cols = ["Downtime {} [hours]".format(i) for i in sim_idxs]
+        device_downtime_df = pd.DataFrame(
+                                    self._device_downtime[:, :n_points],
+                                    index=self._devices,
+                                    columns=downtime_cols)
+        
+        device_energy_df = pd.DataFrame(
+                        self._device_energy[:, :n_points],
+                        index=self._devices,
+                        columns=["Energy {} [Wh]".format(i) for i in sim_idxs])
+        
+        output_dict = {"MetricsTable [-]": metrics_df,
+                       "OpexPerYear [Euro]": year_opex_df,
+                       "energyPerYear [Wh]": year_energy_df,
+                       "downtimePerDevice [hour]": device_downtime_df,
+                       "energyPerDevice [Wh]": device_energy_df,
+                       'eventTables [-]': list(self._event_tables),
+                       "CapexOfArray [Euro]": self._capex}
+        
+        return output_dict
+    
+    def _init_arrays(self):
+        
+        self._metrics = {}
+        
+        for key in self.metric_keys:
+            self._metrics[key] = np.zeros(self._n_sims, dtype=float)
+        
+        self._years = pd.Index([])
+        self._year_opex = np.full((0, self._n_sims), np.nan)
+        self._year_energy = np.full((0, self._n_sims), np.nan)
+        
+        self._devices = pd.Index([])
+        self._device_downtime = np.full((0, self._n_sims), np.nan)
+        self._device_energy = np.full((0, self._n_sims), np.nan)
+        
+        return
+    
+    def _add_years(self, years):
+        
+        if years.isin(self._years).all(): return
+        
+        new_years = self._years.union(years)
+        
+        self._year_opex = self._extend_rows(self._year_opex,
+                                            self._years,
+                                            new_years)
+        self._year_energy = self._extend_rows(self._year_energy,
+                                              self._years,
+                                              new_years)
+        self._years = new_years
+        
+        return
+    
+    def _add_devices(self, devices):
+        
+        if devices.isin(self._devices).all(): return
+        
+        new_devices = self._devices.union(devices)
+        
+        self._device_downtime = self._extend_rows(self._device_downtime,
+                                                  self._devices,
+                                                  new_devices)
+        self._device_energy = self._extend_rows(self._device_energy,
+                                                self._devices,
+                                                new_devices)
+        self._devices = new_devices
+        
+        return
+    
+    @classmethod
+    def _extend_rows(cls, values, old_index, new_index):
+        
+        new_values = np.full((len(new_index), values.shape[1]), np.nan)
+        new_values[new_index.get_indexer(old_index), :] = values
+        
+        return new_values
+
+
+class ConvergenceMonitor(object):
+    
+    """Track the running mean and confidence interval of the LCOE_Statistics
+    metrics and test if the requested relative half-width is achieved."""
+    
+    metric_keys = ["LCOEOpex [Euro/kWh]",
+                   "lifetimeOpex [Euro]",
+                   "arrayAvailability [-]"]
+    
+    def __init__(self, rel_half_width,
+                       confidence=0.95,
+                       min_points=10):
+        
+        if not 0 < confidence < 1:
+            
+            errMsg = ("Confidence level must lie between 0 and 1; however, "
+                      "it is set to {}").format(confidence)
+            raise ValueError(errMsg)
+        
+        self._rel_half_width = rel_half_width
+        self._z_score = get_z_score(confidence)
+        self._min_points = max(min_points, 2)
+        self._n_points = 0
+        self._converged = False
+        self._means = {key: 0. for key in self.metric_keys}
+        self._sum_squares = {key: 0. for key in self.metric_keys}
+        self._trace = []
+        
+        return
+    
+    def update(self, data_point):
+        
+        # Welford's algorithm for the running mean and variance
+        self._n_points += 1
+        
+        for key in self.metric_keys:
+            
+            value = float(data_point[key])
+            delta = value - self._means[key]
+            self._means[key] += delta / self._n_points
+            self._sum_squares[key] += delta * (value - self._means[key])
+        
+        record = [self._n_points]
+        converged = self._n_points >= self._min_points
+        
+        for key in self.metric_keys:
+            
+            rel_half_width = self._get_rel_half_width(key)
+            record.extend([self._means[key], rel_half_width])
+            
+            if not rel_half_width <= self._rel_half_width:
+                converged = False
+        
+        record.append(converged)
+        self._trace.append(record)
+        self._converged = converged
+        
+        return converged
+    
+    def is_converged(self):
+        
+        return self._converged
+    
+    def get_trace_df(self):
+        
+        columns = ["nSimulations [-]"]
+        
+        for key in self.metric_keys:
+            
+            name, unit = key.rsplit(" ", 1)
+            columns.extend(["{}Mean {}".format(name, unit),
+                            "{}RelativeHalfWidth [-]".format(name)])
+        
+        columns.append("converged [-]")
+        trace_df = pd.DataFrame(self._trace, columns=columns)
+        
+        return trace_df
+    
+    def _get_rel_half_width(self, key):
+        
+        if self._n_points < 2: return np.inf
+        
+        variance = self._sum_squares[key] / (self._n_points - 1)
+        half_width = self._z_score * math.sqrt(variance / self._n_points)
+        mean = abs(self._means[key])
+        
+        if half_width == 0: return 0.
+        if mean == 0: return np.inf
+        
+        return half_width / mean
+
+
+class EventTablesStore(object):
+    
+    """Write the event tables and metrics of each LCOE_Statistics data point
+    to a directory, so that they need not be held in memory. Each column of
+    each table is saved to its own .npy files, so that a table can be read
+    without loading the others. Label columns, such as the component IDs and
+    device lists, are saved as integer codes and the distinct labels, see
+    _save_column. The format of the tables and the metrics are also saved,
+    so the handle of a data point can be reloaded by load_data_point."""
+    
+    def __init__(self, path):
+        
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        
+        self._path = path
+        
+        return
+    
+    def add_data_point(self, sim_number, data_point):
+        
+        dir_path = self._get_dir_path(sim_number)
+        
+        metrics = {key: data_point[key]
+                                for key in StatisticsAccumulator.metric_keys}
+        events_tables_dict = data_point['eventTables [-]']
+        tables = {}
+        
+        for key, table in events_tables_dict.items():
+            
+            table_path = os.path.join(dir_path, key)
+            
+            if not os.path.isdir(table_path):
+                os.makedirs(table_path)
+            
+            index = _save_column(table_path, "index", table.index)
+            formats = [_save_column(table_path, str(i), table.iloc[:, i])
+                                        for i in range(len(table.columns))]
+            
+            tables[key] = {"columns": list(table.columns),
+                           "index": index,
+                           "formats": formats}
+        
+        # The description is written last, so it marks a complete data point
+        _to_pickle_atomic({"tables": tables,
+                           "metrics": metrics},
+                          os.path.join(dir_path, "tables.pkl"))
+        
+        handle = StoredEventTables(dir_path, tables, metrics)
+        
+        return handle
+    
+    def load_data_point(self, sim_number):
+        
+        dir_path = self._get_dir_path(sim_number)
+        file_path = os.path.join(dir_path, "tables.pkl")
+        
+        if not os.path.isfile(file_path):
+            
+            errMsg = ("No event tables are stored for data point number "
+                      "{}").format(sim_number)
+            raise KeyError(errMsg)
+        
+        description = pd.read_pickle(file_path)
+        handle = StoredEventTables(dir_path,
+                                   description["tables"],
+                                   description["metrics"])
+        
+        return handle
+    
+    def _get_dir_path(self, sim_number):
+        
+        dir_name = "data_point_{}".format(sim_number)
+        
+        return os.path.join(self._path, dir_name)
+
+
+class StoredEventTables(collections.Mapping):
+    
+    """Read-only mapping of the event tables of one data point, saved by
+    EventTablesStore. Only the columns of the requested table are read from
+    disk, on access, and their types are restored. The metrics are held in
+    memory."""
+    
+    def __init__(self, path, tables, metrics):
+        
+        self._path = path
+        self._tables = tables
+        self._metrics = metrics
+        self._keys = sorted(tables)
+        
+        return
+    
+    def get_path(self):
+        
+        return self._path
+    
+    def get_metrics(self):
+        
+        return self._metrics.copy()
+    
+    def __getitem__(self, key):
+        
+        if key not in self._keys: raise KeyError(key)
+        
+        table_path = os.path.join(self._path, key)
+        table = self._tables[key]
+        
+        index = _load_column(table_path, "index", table["index"])
+        data = {}
+        
+        for i, column in enumerate(table["columns"]):
+            data[column] = _load_column(table_path,
+                                        str(i),
+                                        table["formats"][i])
+        
+        return pd.DataFrame(data,
+                            index=pd.Index(index),
+                            columns=table["columns"])
+    
+    def __iter__(self):
+        
+        return iter(self._keys)
+    
+    def __len__(self):
+        
+        return len(self._keys)
+
+
+class JobQueue(object):
+    
+    """Queue of LCOE_Statistics data points shared through a directory, which
+    may be on a network file system. Tasks are claimed and results published
+    using atomic renames, so any number of worker processes, on any number of
+    hosts, can serve the same queue.
+    
+    Claimed tasks and the published job are leased. Workers renew the claims
+    of their tasks and the publisher renews the job while waiting for
+    results. Claims which are not renewed within lease_time seconds are
+    returned to the queue, and a job which is not renewed may be replaced by
+    another publisher."""
+    
+    def __init__(self, path, poll_interval=1., lease_time=60.):
+        
+        self._path = path
+        self._job_file = os.path.join(path, "job.pkl")
+        self._heartbeat_file = os.path.join(path, "heartbeat")
+        self._task_dir = os.path.join(path, "tasks")
+        self._claimed_dir = os.path.join(path, "claimed")
+        self._result_dir = os.path.join(path, "results")
+        self.poll_interval = poll_interval
+        self.lease_time = lease_time
+        
+        for dir_path in [self._task_dir,
+                         self._claimed_dir,
+                         self._result_dir]:
+            
+            # Another process may create the directory at the same time
+            try:
+                os.makedirs(dir_path)
+            except OSError:
+                if not os.path.isdir(dir_path): raise
+        
+        return
+    
+    def publish(self, job, sim_numbers):
+        
+        if self.is_live():
+            
+            errMsg = ("Job queue {} is in use by another "
+                      "job").format(self._path)
+            raise ValueError(errMsg)
+        
+        self.clear()
+        
+        job_id = uuid.uuid4().hex
+        
+        self.renew_job()
+        _to_pickle_atomic({"id": job_id,
+                           "job": job,
+                           "lease_time": self.lease_time},
+                          self._job_file)
+        
+        for sim_number in sim_numbers:
+            
+            task_path = os.path.join(self._task_dir,
+                                     self._get_task_name(job_id, sim_number))
+            open(task_path, "w").close()
+        
+        return job_id
+    
+    def get_job(self):
+        
+        if not os.path.isfile(self._job_file): return None
+        
+        return pd.read_pickle(self._job_file)
+    
+    def is_live(self):
+        
+        if not os.path.isfile(self._job_file): return False
+        
+        age = self._get_age(self._heartbeat_file)
+        
+        return age is not None and age < self.lease_time
+    
+    def renew_job(self):
+        
+        self._write_timestamp(self._heartbeat_file)
+        
+        return
+    
+    def claim_task(self):
+        
+        # Tasks are claimed in data point order
+        for task_name in sorted(os.listdir(self._task_dir)):
+            
+            claimed_path = os.path.join(self._claimed_dir, task_name)
+            
+            try:
+                os.rename(os.path.join(self._task_dir, task_name),
+                          claimed_path)
+            except OSError:
+                # Claimed by another worker
+                continue
+            
+            self._write_timestamp(claimed_path)
+            
+            sim_number, job_id = os.path.splitext(task_name)[0].split("_")
+            
+            return job_id, int(sim_number)
+        
+        return None
+    
+    def renew_task(self, job_id, sim_number):
+        
+        task_path = os.path.join(self._claimed_dir,
+                                 self._get_task_name(job_id, sim_number))
+        
+        # The claim may have expired
+        if os.path.isfile(task_path): self._write_timestamp(task_path)
+        
+        return
+    
+    def start_heartbeat(self, job_id, sim_number):
+        
+        """Renew the claim of a task in a background thread, until the stop
+        method of the returned thread is called."""
+        
+        heartbeat = _TaskHeartbeat(self, job_id, sim_number)
+        heartbeat.start()
+        
+        return heartbeat
+    
+    def requeue_stale_tasks(self):
+        
+        n_tasks = 0
+        
+        for task_name in os.listdir(self._claimed_dir):
+            
+            claimed_path = os.path.join(self._claimed_dir, task_name)
+            age = self._get_age(claimed_path)
+            
+            if age is None or age < self.lease_time: continue
+            
+            try:
+                os.rename(claimed_path,
+                          os.path.join(self._task_dir, task_name))
+            except OSError:
+                # Released or requeued by another process
+                continue
+            
+            n_tasks += 1
+        
+        return n_tasks
+    
+    def release_task(self, job_id, sim_number):
+        
+        task_path = os.path.join(self._claimed_dir,
+                                 self._get_task_name(job_id, sim_number))
+        
+        if os.path.isfile(task_path): os.remove(task_path)
+        
+        return
+    
+    def put_result(self, job_id,
+                         sim_number,
+                         data_point=None,
+                         error=None,
+                         logistics_solutions=None):
+        
+        result_path = os.path.join(self._result_dir,
+                                   self._get_result_name(job_id, sim_number))
+        
+        _to_pickle_atomic({"data_point": data_point,
+                           "error": error,
+                           "logistics_solutions": logistics_solutions},
+                          result_path)
+        self.release_task(job_id, sim_number)
+        
+        return
+    
+    def get_result(self, job_id, sim_number):
+        
+        result_path = os.path.join(self._result_dir,
+                                   self._get_result_name(job_id, sim_number))
+        
+        if not os.path.isfile(result_path): return None
+        
+        result = pd.read_pickle(result_path)
+        os.remove(result_path)
+        
+        return result
+    
+    def wait_for_result(self, job_id, sim_number, timeout=None):
+        
+        """Wait for the result of a task, renewing the job and returning
+        stale claims to the queue while waiting. A RuntimeError is raised if
+        no result is available after timeout seconds."""
+        
+        start_time = time.time()
+        result = self.get_result(job_id, sim_number)
+        
+        while result is None:
+            
+            if timeout is not None and time.time() - start_time >= timeout:
+                
+                errMsg = ("No result for data point number {} was returned "
+                          "within {} seconds").format(sim_number, timeout)
+                raise RuntimeError(errMsg)
+            
+            self.renew_job()
+            self.requeue_stale_tasks()
+            
+            time.sleep(self.poll_interval)
+            result = self.get_result(job_id, sim_number)
+        
+        return result
+    
+    def clear(self):
+        
+        for dir_path in [self._task_dir,
+                         self._claimed_dir,
+                         self._result_dir]:
+            
+            for file_name in os.listdir(dir_path):
+                
+                # Files may be renamed by a worker at the same time
+                try:
+                    os.remove(os.path.join(dir_path, file_name))
+                except OSError:
+                    pass
+        
+        if os.path.isfile(self._job_file): os.remove(self._job_file)
+        if os.path.isfile(self._heartbeat_file):
+            os.remove(self._heartbeat_file)
+        
+        return
+    
+    @classmethod
+    def _write_timestamp(cls, file_path):
+        
+        with open(file_path, "w") as f:
+            f.write(repr(time.time()))
+        
+        return
+    
+    @classmethod
+    def _get_age(cls, file_path):
+        
+        """Seconds since the timestamp in the given file was written, or None
+        if the file does not exist."""
+        
+        try:
+            
+            with open(file_path) as f:
+                timestamp = float(f.read())
+        
+        except IOError:
+            
+            return None
+        
+        except ValueError:
+            
+            # Empty or partially written file
+            try:
+                timestamp = os.path.getmtime(file_path)
+            except OSError:
+                return None
+        
+        return time.time() - timestamp
+    
+    @classmethod
+    def _get_task_name(cls, job_id, sim_number):
+        
+        return "{:010d}_{}.task".format(sim_number, job_id)
+    
+    @classmethod
+    def _get_result_name(cls, job_id, sim_number):
+        
+        return "{:010d}_{}.pkl".format(sim_number, job_id)
+
+
+class _TaskHeartbeat(threading.Thread):
+    
+    """Renew the claim of a JobQueue task four times per lease."""
+    
+    def __init__(self, queue, job_id, sim_number):
+        
+        super(_TaskHeartbeat, self).__init__()
+        self.daemon = True
+        self._queue = queue
+        self._job_id = job_id
+        self._sim_number = sim_number
+        self._stop_event = threading.Event()
+        
+        return
+    
+    def run(self):
+        
+        interval = self._queue.lease_time / 4.
+        
+        while not self._stop_event.wait(interval):
+            self._queue.renew_task(self._job_id, self._sim_number)
+        
+        return
+    
+    def stop(self):
+        
+        self._stop_event.set()
+        self.join()
+        
+        return
+
+
+class CorrectiveEventQueue(object):
+    
+    """Priority queue of the corrective maintenance events of LCOE_Calculator,
+    ordered by their repair action request dates. Events with equal dates are
+    taken in the order of the given events table.
+    
+    Delays are accumulated per component and device, and only applied to an
+    event when it reaches the front of the queue."""
+    
+    def __init__(self, events_table):
+        
+        self._heap = []
+        self._all_offset = datetime.timedelta(0)
+        self._offsets = {}
+        self._component_devices = collections.defaultdict(set)
+        
+        for seq, event in enumerate(events_table.to_dict('records')):
+            
+            entry = (event['repairActionEvents'],
+                     seq,
+                     datetime.timedelta(0),
+                     event['failureEvents'],
+                     event)
+            self._heap.append(entry)
+            
+            self._component_devices[event['ComponentID']].add(
+                                                            event['belongsTo'])
+        
+        heapq.heapify(self._heap)
+        
+        return
+    
+    def __len__(self):
+        
+        return len(self._heap)
+    
+    def peek(self):
+        
+        self._settle()
+        
+        return self._heap[0][4]
+    
+    def pop(self):
+        
+        self._settle()
+        
+        return heapq.heappop(self._heap)[4]
+    
+    def shift(self, hours, component_id=None, devices=None):
+        
+        """Delay the failure and repair action dates of the queued events. If
+        component_id is None all events are delayed, otherwise only the events
+        of the component which belong to one of the given devices."""
+        
+        if hours < 0:
+            
+            errMsg = ("Queued events can not be brought forward; the given "
+                      "delay is {} hours").format(hours)
+            raise ValueError(errMsg)
+        
+        delta = datetime.timedelta(hours=hours)
+        
+        if component_id is None:
+            self._all_offset += delta
+            return
+        
+        for device in self._component_devices[component_id]:
+            
+            if device not in devices: continue
+            
+            key = (component_id, device)
+            self._offsets[key] = self._offsets.get(key,
+                                                   datetime.timedelta(0)) + \
+                                                                        delta
+        
+        return
+    
+    def _get_offset(self, event):
+        
+        key = (event['ComponentID'], event['belongsTo'])
+        
+        return self._all_offset + self._offsets.get(key,
+                                                    datetime.timedelta(0))
+    
+    def _settle(self):
+        
+        # The dates in the heap are never later than the delayed dates, so
+        # the first event is due once its delays are up to date
+        while True:
+            
+            (repair_date,
+             seq,
+             offset,
+             failure_date,
+             event) = self._heap[0]
+            
+            new_offset = self._get_offset(event)
+            
+            if new_offset == offset: break
+            
+            delta = new_offset - offset
+            entry = (repair_date + delta,
+                     seq,
+                     new_offset,
+                     failure_date + delta,
+                     event)
+            heapq.heapreplace(self._heap, entry)
+        
+        event['repairActionEvents'] = repair_date
+        event['failureEvents'] = failure_date
+        
+        return
+
+
+class LogisticsCache(object):
+    
+    """Bounded store of the solutions of the logistics module, keyed by the
+    operations requested by LCOE_Calculator and the optimise_delay flag. The
+    least recently used solution is discarded when the store is full.
+    
+    If a file path is given, the solutions saved by a previous run are
+    loaded. Saved solutions are only valid for runs with the same site,
+    metocean data and logistics databases, so they are saved with the given
+    fingerprint of these inputs and discarded if the fingerprints differ.
+    
+    Solutions added since the last call of pop_new_solutions are tracked, so
+    they can be merged into the store of another process."""
+    
+    def __init__(self, max_size, file_path=None, fingerprint=None):
+        
+        if max_size < 1:
+            
+            errMsg = ("Parameter logisticsCacheSize must be at least one; "
+                      "however, it is set to {}").format(max_size)
+            raise ValueError(errMsg)
+        
+        self.max_size = max_size
+        self._file_path = file_path
+        self._fingerprint = fingerprint
+        self._store = collections.OrderedDict()
+        self._new_keys = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        
+        if file_path is not None and os.path.isfile(file_path):
+            self.load(file_path)
+        
+        return
+    
+    def __len__(self):
+        
+        return len(self._store)
+    
+    def get_file_path(self):
+        
+        return self._file_path
+    
+    @classmethod
+    def get_key(cls, om, optimise_delay):
+        
+        rows = []
+        
+        for row in om.itertuples(index=False):
+            rows.append(tuple(None if pd.isnull(value) else value
+                                                        for value in row))
+        
+        return (tuple(om.columns), tuple(rows), bool(optimise_delay))
+    
+    def get(self, key):
+        
+        if key not in self._store:
+            self._misses += 1
+            return None
+        
+        # Move to the most recently used position
+        solution = self._store.pop(key)
+        self._store[key] = solution
+        self._hits += 1
+        
+        return copy.deepcopy(solution)
+    
+    def add(self, key, solution):
+        
+        if key in self._store: del self._store[key]
+        
+        self._store[key] = copy.deepcopy(solution)
+        self._new_keys[key] = None
+        
+        while len(self._store) > self.max_size:
+            old_key, _ = self._store.popitem(last=False)
+            self._new_keys.pop(old_key, None)
+        
+        return
+    
+    def update(self, solutions):
         
-        self._device_energy_df = device_energy_df
-        self._device_energy_series = None
+        for key, solution in solutions:
+            self.add(key, solution)
         
         return
-
-    def get_device_energy_series(self):
+    
+    def pop_new_solutions(self):
         
-        if self._device_energy_series is None:
-            self._device_energy_series = self._calc_device_energy_series(
-                                                        self._device_energy_df)
+        solutions = [(key, self._store[key]) for key in self._new_keys]
+        self._new_keys.clear()
         
-        return self._device_energy_series
+        return solutions
     
-    def get_energy_per_device(self, device_ids):
+    def get_stats(self):
         
-        device_energy_series = self.get_device_energy_series()
-        dev_energy_dict = {device_id: device_energy_series[device_id] for
-                                                       device_id in device_ids}
+        n_requests = self._hits + self._misses
         
-        return dev_energy_dict
+        if n_requests > 0:
+            hit_rate = float(self._hits) / n_requests
+        else:
+            hit_rate = 0.
+        
+        stats = {"hits": self._hits,
+                 "misses": self._misses,
+                 "hitRate": hit_rate,
+                 "size": len(self._store)}
+        
+        return stats
     
-    def get_project_energy_df(self, start_date,
-                                    commissioning_date,
-                                    mission_time):
+    def save(self, file_path=None):
         
-        start_year = start_date.year
-        commisioning_year = commissioning_date.year
-        end_year = commisioning_year + int(mission_time)
+        if file_path is None: file_path = self._file_path
         
-        years = range(start_year, end_year + 1)
-        n_years = len(years)
-        year_idxs = range(n_years)
-        year_map = {year: idx for year, idx in zip(years, year_idxs)}
+        if file_path is None:
+            
+            errMsg = "No file path is set for the logistics cache"
+            raise ValueError(errMsg)
         
-        array_energy_df = self._device_energy_df.loc[:, ["Year", "Energy"]]
-        array_energy_df["Year"] = array_energy_df["Year"].replace(year_map)
-        array_energy_df = array_energy_df.set_index("Year")
+        dir_path = os.path.dirname(os.path.abspath(file_path))
         
-        base_energy_dict = {"Year": year_map.values(),
-                            "Energy": [0] * len(year_map)}
-        base_energy_df = pd.DataFrame(base_energy_dict)
-        base_energy_df = base_energy_df.set_index("Year")
+        if not os.path.isdir(dir_path): os.makedirs(dir_path)
         
-        base_energy_df.update(array_energy_df)
-        base_energy_df = base_energy_df.reset_index()
-                
-        base_energy_df["Year"] = base_energy_df["Year"].astype(int)
-        base_energy_df = base_energy_df.sort_values("Year")
+        _to_pickle_atomic({"fingerprint": self._fingerprint,
+                           "solutions": self._store.items()},
+                          file_path)
         
-        return base_energy_df
-
-    @classmethod        
-    def _calc_device_energy_series(cls, device_energy_df):
+        return
+    
+    def load(self, file_path):
         
-        dev_energy_year_df = device_energy_df.set_index("Year")
-        dev_energy_series = dev_energy_year_df.sum()
+        saved = pd.read_pickle(file_path)
         
-        return dev_energy_series
+        if (not isinstance(saved, dict) or
+            saved.get("fingerprint") != self._fingerprint):
+            
+            msg = ('Discarded logistics cache {}, which was saved for '
+                   'different logistics inputs').format(file_path)
+            module_logger.warning(msg)
+            
+            return
+        
+        # Older entries are discarded if the file exceeds max_size
+        self.update(saved["solutions"])
+        self._new_keys.clear()
+        
+        return
+
+
+def get_parameter_records(table):
+
+    '''get_parameter_records function: Convert the columns of a parameter
+    table, such as the Failure_Mode table of inputOM, to dictionaries of
+    values, with numeric strings converted to numbers
+
+    Args:
+        table (pandas.DataFrame) : parameter table with one column per
+            component or failure mode
+
+    Returns:
+        records (dict) : dictionary of parameter values for each column
+
+    '''
+
+    records = {}
+
+    for column in table.columns:
+
+        series = table[column].apply(pd.to_numeric, errors="ignore")
+        records[column] = series.to_dict()
+
+    return records
 
 
 def get_uptime_df(commissioning_date,
@@ -386,106 +1392,551 @@ def get_number_of_journeys(events_tables_dict):
     return total_ops
 
 
-def poisson_process(startOperationDate, simulationTime, failureRate):
+def get_z_score(confidence):
+
+    '''get_z_score function: Calculate the two-sided standard normal
+    critical value for the given confidence level, by bisection of the error
+    function
+
+    Args:
+        confidence (float) : confidence level, between 0 and 1
+
+    Returns:
+        z_score (float) : critical value
+
+    '''
+
+    lower = 0.
+    upper = 40.
+
+    for _ in xrange(100):
+
+        z_score = 0.5 * (lower + upper)
+
+        if math.erf(z_score / math.sqrt(2.)) < confidence:
+            lower = z_score
+        else:
+            upper = z_score
+
+    return 0.5 * (lower + upper)
+
+
+def get_random_state(seed=None, sim_number=None):
+
+    '''get_random_state function: Create an independent random number
+    stream for a data point of the statistical population
+
+    Args:
+        seed (int)       : master seed of the population. If None, the
+                           stream is seeded from system entropy
+        sim_number (int) : index of the data point in the population
+
+    Returns:
+        random_state (numpy.random.RandomState) : random number stream
+
+    '''
+
+    if seed is None:
+        return np.random.RandomState()
+
+    if sim_number is None:
+        return np.random.RandomState(seed)
+
+    # Combine the master seed and data point index in the seed key, so that
+    # each data point has a reproducible stream independent of the others
+    return np.random.RandomState([seed, sim_number])
+
+
+def poisson_process(startOperationDate,
+                    simulationTime,
+                    failureRate,
+                    random_state=None):
 
     '''poisson_process function: Estimation of random failure occurence of
-    components
+    components. The number of events is restricted to the 40th to 70th
+    percentiles of the poisson distribution.
 
     Args:
         startOperationDate (timedate) : start date of operation
         simulationtime (float)        : simulation time [day]
         failureRate (float)           : failure rate [1/day]
+        random_state (numpy.random.RandomState) : random number stream. If
+            None the global numpy random state is used
 
     Returns:
         randomList [list] : random failure occurence of a component [1/day]
 
     '''
 
-    # result of poisson process
-    randomList = []
+    dummyStartOperationDate = datetime.datetime(startOperationDate.year,
+                                                startOperationDate.month,
+                                                startOperationDate.day,
+                                                startOperationDate.hour)
+    
+    eventDays = _get_poisson_days(simulationTime, failureRate, random_state)
+    
+    randomList = [dummyStartOperationDate + datetime.timedelta(days=int(days))
+                                                    for days in eventDays]
+
+    return randomList
 
-    # intermediate results
-    timeStep = []
 
-    # intermediate results
-    timeStepAll = 0
-    number      = 0
+def poisson_process_batch(startOperationDate,
+                          simulationTime,
+                          failureRates,
+                          random_state=None):
 
-    # poison parameter
-    loopNumber       = 2000
-    lowerPercentile  = 40
-    upperPercentile  = 70
-    timeStepLoop     = []
-    numberLoop       = []
-    numberLoopFilt   = []
-    timeStepLoopFilt = []
+    '''poisson_process_batch function: Estimation of random failure
+    occurence of many components, see poisson_process. The numbers of events
+    of all failure rates are drawn together, followed by the times of all
+    events, so the results are distributed as, but do not match, successive
+    calls of poisson_process with the same random state.
+
+    Args:
+        startOperationDate (timedate) : start date of operation
+        simulationtime (float)        : simulation time [day]
+        failureRates (list of float)  : failure rates [1/day]
+        random_state (numpy.random.RandomState) : random number stream. If
+            None the global numpy random state is used
+
+    Returns:
+        rateIndex (numpy.ndarray) : index of the failure rate of each event
+        eventDates (numpy.ndarray) : date of each event (datetime64[ns]),
+            in ascending order for each failure rate
+
+    '''
+
+    if random_state is None:
+        random_state = np.random
 
     dummyStartOperationDate = datetime.datetime(startOperationDate.year,
                                                 startOperationDate.month,
                                                 startOperationDate.day,
                                                 startOperationDate.hour)
+    
+    expectedNumbers = np.asarray(failureRates, dtype=float) * simulationTime
+    numberList = np.zeros(len(expectedNumbers), dtype=int)
+    
+    # number of events, using the cached distribution of each distinct
+    # expected number
+    numberSamples = random_state.random_sample(len(expectedNumbers))
+    
+    for expectedNumber in np.unique(expectedNumbers[expectedNumbers > 0]):
+        
+        numbers, cumProbabilities = _get_poisson_numbers(expectedNumber)
+        
+        isExpected = expectedNumbers == expectedNumber
+        numberIndex = np.searchsorted(cumProbabilities,
+                                      numberSamples[isExpected],
+                                      side="right")
+        numberIndex = np.minimum(numberIndex, len(numbers) - 1)
+        numberList[isExpected] = numbers[numberIndex]
+    
+    rateIndex = np.repeat(np.arange(len(expectedNumbers)), numberList)
+    
+    # event times, sorted for each failure rate
+    timeStepAll = random_state.random_sample(numberList.sum()) * \
+                                                            simulationTime
+    order = np.lexsort((timeStepAll, rateIndex))
+    timeStepAll = timeStepAll[order]
+    
+    # time steps, from the start of operation for the first event of each
+    # failure rate
+    rateStarts = np.cumsum(numberList) - numberList
+    previousTimes = np.concatenate(([0.], timeStepAll[:-1]))
+    previousTimes[rateStarts[numberList > 0]] = 0.
+    timeStep = np.round(timeStepAll - previousTimes).astype(int)
+    
+    # cumulative days for each failure rate
+    cumDays = np.concatenate(([0], timeStep.cumsum()))
+    rateOffsets = np.repeat(cumDays[rateStarts], numberList)
+    addDays = cumDays[1:] - rateOffsets
+    
+    # take only the events less than endOperationDate
+    maxDays = datetime.timedelta(days=simulationTime).days
+    isValid = addDays <= maxDays
+    
+    rateIndex = rateIndex[isValid]
+    eventDays = addDays[isValid]
+    
+    eventDates = np.datetime64(dummyStartOperationDate, 'ns') + \
+                                    eventDays.astype('timedelta64[D]')
+    
+    return rateIndex, eventDates
+
+
+def _get_poisson_days(simulationTime, failureRate, random_state=None):
+
+    '''_get_poisson_days function: Sample the days of the events of a
+    poisson process whose number of events is restricted to the 40th to 70th
+    percentiles of the poisson distribution. Given the number of events, the
+    event times are uniformly distributed over the simulation time.
+
+    Args:
+        simulationtime (float)        : simulation time [day]
+        failureRate (float)           : failure rate [1/day]
+        random_state (numpy.random.RandomState) : random number stream. If
+            None the global numpy random state is used
+
+    Returns:
+        eventDays (numpy.ndarray) : days of the events since the start of
+            operation
+
+    '''
+
+    if random_state is None:
+        random_state = np.random
+
+    if failureRate <= 0: return np.array([], dtype=int)
+    
+    (numbers,
+     cumProbabilities) = _get_poisson_numbers(failureRate * simulationTime)
+    
+    # number of events
+    numberIndex = np.searchsorted(cumProbabilities,
+                                  random_state.random_sample(),
+                                  side="right")
+    number = numbers[min(numberIndex, len(numbers) - 1)]
+    
+    # event times and time steps
+    timeStepAll = np.sort(random_state.random_sample(number)) * \
+                                                            simulationTime
+    timeStep = np.diff(np.concatenate(([0.], timeStepAll)))
+    
+    # take only the events less than endOperationDate
+    addDays = np.round(timeStep).astype(int).cumsum()
+    maxDays = datetime.timedelta(days=simulationTime).days
+    
+    eventDays = addDays[addDays <= maxDays]
+
+    return eventDays
+
+
+def _get_poisson_numbers(expectedNumber):
+
+    '''_get_poisson_numbers function: The distribution of the number of
+    events of poisson_process. This is the distribution of the number of
+    events of one trial, selected from a population of 2000 poisson process
+    trials whose numbers of events lie between the 40th and 70th percentiles
+    of the population. The variation of the percentiles between populations
+    is included. Results are cached for each expected number.
+
+    Args:
+        expectedNumber (float) : expected number of events
 
-    endOperationDate = dummyStartOperationDate + \
-                                datetime.timedelta(days=simulationTime)
+    Returns:
+        numbers (numpy.ndarray) : possible numbers of events
+        cumProbabilities (numpy.ndarray) : cumulative probabilities of the
+            possible numbers, normalised to one
 
-    # poisson trial loop
-    for lCnt in range(0, loopNumber):
+    '''
 
-        timeStepAll = 0
-        timeStep = []
-        number = 0
-        # calculation loop
-        while timeStepAll < simulationTime:
+    if expectedNumber in _poisson_numbers_cache:
+        return _poisson_numbers_cache[expectedNumber]
 
-            # time dt
-            dt = -math.log(1.0 - random.random()) / failureRate
-            timeStepAll = timeStepAll + dt
-            number = number + 1
-            timeStep.append(dt)
+    # poison parameter
+    loopNumber       = 2000
+    lowerPercentile  = 0.4
+    upperPercentile  = 0.7
+    minProbability   = 1e-9
+    maxCacheSize     = 10000
+    
+    # The probability outside 12 standard deviations is negligible
+    width = 12 * math.sqrt(expectedNumber) + 10
+    allNumbers = np.arange(int(max(0, expectedNumber - width)),
+                           int(expectedNumber + width) + 1)
+    
+    logProbabilities = allNumbers * math.log(expectedNumber) - \
+                            expectedNumber - \
+                                np.array([math.lgamma(k + 1)
+                                                    for k in allNumbers])
+    probabilities = np.exp(logProbabilities - logProbabilities.max())
+    
+    sumProbabilities = probabilities.cumsum()
+    distribution = sumProbabilities / sumProbabilities[-1]
+    lastDistribution = np.concatenate(([0.], distribution[:-1]))
+    
+    # The percentiles of a population are found by linear interpolation
+    # between the numbers at these ranks (from 0)
+    lowerRank = int(math.ceil(lowerPercentile * (loopNumber - 1)))
+    upperRank = int(math.floor(upperPercentile * (loopNumber - 1)))
+    
+    # Probability that the lower percentile is at most k, i.e. more than
+    # lowerRank trials have at most k events, and that the upper percentile
+    # is at least k, i.e. at most upperRank trials have less than k events.
+    # The binomial distribution is approximated by the normal distribution.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        lowerZ = (lowerRank + 0.5 - loopNumber * distribution) / \
+                    np.sqrt(loopNumber * distribution * (1 - distribution))
+        upperZ = (upperRank + 0.5 - loopNumber * lastDistribution) / \
+                    np.sqrt(loopNumber * lastDistribution *
+                                                    (1 - lastDistribution))
+    
+    lowerAtMost = 1 - _get_normal_cdf(lowerZ)
+    upperAtLeast = _get_normal_cdf(upperZ)
+    
+    lowerProbabilities = np.diff(np.concatenate(([0.], lowerAtMost)))
+    upperProbabilities = -np.diff(np.concatenate((upperAtLeast, [0.])))
+    
+    # Mix the distributions between each pair of percentiles
+    numberProbabilities = np.zeros(len(allNumbers))
+    
+    for lowerIndex in np.flatnonzero(lowerProbabilities > minProbability):
+        
+        for upperIndex in np.flatnonzero(upperProbabilities > minProbability):
+            
+            if upperIndex < lowerIndex: continue
+            
+            pairProbability = lowerProbabilities[lowerIndex] * \
+                                            upperProbabilities[upperIndex]
+            pairNumbers = slice(lowerIndex, upperIndex + 1)
+            pairSum = probabilities[pairNumbers].sum()
+            
+            numberProbabilities[pairNumbers] += pairProbability * \
+                                    probabilities[pairNumbers] / pairSum
+    
+    possible = numberProbabilities > 0
+    
+    numbers = allNumbers[possible]
+    cumProbabilities = numberProbabilities[possible].cumsum()
+    cumProbabilities /= cumProbabilities[-1]
+    
+    if len(_poisson_numbers_cache) >= maxCacheSize:
+        _poisson_numbers_cache.clear()
+    
+    _poisson_numbers_cache[expectedNumber] = (numbers, cumProbabilities)
 
-        #delete last entries
-        number = number - 1
-        del timeStep[-1]
+    return numbers, cumProbabilities
 
-        #save loop results
-        numberLoop.append(number)
-        timeStepLoop.append(timeStep)
 
-    upperPercentileValue = np.percentile(numberLoop, upperPercentile)
-    lowerPercentileValue = np.percentile(numberLoop, lowerPercentile)
+def _get_normal_cdf(z):
+    
+    '''_get_normal_cdf function: Cumulative distribution function of the
+    standard normal distribution.
 
-    for lCnt in range(0, loopNumber):
+    Args:
+        z (numpy.ndarray) : standard scores
 
-        if ((numberLoop[lCnt] >= lowerPercentileValue) &
-            (numberLoop[lCnt] <= upperPercentileValue)):
+    Returns:
+        cdf (numpy.ndarray) : cumulative probabilities
 
-            numberLoopFilt.append(numberLoop[lCnt])
-            timeStepLoopFilt.append(timeStepLoop[lCnt])
+    '''
+    
+    erf = np.array([math.erf(x / math.sqrt(2)) for x in z])
+    cdf = 0.5 * (1 + erf)
+    
+    return cdf
 
-    if len(numberLoopFilt) > 0:
 
-        loopIndex = random.randint(0, len(numberLoopFilt) - 1)
-        timeStep = timeStepLoopFilt[loopIndex]
-        number = numberLoopFilt[loopIndex]
+def _to_pickle_atomic(obj, file_path):
+    
+    '''_to_pickle_atomic function: Pickle an object to a temporary file and
+    rename it, so that readers never see a partially written file.
 
-    else:
+    Args:
+        obj (object): object to pickle
+        file_path (str): destination path
 
-        timeStep = []
-        number = 0
+    '''
+    
+    temp_path = "{}.{}.tmp".format(file_path, os.getpid())
+    pd.to_pickle(obj, temp_path)
+    
+    try:
+        os.rename(temp_path, file_path)
+    except OSError:
+        # Windows will not rename over an existing file
+        if not os.path.isfile(file_path): raise
+        os.remove(file_path)
+        os.rename(temp_path, file_path)
+    
+    return
 
-    TimeStamp = dummyStartOperationDate
 
-    for iCnt in range(0, len(timeStep)):
+def _save_column(dir_path, name, values):
+    
+    '''_save_column function: Save the values of a table column or index to
+    .npy files, in a format chosen by their type, without pickling them if
+    possible. The formats are:
+    
+        "values": arrays of numbers or dates, saved as they are
+        "category": categoricals, saved as their codes and categories
+        "numbers": objects which are all numbers, saved as a number array
+        "labels": objects which are all strings, saved as integer codes and
+            the distinct strings
+        "lists": lists of strings, such as device lists, saved as their
+            lengths, the codes of their items and the distinct items
+        "objects": any other objects, which are pickled
+    
+    Missing values are allowed in the "numbers", "labels" and "lists"
+    formats.
 
-        addTime = int(np.round(timeStep[iCnt]))
-        TimeStamp = TimeStamp + datetime.timedelta(days=addTime)
+    Args:
+        dir_path (str): directory of the files
+        name (str): prefix of the file names
+        values (pandas.Series or pandas.Index): values to save
 
-        # take only the events less than endOperationDate
+    Returns:
+        column_format (dict): description of the saved values, used by
+            _load_column
 
-        #if TimeStamp <= endOperationDate and iCnt < maxNrOfEvents:
-        if TimeStamp <= endOperationDate:
-            randomList.append(TimeStamp)
+    '''
+    
+    def get_path(part):
+        return os.path.join(dir_path, "{}.{}.npy".format(name, part))
+    
+    # The name of a categorical dtype is "category" in all pandas versions
+    if values.dtype.name == "category":
+        
+        categorical = pd.Categorical(values)
+        np.save(get_path("codes"), categorical.codes, allow_pickle=False)
+        
+        categories = _save_column(dir_path,
+                                  "{}.categories".format(name),
+                                  pd.Index(categorical.categories))
+        
+        return {"kind": "category",
+                "ordered": categorical.ordered,
+                "categories": categories}
+    
+    array = np.asarray(values)
+    
+    if array.dtype != object:
+        
+        np.save(get_path("values"), array, allow_pickle=False)
+        
+        return {"kind": "values"}
+    
+    present = [value for value in array if not _is_missing(value)]
+    
+    if all(_is_number(value) for value in present):
+        
+        if (len(present) == len(array) and
+            all(isinstance(value, numbers.Integral) for value in present)):
+            
+            number_array = array.astype(np.int64)
+        
         else:
-            break
+            
+            number_array = array.astype(float)
+        
+        np.save(get_path("values"), number_array, allow_pickle=False)
+        
+        return {"kind": "numbers"}
+    
+    if all(isinstance(value, basestring) for value in present):
+        
+        codes, labels = pd.factorize(array)
+        np.save(get_path("codes"), codes, allow_pickle=False)
+        np.save(get_path("labels"), _get_label_array(labels),
+                allow_pickle=False)
+        
+        return {"kind": "labels"}
+    
+    if all(isinstance(value, list) and
+           all(isinstance(item, basestring) for item in value)
+                                                    for value in present):
+        
+        lengths = [-1 if _is_missing(value) else len(value)
+                                                    for value in array]
+        items = [item for value in present for item in value]
+        codes, labels = pd.factorize(np.array(items, dtype=object))
+        
+        np.save(get_path("lengths"), np.array(lengths, dtype=np.int64),
+                allow_pickle=False)
+        np.save(get_path("codes"), codes, allow_pickle=False)
+        np.save(get_path("labels"), _get_label_array(labels),
+                allow_pickle=False)
+        
+        return {"kind": "lists"}
+    
+    np.save(get_path("values"), array, allow_pickle=True)
+    
+    return {"kind": "objects"}
 
-    return randomList
+
+def _load_column(dir_path, name, column_format):
+    
+    '''_load_column function: Load the values of a table column or index
+    saved by _save_column. Missing labels are restored as NaN.
+
+    Args:
+        dir_path (str): directory of the files
+        name (str): prefix of the file names
+        column_format (dict): description of the saved values
+
+    Returns:
+        values (numpy.ndarray or pandas.Categorical): loaded values
+
+    '''
+    
+    def load(part, allow_pickle=False):
+        return np.load(os.path.join(dir_path, "{}.{}.npy".format(name, part)),
+                       allow_pickle=allow_pickle)
+    
+    kind = column_format["kind"]
+    
+    if kind == "values":
+        return load("values")
+    
+    if kind == "objects":
+        return load("values", allow_pickle=True)
+    
+    if kind == "numbers":
+        return load("values").astype(object)
+    
+    if kind == "category":
+        
+        categories = _load_column(dir_path,
+                                  "{}.categories".format(name),
+                                  column_format["categories"])
+        
+        return pd.Categorical.from_codes(load("codes"),
+                                         categories,
+                                         ordered=column_format["ordered"])
+    
+    codes = load("codes")
+    labels = load("labels").astype(object)
+    
+    if kind == "labels":
+        
+        values = np.full(len(codes), np.nan, dtype=object)
+        present = codes >= 0
+        values[present] = labels[codes[present]]
+        
+        return values
+    
+    lengths = load("lengths")
+    values = np.full(len(lengths), np.nan, dtype=object)
+    start = 0
+    
+    for i, length in enumerate(lengths):
+        
+        if length < 0: continue
+        
+        values[i] = list(labels[codes[start:start + length]])
+        start += length
+    
+    return values
+
+
+def _is_missing(value):
+    
+    if isinstance(value, (list, tuple)): return False
+    
+    return bool(pd.isnull(value))
+
+
+def _is_number(value):
+    
+    return (isinstance(value, numbers.Real) and
+            not isinstance(value, (bool, np.bool_)))
+
+
+def _get_label_array(labels):
+    
+    # An empty list would be saved as a float array
+    if len(labels) == 0: return np.array([], dtype=str)
+    
+    return np.array(list(labels))
@@ -85,7 +85,7 @@ setup(name='dtocean-maintenance',
           'dtocean-logistics==2.0.0',
           'dtocean-reliability==2.0.0',
           'numpy',
-          'pandas>=0.17'
+          'pandas>=0.20'
       ],
       zip_safe=False, # Important for reading config files
       tests_require=['pytest',
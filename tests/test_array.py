@@ -17,46 +17,187 @@
 
 import datetime as dt
 
-from dtocean_maintenance.array import Array
+from dtocean_maintenance.array import Array, get_ram_index, get_ram_table
 
 
-def test_Array___calcPoissonEvents():
+def test_get_ram_table():
     
-    start_date = dt.datetime(2016, 1, 1)
-    simulation_time = 365
-    failure_rate = 2
+    def get_device(idx):
+        
+        device_id = 'device{:03d}'.format(idx)
+        device = [['', 'Pto', device_id, 0, 1e-5],
+                  ['', 'M&F sub-system', device_id, 0, 2e-5],
+                  ['', 'M&F sub-system', device_id, 0, 3e-5],
+                  ['', 'Array elec sub-system', device_id, 0, 4e-5]]
+        
+        return device
     
-    test = Array(start_date,
-                 simulation_time,
-                 None,
-                 None,
-                 None,
-                 None,
-                 None,
-                 None,
-                 False)
+    rsubsysvalues = [[['', 'Export Cable', 'array', 0, 1e-6]],
+                     [get_device(1), get_device(2)]]
     
-    test._Array__calcPoissonEvents(failure_rate)
+    test = get_ram_table(rsubsysvalues, 'radial')
     
-    assert len(test._Array__Poisson) > 0
+    assert len(test) == 9
+    assert test.loc[0, 'breakDown'] == 'All'
+    assert set(test['deviceID']) == set(['Array', 'device001', 'device002'])
+    assert test.loc[4, 'breakDown'] == ['device001']
+    assert test.loc[8, 'breakDown'] == ['device001', 'device002']
+    assert test.loc[2, 'subSystem'] == 'M&F sub-system mooring foundation'
+    assert test.loc[3, 'subSystem'] == 'M&F sub-system dynamic cable'
+
+
+def test_get_ram_index():
     
+    rsubsysvalues = [[['', 'Export Cable', 'array', 0, 1e-6]],
+                     [[['', 'Pto', 'device001', 0, 1e-5],
+                       ['', 'M&F sub-system', 'device001', 0, 2e-5],
+                       ['', 'M&F sub-system', 'device001', 0, 3e-5],
+                       ['', 'Array elec sub-system', 'device001', 0, 4e-5]]]]
     
-def test_Array___calcPoissonEvents_empty():
+    ram_table = get_ram_table(rsubsysvalues, 'radial')
+    test = get_ram_index(ram_table)
     
-    start_date = dt.datetime(2016, 1, 1)
-    simulation_time = 1
-    failure_rate = 2
+    assert len(test[('device001', None)]) == 4
+    assert len(test[('device001', 'Pto')]) == 1
     
-    test = Array(start_date,
-                 simulation_time,
-                 None,
-                 None,
-                 None,
-                 None,
+    failure_rate, breakdown = test[('Array', 'Export Cable')][0]
+    expected = ram_table[ram_table['subSystem'] == 'Export Cable']
+    
+    assert failure_rate == expected['failureRate'].iloc[0]
+    assert breakdown == 'All'
+
+
+def test_Array_executeFEM_femTemplate():
+    
+    import copy
+    
+    import numpy as np
+    import pandas as pd
+    
+    rsubsysvalues = [[['', 'Export Cable', 'array', 0, 1e-5]],
+                     [[['', 'Pto', 'device001', 0, 2e-5],
+                       ['', 'M&F sub-system', 'device001', 0, 1e-5],
+                       ['', 'M&F sub-system', 'device001', 0, 1e-5],
+                       ['', 'Array elec sub-system', 'device001', 0, 1e-5]]]]
+    
+    component = pd.DataFrame(
+                    {'Pto001': ['Pto001', 'device001', 'Pto', 2, 0.5],
+                     'Export Cable001': ['Export Cable001',
+                                         'Export Cable001',
+                                         'Export Cable',
+                                         1,
+                                         0.5]},
+                    index=['Component_ID',
+                           'Component_type',
+                           'Component_subtype',
+                           'number_failure_modes',
+                           'failure_rate'])
+    
+    failure_mode = pd.DataFrame({'Pto001_1': [50., 'MoS1'],
+                                 'Pto001_2': [50., 'RtP3'],
+                                 'Export Cable001_1': [100., 'Insp2']},
+                                index=['mode_probability', 'FM_ID'])
+    
+    events_keys = ['failureRate',
+                   'repairActionEvents',
+                   'failureEvents',
+                   'belongsTo',
+                   'ComponentType',
+                   'ComponentSubType',
+                   'ComponentID',
+                   'FM_ID',
+                   'indexFM',
+                   'RA_ID']
+    
+    no_poisson_keys = ['repairActionEvents',
+                       'failureEvents',
+                       'belongsTo',
+                       'ComponentType',
+                       'ComponentSubType',
+                       'ComponentID',
+                       'FM_ID',
+                       'indexFM',
+                       'RA_ID',
+                       'failureRate',
+                       'Alarm']
+    
+    test = Array(dt.datetime(2016, 1, 1),
+                 3650,
                  None,
+                 rsubsysvalues,
+                 'radial',
                  None,
+                 events_keys,
+                 no_poisson_keys,
                  False)
     
-    test._Array__calcPoissonEvents(failure_rate)
+    template = test.compileFEM(component, failure_mode, [1e6])
+    expected = copy.deepcopy(template)
+    
+    assert len(template['failureModes']) == 3
+    
+    results = []
+    
+    for femTemplate in [None, template, template]:
+        
+        random_state = np.random.RandomState(1)
+        result = test.executeFEM({},
+                                 None,
+                                 None,
+                                 component,
+                                 failure_mode,
+                                 None,
+                                 None,
+                                 [1e6],
+                                 random_state,
+                                 femTemplate)
+        results.append(result)
+    
+    assert template == expected
+    
+    for result in results[1:]:
+        assert result[0] == results[0][0]
+        assert result[1].equals(results[0][1])
+        assert result[2].equals(results[0][2])
+    
+    events_table = results[0][1]
+    no_poisson_table = results[0][2]
+    
+    assert events_table['ComponentID'].dtype.name == 'category'
+    assert events_table['repairActionEvents'].is_monotonic_increasing
+    assert list(events_table.index) == range(len(events_table))
+    assert no_poisson_table['FM_ID'].dtype.name == 'category'
+    assert list(no_poisson_table['ComponentSubType']) == \
+                            sorted(no_poisson_table['ComponentSubType'])
+    
+    # Delayed repair actions
+    repair_delays = np.array([1.5, 24., 0.])
+    random_state = np.random.RandomState(1)
+    result = test.executeFEM({},
+                             None,
+                             None,
+                             component,
+                             failure_mode,
+                             None,
+                             None,
+                             [1e6],
+                             random_state,
+                             template,
+                             repair_delays)
+    
+    delayed_table = result[1]
+    mode_delays = {(mode[4], mode[6]): delay
+                        for mode, delay in zip(template['failureModes'],
+                                               repair_delays)}
+    expected_delays = [pd.Timedelta(hours=mode_delays[(comp_id, index_fm)])
+                        for comp_id, index_fm in zip(
+                                                delayed_table['ComponentID'],
+                                                delayed_table['indexFM'])]
     
-    assert not test._Array__Poisson
+    assert len(delayed_table) == len(events_table)
+    assert any(delay > pd.Timedelta(0) for delay in expected_delays)
+    assert delayed_table['repairActionEvents'].is_monotonic_increasing
+    assert list(delayed_table['repairActionEvents'] -
+                delayed_table['failureEvents']) == expected_delays
+    assert sorted(delayed_table['failureEvents']) == \
+                                        sorted(events_table['failureEvents'])
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2017-2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+import datetime as dt
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from dtocean_logistics.performance.schedule.schedule_shared import WaitingTime
+from dtocean_maintenance.logistics import (IndexedWaitingTime,
+                                           MappedMetocean,
+                                           get_feasibility_key,
+                                           get_logistics_fingerprint,
+                                           get_olc_limits,
+                                           om_logistics_feasibility,
+                                           save_mapped_metocean)
+
+
+def get_om(t_start):
+    
+    om = pd.DataFrame({'FM_ID [-]': ['MoS1'],
+                       't_start [-]': [t_start],
+                       'Port_Index [-]': [0],
+                       'Soil type [-]': [np.nan]})
+    
+    return om
+
+
+def test_get_feasibility_key():
+    
+    key = get_feasibility_key(get_om('2016-01-01 00:00:00'))
+    
+    assert key == get_feasibility_key(get_om('2017-01-01 00:00:00'))
+    assert ('Soil type [-]', (None,)) in key
+    assert 't_start [-]' not in [column for column, _ in key]
+
+
+def test_get_logistics_fingerprint():
+    
+    def get_logistic_param(hs):
+        
+        metocean = pd.DataFrame({'year [-]': [2016, 2016],
+                                 'Hs [m]': [hs, 2.]})
+        vessels = {'Tug': pd.DataFrame({'Length [m]': [20.]})}
+        logistic_param = {'metocean': metocean,
+                          'vessels': vessels,
+                          'site': pd.DataFrame({'x': [1.]}),
+                          'layout': None}
+        
+        return logistic_param
+    
+    logistic_param = get_logistic_param(1.)
+    fingerprint = get_logistics_fingerprint(logistic_param)
+    
+    assert fingerprint == get_logistics_fingerprint(get_logistic_param(1.))
+    assert fingerprint != get_logistics_fingerprint(get_logistic_param(1.5))
+    
+    metocean = get_logistic_param(1.5)['metocean']
+    
+    assert get_logistics_fingerprint(logistic_param, metocean) == \
+                        get_logistics_fingerprint(get_logistic_param(1.5))
+    
+    logistic_param['vessels']['Tug'].iloc[0, 0] = 30.
+    
+    assert fingerprint != get_logistics_fingerprint(logistic_param)
+
+
+class MockStrategy(object):
+    
+    def __init__(self, sol):
+        self.sol = sol
+
+
+class MockLogPhase(object):
+    
+    def __init__(self, op_ve):
+        self.op_ve = op_ve
+
+
+def test_om_logistics_feasibility_cache(mocker):
+    
+    vessel = pd.Series({'Name [-]': 'vessel'})
+    log_phase = MockLogPhase({0: MockStrategy([{'VEs': vessel}])})
+    
+    mocker.patch('dtocean_maintenance.logistics.logOp_init')
+    init = mocker.patch('dtocean_maintenance.logistics.logPhase_om_init',
+                        return_value={'LpM1': log_phase})
+    mocker.patch('dtocean_maintenance.logistics.logPhase_select',
+                 return_value='LpM1')
+    mocker.patch('dtocean_maintenance.logistics.feas_om',
+                 return_value='requirement')
+    mocker.patch('dtocean_maintenance.logistics.select_e',
+                 side_effect=lambda om_log, phase: ('eq', phase))
+    mocker.patch('dtocean_maintenance.logistics.select_v',
+                 side_effect=lambda om_log, phase: ('ve', phase))
+    mocker.patch('dtocean_maintenance.logistics.compatibility_ve',
+                 side_effect=lambda om_log, phase, port: ({'sol': [1]},
+                                                          phase,
+                                                          'Match'))
+    
+    ports = pd.DataFrame({'Name [-]': ['port']})
+    cache = {}
+    results = []
+    
+    for t_start in ['2016-01-01 00:00:00', '2017-01-01 00:00:00']:
+        
+        result = om_logistics_feasibility(None,
+                                          None,
+                                          ports,
+                                          None,
+                                          None,
+                                          None,
+                                          None,
+                                          None,
+                                          None,
+                                          None,
+                                          get_om(t_start),
+                                          cache)
+        results.append(result)
+        
+        # Modify the result, as sched_om and cost do
+        (om_log, phase, _, _) = result
+        om_log['findSolution'] = 'SolutionFound'
+        phase.op_ve[0].sol[0]['schedule'] = t_start
+    
+    assert init.call_count == 1
+    assert len(cache) == 1
+    
+    (om_log, phase, log_phase_id, MATCH_FLAG) = results[1]
+    
+    assert om_log['requirement'] == 'requirement'
+    assert om_log['combi_select'] == {'sol': [1]}
+    assert log_phase_id == 'LpM1'
+    assert MATCH_FLAG == 'Match'
+    
+    # Results are copies of the stored results, sharing the vessel data
+    (stored_log, stored_phase, _, _) = cache.values()[0]
+    
+    assert stored_log['findSolution'] == {}
+    assert stored_phase.op_ve[0].sol == [{'VEs': vessel}]
+    assert results[0][1].op_ve[0].sol[0]['schedule'] == \
+                                                        '2016-01-01 00:00:00'
+    assert phase.op_ve[0].sol[0]['VEs'] is vessel
+
+
+def get_metocean():
+    
+    times = pd.date_range('1992-01-01', periods=8, freq='3H')
+    metocean = pd.DataFrame({'year [-]': times.year,
+                             'month [-]': times.month,
+                             'day [-]': times.day,
+                             'hour [-]': times.hour,
+                             'Hs [m]': [3., 1., 1., 3., 1., 1., 1., 3.],
+                             'Tp [s]': [8.] * 8,
+                             'Ws [m/s]': [5.] * 8,
+                             'Cs [m/s]': [0.5] * 8})
+    
+    return metocean
+
+
+def test_save_mapped_metocean(tmpdir):
+    
+    metocean = get_metocean()
+    test = save_mapped_metocean(metocean, str(tmpdir))
+    
+    assert isinstance(test, MappedMetocean)
+    assert test['Hs [m]'].dtype == np.float32
+    assert (test['hour [-]'].values == metocean['hour [-]'].values).all()
+    
+    # Pickled by reference to the mapped files
+    pickled = pickle.dumps(test, 2)
+    unpickled = pickle.loads(pickled)
+    
+    assert len(pickled) < 1000
+    assert unpickled.get_mapped_path() == str(tmpdir)
+    assert np.allclose(unpickled['Cs [m/s]'], metocean['Cs [m/s]'])
+    
+    # Changes are not written to the files
+    unpickled.loc[0, 'Hs [m]'] = 10.
+    reloaded = pickle.loads(pickled)
+    
+    assert reloaded.loc[0, 'Hs [m]'] == 3.
+
+
+def test_save_mapped_metocean_other_columns(tmpdir):
+    
+    metocean = get_metocean()
+    metocean['Dir [deg]'] = 0.
+    
+    with pytest.raises(ValueError):
+        save_mapped_metocean(metocean, str(tmpdir))
+
+
+def test_get_olc_limits():
+    
+    limits = get_olc_limits([2, np.nan, None, 'n/a'])
+    
+    assert limits == (2., None, None, None)
+
+
+def test_IndexedWaitingTime_get_window():
+    
+    olc = {'maxHs': 2., 'maxTp': 10., 'maxWs': 10., 'maxCs': np.nan}
+    test = IndexedWaitingTime(get_metocean(),
+                              [get_olc_limits([2., 10., 10., None])])
+    start = dt.datetime(1992, 1, 1)
+    
+    # Windows from 3 to 9 and from 12 to 21 hours
+    assert test.get_window(olc, 6., start) == \
+                                    (start + dt.timedelta(hours=3), 3.)
+    assert test.get_window(olc, 3., start + dt.timedelta(hours=5)) == \
+                                    (start + dt.timedelta(hours=5), 0.)
+    assert test.get_window(olc, 6., start + dt.timedelta(hours=5)) == \
+                                    (start + dt.timedelta(hours=12), 7.)
+    assert test.get_window(olc, 10., start) is None
+    assert test.get_window(olc, 1., start - dt.timedelta(hours=1)) is None
+    
+    # Limits which are not given on construction
+    olc['maxHs'] = 0.5
+    
+    assert test.get_window(olc, 1., start) is None
+
+
+def test_IndexedWaitingTime_call(mocker):
+    
+    stock = mocker.patch.object(WaitingTime,
+                                '__call__',
+                                return_value="stock")
+    
+    olc = {'maxHs': 2., 'maxTp': 10., 'maxWs': 10., 'maxCs': np.nan}
+    test = IndexedWaitingTime(get_metocean())
+    start = dt.datetime(1992, 1, 1)
+    
+    assert test(olc, 6., start) == (start + dt.timedelta(hours=3), 3.)
+    assert not stock.called
+    
+    # Requests which are not answered by the index
+    assert test(olc, 10., start) == "stock"
+    assert stock.call_args[0][1:] == (10., start)
+
+
+def test_IndexedWaitingTime_matches_WaitingTime():
+    
+    metocean = get_metocean()
+    stock = WaitingTime(metocean)
+    test = IndexedWaitingTime(metocean,
+                              [get_olc_limits([2., 10., 10., None])])
+    
+    olc = {'maxHs': 2., 'maxTp': 10., 'maxWs': 10., 'maxCs': np.nan}
+    start = dt.datetime(1992, 1, 1)
+    
+    for hours in [0, 2, 3, 5, 8, 9, 12, 20]:
+        
+        start_date = start + dt.timedelta(hours=hours)
+        
+        for duration in [1., 3., 6., 9.]:
+            
+            if test.get_window(olc, duration, start_date) is None: continue
+            
+            assert test(olc, duration, start_date) == \
+                                            stock(olc, duration, start_date)
+
+
+def test_IndexedWaitingTime_mapped_limits(tmpdir):
+    
+    metocean = get_metocean()
+    metocean['Hs [m]'] = [1.3, 1.1, 1.1, 1.3, 1.2, 1.2, 1.2, 1.3]
+    mapped = save_mapped_metocean(metocean, str(tmpdir))
+    
+    test = IndexedWaitingTime(metocean)
+    test_mapped = IndexedWaitingTime(mapped)
+    
+    olc = {'maxHs': np.nan, 'maxTp': 10., 'maxWs': 10., 'maxCs': np.nan}
+    start = dt.datetime(1992, 1, 1)
+    
+    # Windows from 3 to 9 hours, and from 12 to 21 hours for 1.2
+    for max_hs in [1.1, 1.2]:
+        
+        olc['maxHs'] = max_hs
+        
+        for hours in [0, 5]:
+            
+            start_date = start + dt.timedelta(hours=hours)
+            window = test.get_window(olc, 3., start_date)
+            
+            assert window is not None
+            assert test_mapped.get_window(olc, 3., start_date) == window
+    
+    assert test_mapped.get_window(olc, 6., start + dt.timedelta(hours=5)) == \
+                                (start + dt.timedelta(hours=12), 7.)
@@ -15,12 +15,25 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import pickle
+import datetime as dt
+import threading
+import multiprocessing.dummy
+
 import pytest
 
 import pandas as pd
 
 from dtocean_maintenance.input import inputOM
-from dtocean_maintenance.main import LCOE_Statistics
+from dtocean_maintenance.logistics import (MappedMetocean,
+                                           get_logistics_fingerprint)
+from dtocean_maintenance.main import (LCOE_Calculator,
+                                      LCOE_Statistics,
+                                      run_queue_worker)
+from dtocean_maintenance.static import (EventTablesStore,
+                                        JobQueue,
+                                        LogisticsCache,
+                                        StoredEventTables)
 
 
 @pytest.fixture
@@ -143,16 +156,39 @@ def logistics_param():
     return logistics_param
 
 
-def test_LCOE_Statistics_main(mocker, data_point, logistics_param):
+@pytest.fixture
+def thread_pool(mocker):
+    
+    # Workers are run in threads, so they share the patches
+    pool = mocker.patch('dtocean_maintenance.main.multiprocessing.Pool',
+                        side_effect=multiprocessing.dummy.Pool)
+    
+    return pool
+
+
+@pytest.fixture
+def calculator_mocks(mocker, data_point):
+    
+    init = mocker.patch('dtocean_maintenance.main.LCOE_Calculator.__init__',
+                        return_value=None)
+    context = mocker.patch('dtocean_maintenance.main.LCOE_Context.__init__',
+                           return_value=None)
+    execute = mocker.patch(
+                    'dtocean_maintenance.main.LCOE_Calculator.executeCalc',
+                    return_value=data_point)
+    waiting = mocker.patch('dtocean_maintenance.main._get_waiting_time',
+                           return_value=None)
+    
+    mocks = {"init": init,
+             "context": context,
+             "execute": execute,
+             "waiting": waiting}
+    
+    return mocks
+
+
+def get_control(logistics_param, control_param):
     
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.__init__',
-                 return_value=None)
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.executeCalc',
-                 return_value=data_point)
-    mocker.patch('dtocean_logistics.performance.schedule.schedule_shared.'
-                 'WaitingTime.__init__',
-                 return_value=None)
-    n_sims = 5
     control = inputOM(None,
                       None,
                       None,
@@ -161,7 +197,23 @@ def test_LCOE_Statistics_main(mocker, data_point, logistics_param):
                       None,
                       logistics_param,
                       None,
-                      {'numberOfSimulations': n_sims})
+                      control_param)
+    
+    return control
+
+
+def run_queue_worker_thread(queue_path, n_points):
+    
+    n_points.append(run_queue_worker(queue_path, 3))
+    
+    return
+
+
+def test_LCOE_Statistics_main(calculator_mocks, logistics_param):
+    
+    n_sims = 5
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims})
     
     test = LCOE_Statistics(control)
     result = test.main()
@@ -184,25 +236,431 @@ def test_LCOE_Statistics_main(mocker, data_point, logistics_param):
     assert len(result["energyPerDevice [Wh]"]) == 3
     
     
-def test_LCOE_Statistics_main_no_sims(mocker, data_point, logistics_param):
+def test_LCOE_Statistics_main_context(calculator_mocks, logistics_param):
+    
+    init = calculator_mocks["init"]
+    context = calculator_mocks["context"]
+    n_sims = 5
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims})
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    contexts = [call[1]["context"] for call in init.call_args_list]
+    
+    assert context.call_count == 1
+    assert init.call_count == n_sims
+    assert all(x is contexts[0] for x in contexts)
+
+
+def test_LCOE_Statistics_main_workers(calculator_mocks,
+                                      logistics_param,
+                                      thread_pool):
+    
+    n_sims = 5
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'numberOfWorkers': 2})
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+        
+    assert len(result["MetricsTable [-]"]) == n_sims
+    assert len(result["OpexPerYear [Euro]"].columns) == n_sims
+    assert len(result["downtimePerDevice [hour]"].columns) == n_sims
+    assert list(result["OpexPerYear [Euro]"].columns) == \
+                    ["Cost {} [Euro]".format(i) for i in range(n_sims)]
+
+
+def test_LCOE_Statistics_main_logistics_cache_path(mocker,
+                                                   tmpdir,
+                                                   calculator_mocks,
+                                                   data_point,
+                                                   logistics_param,
+                                                   thread_pool):
+    
+    def execute_data_point(self, sim_number,
+                                 custom_waiting=None,
+                                 context=None,
+                                 logistics_cache=None,
+                                 metocean=None):
+        
+        logistics_cache.add(sim_number, {"optimal": sim_number})
+        
+        return data_point
+    
+    mocker.patch('dtocean_maintenance.main.LCOE_Statistics.'
+                 'execute_data_point',
+                 new=execute_data_point)
+    n_sims = 5
+    cache_path = str(tmpdir.join("logistics.pkl"))
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'numberOfWorkers': 2,
+                           'logisticsCacheSize': 10,
+                           'logisticsCachePath': cache_path})
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    # The solutions of all workers are saved by the coordinator
+    fingerprint = get_logistics_fingerprint(logistics_param)
+    loaded = LogisticsCache(10, cache_path, fingerprint)
+    
+    assert len(loaded) == n_sims
+    assert loaded.get(n_sims - 1) == {"optimal": n_sims - 1}
+    assert tmpdir.listdir() == [tmpdir.join("logistics.pkl")]
+
+
+def test_LCOE_Statistics_main_no_workers(calculator_mocks, logistics_param):
+    
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 5,
+                           'numberOfWorkers': 0})
+    
+    test = LCOE_Statistics(control)
+    
+    with pytest.raises(ValueError):
+        test.main()
+
+
+@pytest.mark.parametrize("interval", [0, -1])
+def test_LCOE_Statistics_main_bad_checkpoint_interval(tmpdir,
+                                                      calculator_mocks,
+                                                      logistics_param,
+                                                      interval):
+    
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 5,
+                           'checkpointPath': str(tmpdir),
+                           'checkpointInterval': interval})
+    
+    test = LCOE_Statistics(control)
+    
+    with pytest.raises(ValueError):
+        test.main()
+    
+    assert not tmpdir.listdir()
+
+
+def test_LCOE_Statistics_main_convergence(calculator_mocks, logistics_param):
+    
+    min_sims = 4
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 20,
+                           'convergenceHalfWidth': 0.01,
+                           'convergenceMinSimulations': min_sims})
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+    
+    assert len(result["MetricsTable [-]"]) == min_sims
+    assert len(result["OpexPerYear [Euro]"].columns) == min_sims
+    assert len(result["convergenceTrace [-]"]) == min_sims
+    assert result["convergenceTrace [-]"]["converged [-]"].iloc[-1]
+
+
+def test_LCOE_Statistics_main_resume(tmpdir,
+                                     calculator_mocks,
+                                     data_point,
+                                     logistics_param):
+    
+    execute = calculator_mocks["execute"]
+    execute.side_effect = [data_point,
+                           data_point,
+                           data_point,
+                           RuntimeError("Crash")]
+    n_sims = 5
+    control_param = {'numberOfSimulations': n_sims,
+                     'randomSeed': 1,
+                     'checkpointPath': str(tmpdir),
+                     'checkpointInterval': 2}
+    control = get_control(logistics_param, control_param)
+    
+    test = LCOE_Statistics(control)
+    
+    with pytest.raises(RuntimeError):
+        test.main()
+    
+    assert len(tmpdir.listdir()) == 1
+    
+    execute.reset_mock()
+    execute.side_effect = None
+    control_param['resumeFromCheckpoint'] = True
+    
+    result = test.main()
+    
+    assert execute.call_count == 3
+    assert len(result["OpexPerYear [Euro]"].columns) == n_sims
+    assert len(result["MetricsTable [-]"]) == n_sims
+
+
+def test_LCOE_Statistics_main_checkpoint_event_tables(mocker,
+                                                      tmpdir,
+                                                      calculator_mocks,
+                                                      data_point,
+                                                      logistics_param):
+    
+    events_tables_dict = {'UnCoMa_eventsTable': pd.DataFrame({"a": [1]}),
+                          'CoBaMa_eventsTable': pd.DataFrame({"a": [2]}),
+                          'CaBaMa_eventsTable': pd.DataFrame({"a": [3]})}
+    data_point['eventTables [-]'] = events_tables_dict
+    
+    add_data_point = mocker.spy(EventTablesStore, 'add_data_point')
+    
+    n_sims = 3
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'checkpointPath': str(tmpdir),
+                           'checkpointInterval': 1})
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+    
+    # The tables of each data point are written once, for all checkpoints
+    sim_numbers = [call[0][1] for call in add_data_point.call_args_list]
+    
+    assert sim_numbers == range(n_sims)
+    assert len(tmpdir.join("eventTables").listdir()) == n_sims
+    
+    checkpoint = pd.read_pickle(str(tmpdir.join("checkpoint.pkl")))
+    stored = checkpoint["accumulator"].get_output()['eventTables [-]']
+    
+    assert all(isinstance(handle, StoredEventTables) for handle in stored)
+    assert result['eventTables [-]'][2]['CaBaMa_eventsTable'].equals(
+                                    events_tables_dict['CaBaMa_eventsTable'])
+
+
+def test_LCOE_Statistics_main_resume_bad_seed(tmpdir,
+                                              calculator_mocks,
+                                              logistics_param):
+    
+    control_param = {'numberOfSimulations': 5,
+                     'randomSeed': 1,
+                     'checkpointPath': str(tmpdir)}
+    control = get_control(logistics_param, control_param)
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    control_param['randomSeed'] = 2
+    control_param['resumeFromCheckpoint'] = True
+    
+    with pytest.raises(ValueError):
+        test.main()
+
+
+def test_LCOE_Statistics_main_resume_bad_convergence(tmpdir,
+                                                     calculator_mocks,
+                                                     logistics_param):
+    
+    control_param = {'numberOfSimulations': 5,
+                     'randomSeed': 1,
+                     'checkpointPath': str(tmpdir),
+                     'convergenceHalfWidth': 0.,
+                     'convergenceMinSimulations': 2}
+    control = get_control(logistics_param, control_param)
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    control_param['convergenceMinSimulations'] = 3
+    control_param['resumeFromCheckpoint'] = True
+    
+    with pytest.raises(ValueError):
+        test.main()
+
+
+def test_LCOE_Statistics_main_event_tables_path(tmpdir,
+                                                calculator_mocks,
+                                                data_point,
+                                                logistics_param):
+    
+    events_tables_dict = {'UnCoMa_eventsTable': pd.DataFrame({"a": [1]}),
+                          'CoBaMa_eventsTable': pd.DataFrame({"a": [2]}),
+                          'CaBaMa_eventsTable': pd.DataFrame({"a": [3]})}
+    data_point['eventTables [-]'] = events_tables_dict
+    
+    n_sims = 3
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'eventTablesPath': str(tmpdir)})
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+    
+    assert len(tmpdir.listdir()) == n_sims
+    assert len(result['eventTables [-]']) == n_sims
+    
+    handle = result['eventTables [-]'][0]
+    
+    assert handle['CoBaMa_eventsTable'].equals(
+                                    events_tables_dict['CoBaMa_eventsTable'])
+
+
+def test_LCOE_Statistics_main_metocean_memmap_path(tmpdir, calculator_mocks):
+    
+    calculator = calculator_mocks["init"]
+    waiting = calculator_mocks["waiting"]
+    
+    metocean = pd.DataFrame({'year [-]': [1992, 1992],
+                             'month [-]': [1, 1],
+                             'day [-]': [1, 1],
+                             'hour [-]': [0, 1],
+                             'Hs [m]': [1.5, 2.],
+                             'Tp [s]': [8., 9.],
+                             'Ws [m/s]': [5., 6.],
+                             'Cs [m/s]': [0.5, 0.25]})
+    logistics_param = {"metocean": metocean}
+    
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 1,
+                           'metoceanMemmapPath': str(tmpdir)})
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    mapped = calculator.call_args[1]["metocean"]
+    
+    # The input is not modified
+    assert logistics_param["metocean"] is metocean
+    assert isinstance(mapped, MappedMetocean)
+    assert mapped.get_mapped_path() == str(tmpdir)
+    assert (mapped['Hs [m]'].values == metocean['Hs [m]'].values).all()
+    assert waiting.call_args[0][0] is mapped
+
+
+def test_LCOE_Statistics_main_workers_metocean_memmap_path(tmpdir,
+                                                           calculator_mocks,
+                                                           thread_pool):
+    
+    metocean = pd.DataFrame({'year [-]': [1992, 1992],
+                             'month [-]': [1, 1],
+                             'day [-]': [1, 1],
+                             'hour [-]': [0, 1],
+                             'Hs [m]': [1.5, 2.],
+                             'Tp [s]': [8., 9.],
+                             'Ws [m/s]': [5., 6.],
+                             'Cs [m/s]': [0.5, 0.25]})
+    logistics_param = {"metocean": metocean}
+    
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 2,
+                           'numberOfWorkers': 2,
+                           'metoceanMemmapPath': str(tmpdir)})
+    
+    test = LCOE_Statistics(control)
+    test.main()
+    
+    # The initialiser arguments, as pickled for spawned workers, only carry
+    # the mapped metocean
+    initargs = pickle.loads(pickle.dumps(thread_pool.call_args[0][2],
+                                         pickle.HIGHEST_PROTOCOL))
+    worker_input, _, worker_metocean = initargs
+    
+    assert isinstance(worker_metocean, MappedMetocean)
+    assert isinstance(worker_input.get_Logistic_Param()["metocean"],
+                      MappedMetocean)
+    assert logistics_param["metocean"] is metocean
+
+
+def test_LCOE_Statistics_main_job_queue(tmpdir,
+                                        calculator_mocks,
+                                        logistics_param):
+    
+    n_sims = 5
+    queue_path = str(tmpdir)
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'jobQueuePath': queue_path})
+    
+    # Workers are run in threads, so they share the patches
+    n_points = []
+    workers = [threading.Thread(target=run_queue_worker_thread,
+                                args=(queue_path, n_points))
+                                                        for _ in range(2)]
+    
+    for worker in workers: worker.start()
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+    
+    for worker in workers: worker.join()
+    
+    assert len(result["MetricsTable [-]"]) == n_sims
+    assert list(result["OpexPerYear [Euro]"].columns) == \
+                    ["Cost {} [Euro]".format(i) for i in range(n_sims)]
+    assert sum(n_points) == n_sims
+    assert not tmpdir.join("tasks").listdir()
+
+
+def test_LCOE_Statistics_main_job_queue_metocean_memmap_path(mocker,
+                                                             tmpdir,
+                                                             calculator_mocks):
+    
+    metocean = pd.DataFrame({'year [-]': [1992, 1992],
+                             'month [-]': [1, 1],
+                             'day [-]': [1, 1],
+                             'hour [-]': [0, 1],
+                             'Hs [m]': [1.5, 2.],
+                             'Tp [s]': [8., 9.],
+                             'Ws [m/s]': [5., 6.],
+                             'Cs [m/s]': [0.5, 0.25]})
+    logistics_param = {"metocean": metocean}
+    
+    n_sims = 2
+    queue_path = str(tmpdir.join("queue"))
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims,
+                           'jobQueuePath': queue_path,
+                           'metoceanMemmapPath': str(tmpdir.join("metocean"))})
+    
+    publish = mocker.spy(JobQueue, "publish")
+    
+    # The worker is run in a thread, so it shares the patches
+    n_points = []
+    worker = threading.Thread(target=run_queue_worker_thread,
+                              args=(queue_path, n_points))
+    worker.start()
+    
+    test = LCOE_Statistics(control)
+    result = test.main()
+    
+    worker.join()
+    
+    job = publish.call_args[0][1]
+    job_metocean = job["inputOM"].get_Logistic_Param()["metocean"]
+    
+    assert len(result["MetricsTable [-]"]) == n_sims
+    assert n_points == [n_sims]
+    assert isinstance(job["metocean"], MappedMetocean)
+    assert job_metocean is job["metocean"]
+    assert logistics_param["metocean"] is metocean
+
+
+def test_run_queue_worker_error(tmpdir, calculator_mocks, logistics_param):
+    
+    calculator_mocks["execute"].side_effect = ValueError("Bad data point")
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 1})
+    
+    queue = JobQueue(str(tmpdir))
+    job_id = queue.publish({"inputOM": control, "context": None}, [0])
+    
+    n_points = run_queue_worker(str(tmpdir), 0)
+    result = queue.get_result(job_id, 0)
+    
+    assert n_points == 1
+    assert result["data_point"] is None
+    assert "Bad data point" in result["error"]
+
+
+def test_LCOE_Statistics_main_no_sims(calculator_mocks, logistics_param):
     
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.__init__',
-                 return_value=None)
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.executeCalc',
-                 return_value=data_point)
-    mocker.patch('dtocean_logistics.performance.schedule.schedule_shared.'
-                 'WaitingTime.__init__',
-                 return_value=None)
     n_sims = 0
-    control = inputOM(None,
-                      None,
-                      None,
-                      None,
-                      None,
-                      None,
-                      logistics_param,
-                      None,
-                      {'numberOfSimulations': n_sims})
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims})
     
     test = LCOE_Statistics(control)
     
@@ -210,27 +668,114 @@ def test_LCOE_Statistics_main_no_sims(mocker, data_point, logistics_param):
         test.main()
     
     
-def test_LCOE_Statistics_call(mocker, data_point, logistics_param):
+def test_LCOE_Statistics_execute_data_point(calculator_mocks, logistics_param):
+    
+    init = calculator_mocks["init"]
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 5,
+                           'randomSeed': 1})
+    
+    test = LCOE_Statistics(control)
+    test.execute_data_point(3)
+    test.execute_data_point(3)
+    
+    first = init.call_args_list[0][1]["random_state"]
+    second = init.call_args_list[1][1]["random_state"]
+    
+    assert first.randint(1000000) == second.randint(1000000)
+
+
+@pytest.mark.parametrize("seed", [-1, 2 ** 32, 1.5, "1"])
+def test_LCOE_Statistics_main_bad_seed(calculator_mocks,
+                                       logistics_param,
+                                       seed):
+    
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': 5,
+                           'randomSeed': seed})
+    
+    test = LCOE_Statistics(control)
+    
+    with pytest.raises(ValueError):
+        test.main()
+
+
+def test_LCOE_Statistics_call(calculator_mocks, logistics_param):
     
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.__init__',
-                 return_value=None)
-    mocker.patch('dtocean_maintenance.main.LCOE_Calculator.executeCalc',
-                 return_value=data_point)
-    mocker.patch('dtocean_logistics.performance.schedule.schedule_shared.'
-                 'WaitingTime.__init__',
-                 return_value=None)    
     n_sims = 5
-    control = inputOM(None,
-                      None,
-                      None,
-                      None,
-                      None,
-                      None,
-                      logistics_param,
-                      None,
-                      {'numberOfSimulations': n_sims})
+    control = get_control(logistics_param,
+                          {'numberOfSimulations': n_sims})
     
     test = LCOE_Statistics(control)
     test()
     
     assert True
+
+
+def test_LCOE_Calculator___formatOutputDates():
+    
+    table = pd.DataFrame(index=[0],
+                         columns=['failureDate [-]', 'ComponentID [-]'])
+    table.loc[0] = [pd.Timestamp('2016-01-01 05:00:00.25'), 'Pto001']
+    table.loc[1] = [dt.datetime(2016, 1, 2, 6), 'Pto002']
+    
+    LCOE_Calculator._LCOE_Calculator__formatOutputDates(table,
+                                                        ['failureDate [-]'])
+    
+    assert list(table['failureDate [-]']) == ['2016-01-01 05:00:00.250000',
+                                              '2016-01-02 06:00:00']
+    
+    empty = pd.DataFrame(index=[0], columns=['failureDate [-]'])
+    LCOE_Calculator._LCOE_Calculator__formatOutputDates(empty,
+                                                        ['failureDate [-]'])
+    
+    assert empty['failureDate [-]'].isnull().all()
+    assert empty['failureDate [-]'].dtype == object
+
+
+def test_LCOE_Calculator___getOutputEventsTable():
+    
+    keys = ['failureDate [-]', 'downtimeDeviceList [-]', 'indexFM [-]']
+    records = [[dt.datetime(2016, 1, 1), ['device001'], 1],
+               [dt.datetime(2016, 1, 2), ['device001', 'device002'], 2]]
+    
+    test = LCOE_Calculator._LCOE_Calculator__getOutputEventsTable(records,
+                                                                  keys)
+    
+    assert list(test.columns) == keys
+    assert list(test.index) == [0, 1]
+    assert test.loc[1, 'downtimeDeviceList [-]'] == ['device001',
+                                                     'device002']
+    
+    empty = LCOE_Calculator._LCOE_Calculator__getOutputEventsTable([], keys)
+    
+    assert len(empty) == 1
+    assert empty.isnull().values.all()
+
+
+def test_LCOE_Calculator___getCaBaMaEndDates():
+    
+    keys = ['currentEndActionDate', 'ComponentType', 'FM_ID', 'indexFM']
+    table = pd.DataFrame(index=[0], columns=keys)
+    table.loc[0] = [dt.datetime(2017, 1, 1), 'device001', 'MoS1', 1]
+    table.loc[1] = [dt.datetime(2016, 1, 1), 'device001', 'MoS1', 1]
+    table.loc[2] = [dt.datetime(2016, 6, 1), 'device002', 'MoS1', 1]
+    
+    test = LCOE_Calculator.__new__(LCOE_Calculator)
+    test._LCOE_Calculator__CaBaMa_eventsTable = table
+    test._LCOE_Calculator__CaBaMa_rowIndex = {}
+    test._LCOE_Calculator__CaBaMa_endDateIndex = {}
+    
+    columns = ('ComponentType', 'FM_ID', 'indexFM')
+    rows = test._LCOE_Calculator__getCaBaMaRows(columns,
+                                                ('device001', 'MoS1', 1))
+    end_dates = test._LCOE_Calculator__getCaBaMaEndDates(
+                                                columns,
+                                                ('device001', 'MoS1', 1))
+    missing = test._LCOE_Calculator__getCaBaMaRows(columns,
+                                                   ('device003', 'MoS1', 1))
+    
+    assert list(rows.index) == [0, 1]
+    assert end_dates == [pd.Timestamp('2016-01-01'),
+                         pd.Timestamp('2017-01-01')]
+    assert missing.empty
@@ -17,18 +17,33 @@
 
 import pytest
 
+import os
+import time
+import shutil
 import datetime as dt
 
 import numpy as np
 import pandas as pd
 
 from dtocean_maintenance.static import (Availability,
+                                        ConvergenceMonitor,
+                                        CorrectiveEventQueue,
                                         Energy,
+                                        EventTablesStore,
+                                        JobQueue,
+                                        LogisticsCache,
+                                        StatisticsAccumulator,
                                         get_uptime_df,
                                         get_device_energy_df,
                                         get_opex_per_year,
                                         get_opex_lcoe,
-                                        get_number_of_journeys)
+                                        get_number_of_journeys,
+                                        get_parameter_records,
+                                        get_random_state,
+                                        get_z_score,
+                                        poisson_process,
+                                        poisson_process_batch,
+                                        _get_poisson_numbers)
 
 
 @pytest.fixture(scope="module")
@@ -905,6 +920,661 @@ def test_get_number_of_journeys_all(events_tables_dict):
     assert total_ops == 102
     
     
+def test_EventTablesStore(tmpdir, events_tables_dict):
+    
+    data_point = {key: 1. for key in StatisticsAccumulator.metric_keys}
+    data_point['eventTables [-]'] = events_tables_dict
+    
+    test = EventTablesStore(str(tmpdir))
+    handle = test.add_data_point(3, data_point)
+    
+    assert len(tmpdir.listdir()) == 1
+    assert set(handle.keys()) == set(events_tables_dict.keys())
+    
+    # Metrics are held by the handle
+    os.remove(os.path.join(handle.get_path(), "tables.pkl"))
+    
+    assert handle.get_metrics()["LCOEOpex [Euro/kWh]"] == 1.
+    
+    for key, table in events_tables_dict.items():
+        assert handle[key].equals(table)
+        assert handle[key].dtypes.equals(table.dtypes)
+    
+    # Only the requested table is read
+    shutil.rmtree(os.path.join(handle.get_path(), "UnCoMa_eventsTable"))
+    
+    assert handle["CaBaMa_eventsTable"].equals(
+                                    events_tables_dict["CaBaMa_eventsTable"])
+    
+    with pytest.raises(KeyError):
+        handle["Bad"]
+
+
+def test_EventTablesStore_formats(tmpdir):
+    
+    table = pd.DataFrame(
+            {'FM_ID [-]': pd.Categorical(['MoS1', 'MoS2', 'MoS1']),
+             'ComponentID [-]': pd.Series(['Pto001', np.nan, 'Pto002'],
+                                          dtype=object),
+             'downtimeDeviceList [-]': pd.Series([['device001'],
+                                                  ['device001', 'device002'],
+                                                  np.nan],
+                                                 dtype=object),
+             'indexFM [-]': pd.Series([1, 2, 3], dtype=object),
+             'costLogistic [Euro]': [1., np.nan, 2.],
+             'failureDate [-]': pd.to_datetime(['2020-01-01',
+                                                '2020-06-01',
+                                                '2021-01-01'])})
+    
+    data_point = {key: 1. for key in StatisticsAccumulator.metric_keys}
+    data_point['eventTables [-]'] = {"UnCoMa_eventsTable": table}
+    
+    test = EventTablesStore(str(tmpdir))
+    handle = test.add_data_point(0, data_point)
+    result = handle["UnCoMa_eventsTable"]
+    
+    assert result.equals(table)
+    assert result.dtypes.equals(table.dtypes)
+    assert result['downtimeDeviceList [-]'][1] == ['device001', 'device002']
+    assert result['indexFM [-]'][2] == 3
+    
+    # None of the columns are pickled
+    table_path = os.path.join(handle.get_path(), "UnCoMa_eventsTable")
+    
+    for file_name in os.listdir(table_path):
+        np.load(os.path.join(table_path, file_name), allow_pickle=False)
+
+
+def test_EventTablesStore_load_data_point(tmpdir, events_tables_dict):
+    
+    data_point = {key: 1. for key in StatisticsAccumulator.metric_keys}
+    data_point['eventTables [-]'] = events_tables_dict
+    
+    EventTablesStore(str(tmpdir)).add_data_point(3, data_point)
+    
+    test = EventTablesStore(str(tmpdir))
+    handle = test.load_data_point(3)
+    
+    assert handle.get_metrics() == {key: 1. for key in
+                                            StatisticsAccumulator.metric_keys}
+    
+    for key, table in events_tables_dict.items():
+        assert handle[key].equals(table)
+        assert handle[key].dtypes.equals(table.dtypes)
+    
+    with pytest.raises(KeyError):
+        test.load_data_point(4)
+
+
+def test_JobQueue(tmpdir):
+    
+    test = JobQueue(str(tmpdir))
+    job_id = test.publish({"a": 1}, [2, 0, 1])
+    
+    assert test.get_job() == {"id": job_id,
+                              "job": {"a": 1},
+                              "lease_time": 60.}
+    assert test.claim_task() == (job_id, 0)
+    assert test.claim_task() == (job_id, 1)
+    assert test.get_result(job_id, 0) is None
+    
+    test.put_result(job_id, 0, data_point={"b": 2})
+    test.put_result(job_id, 1, error="Bad")
+    
+    assert test.wait_for_result(job_id, 0) == {"data_point": {"b": 2},
+                                               "error": None,
+                                               "logistics_solutions": None}
+    assert test.get_result(job_id, 0) is None
+    assert test.get_result(job_id, 1)["error"] == "Bad"
+    assert test.claim_task() == (job_id, 2)
+    assert test.claim_task() is None
+    
+    test.clear()
+    
+    assert test.get_job() is None
+    assert not tmpdir.join("claimed").listdir()
+
+
+def test_JobQueue_publish_live(tmpdir):
+    
+    test = JobQueue(str(tmpdir))
+    test.publish({"a": 1}, [0])
+    
+    with pytest.raises(ValueError):
+        test.publish({"a": 2}, [0])
+    
+    # An unrenewed job may be replaced
+    test.lease_time = 0.
+    job_id = test.publish({"a": 2}, [0])
+    
+    assert test.get_job()["id"] == job_id
+
+
+def test_JobQueue_requeue_stale_tasks(tmpdir):
+    
+    test = JobQueue(str(tmpdir), lease_time=60.)
+    job_id = test.publish({"a": 1}, [0, 1])
+    
+    assert test.claim_task() == (job_id, 0)
+    assert test.claim_task() == (job_id, 1)
+    assert test.requeue_stale_tasks() == 0
+    
+    test.lease_time = 0.
+    
+    assert test.requeue_stale_tasks() == 2
+    assert test.claim_task() == (job_id, 0)
+
+
+def test_JobQueue_heartbeat(tmpdir):
+    
+    test = JobQueue(str(tmpdir), lease_time=0.4)
+    job_id = test.publish({"a": 1}, [0])
+    test.claim_task()
+    
+    heartbeat = test.start_heartbeat(job_id, 0)
+    time.sleep(0.6)
+    
+    assert test.requeue_stale_tasks() == 0
+    
+    heartbeat.stop()
+    time.sleep(0.6)
+    
+    assert test.requeue_stale_tasks() == 1
+
+
+def test_JobQueue_wait_for_result_timeout(tmpdir):
+    
+    test = JobQueue(str(tmpdir), poll_interval=0.01)
+    job_id = test.publish({"a": 1}, [0])
+    
+    with pytest.raises(RuntimeError):
+        test.wait_for_result(job_id, 0, timeout=0.05)
+
+
+def test_CorrectiveEventQueue():
+    
+    dates = pd.to_datetime(["2016-01-03", "2016-01-01", "2016-01-02"])
+    events_table = pd.DataFrame({"repairActionEvents": dates,
+                                 "failureEvents": dates,
+                                 "ComponentID": ["Pto001",
+                                                 "Pto001",
+                                                 "Export Cable001"],
+                                 "belongsTo": ["device001",
+                                               "device002",
+                                               "Array"]})
+    
+    test = CorrectiveEventQueue(events_table)
+    
+    assert len(test) == 3
+    assert test.peek()["belongsTo"] == "device002"
+    
+    event = test.pop()
+    test.shift(48, event["ComponentID"], ["device001"])
+    
+    assert len(test) == 2
+    assert test.pop()["ComponentID"] == "Export Cable001"
+    
+    test.shift(24)
+    event = test.pop()
+    
+    assert event["failureEvents"] == dt.datetime(2016, 1, 6)
+    assert event["repairActionEvents"] == dt.datetime(2016, 1, 6)
+    assert len(test) == 0
+
+
+def test_CorrectiveEventQueue_shift_accumulates():
+    
+    dates = pd.to_datetime(["2016-01-01", "2016-01-02", "2016-01-05"])
+    events_table = pd.DataFrame({"repairActionEvents": dates,
+                                 "failureEvents": dates,
+                                 "ComponentID": ["Pto001",
+                                                 "Pto001",
+                                                 "Pto001"],
+                                 "belongsTo": ["device001",
+                                               "device001",
+                                               "device002"]})
+    
+    test = CorrectiveEventQueue(events_table)
+    test.shift(24, "Pto001", ["device001"])
+    test.shift(48, "Pto001", ["device001"])
+    test.shift(12)
+    
+    event = test.pop()
+    
+    assert event["repairActionEvents"] == dt.datetime(2016, 1, 4, 12)
+    
+    event = test.pop()
+    
+    assert event["belongsTo"] == "device001"
+    assert event["failureEvents"] == dt.datetime(2016, 1, 5, 12)
+    assert test.peek()["belongsTo"] == "device002"
+    assert test.peek()["repairActionEvents"] == dt.datetime(2016, 1, 5, 12)
+
+
+def test_CorrectiveEventQueue_shift_negative():
+    
+    dates = pd.to_datetime(["2016-01-01"])
+    events_table = pd.DataFrame({"repairActionEvents": dates,
+                                 "failureEvents": dates,
+                                 "ComponentID": ["Pto001"],
+                                 "belongsTo": ["device001"]})
+    
+    test = CorrectiveEventQueue(events_table)
+    
+    with pytest.raises(ValueError):
+        test.shift(-1)
+
+
+def test_LogisticsCache(tmpdir):
+    
+    om = pd.DataFrame({"FM_ID [-]": ["MoS1"],
+                       "t_start [-]": ["2016-01-01 00:00:00"],
+                       "Soil type [-]": [np.nan]})
+    
+    test = LogisticsCache(2)
+    key = test.get_key(om, False)
+    
+    assert test.get(key) is None
+    assert key == test.get_key(om.copy(), False)
+    assert key != test.get_key(om, True)
+    
+    solution = {"findSolution": "SolutionFound", "optimal": {"cost": 1.}}
+    test.add(key, solution)
+    solution["optimal"]["cost"] = 2.
+    
+    assert test.get(key)["optimal"]["cost"] == 1.
+    
+    test.add("b", {"optimal": 2})
+    test.get(key)
+    test.add("c", {"optimal": 3})
+    
+    # The least recently used solution is discarded
+    assert len(test) == 2
+    assert test.get("b") is None
+    
+    stats = test.get_stats()
+    
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hitRate"] == 0.5
+    
+    file_path = str(tmpdir.join("cache", "logistics.pkl"))
+    test.save(file_path)
+    
+    loaded = LogisticsCache(1, file_path)
+    
+    assert len(loaded) == 1
+    assert loaded.get("c") == {"optimal": 3}
+    assert loaded.get_file_path() == file_path
+
+
+def test_LogisticsCache_fingerprint(tmpdir):
+    
+    file_path = str(tmpdir.join("logistics.pkl"))
+    
+    test = LogisticsCache(2, file_path, "a")
+    test.add("b", {"optimal": 2})
+    test.save()
+    
+    assert len(LogisticsCache(2, file_path, "a")) == 1
+    assert len(LogisticsCache(2, file_path, "b")) == 0
+
+
+def test_LogisticsCache_pop_new_solutions():
+    
+    test = LogisticsCache(2)
+    test.add("a", {"optimal": 1})
+    
+    assert test.pop_new_solutions() == [("a", {"optimal": 1})]
+    assert test.pop_new_solutions() == []
+    
+    test.add("b", {"optimal": 2})
+    test.add("c", {"optimal": 3})
+    test.add("d", {"optimal": 4})
+    
+    # Discarded solutions are not returned
+    assert test.pop_new_solutions() == [("c", {"optimal": 3}),
+                                        ("d", {"optimal": 4})]
+    
+    merged = LogisticsCache(3)
+    merged.update([("a", {"optimal": 1}), ("c", {"optimal": 3})])
+    
+    assert len(merged) == 2
+    assert merged.get("c") == {"optimal": 3}
+
+
+def test_LogisticsCache_bad_size():
+    
+    with pytest.raises(ValueError):
+        LogisticsCache(0)
+
+
+def test_get_parameter_records():
+    
+    table = pd.DataFrame({"Pto001_1": ["1.5", "MoS1", 2],
+                          "Pto001_2": [3, "RtP3", "n/a"]},
+                         index=["spare_mass", "FM_ID", "number_technicians"])
+    
+    test = get_parameter_records(table)
+    
+    assert set(test) == set(["Pto001_1", "Pto001_2"])
+    assert test["Pto001_1"]["spare_mass"] == 1.5
+    assert test["Pto001_1"]["FM_ID"] == "MoS1"
+    assert test["Pto001_2"]["number_technicians"] == "n/a"
+
+
+def test_get_z_score():
+    
+    assert np.isclose(get_z_score(0.95), 1.959964)
+    assert np.isclose(get_z_score(0.99), 2.575829)
+
+
+def test_ConvergenceMonitor():
+    
+    data_point = {"LCOEOpex [Euro/kWh]": 0.1,
+                  "lifetimeOpex [Euro]": 1e6,
+                  "arrayAvailability [-]": 0.9}
+    
+    test = ConvergenceMonitor(0.01, min_points=3)
+    
+    assert not test.update(data_point)
+    assert not test.update(data_point)
+    assert test.update(data_point)
+    
+    trace_df = test.get_trace_df()
+    
+    assert len(trace_df) == 3
+    assert np.isclose(trace_df["LCOEOpexMean [Euro/kWh]"], 0.1).all()
+    assert trace_df["converged [-]"].iloc[-1]
+
+
+def test_ConvergenceMonitor_not_converged():
+    
+    test = ConvergenceMonitor(0.01, min_points=3)
+    
+    for i in range(5):
+        
+        data_point = {"LCOEOpex [Euro/kWh]": 0.1 * (i % 2 + 1),
+                      "lifetimeOpex [Euro]": 1e6,
+                      "arrayAvailability [-]": 0.9}
+        converged = test.update(data_point)
+    
+    trace_df = test.get_trace_df()
+    
+    assert not converged
+    assert trace_df["LCOEOpexRelativeHalfWidth [-]"].iloc[-1] > 0.01
+
+
+def test_ConvergenceMonitor_bad_confidence():
+    
+    with pytest.raises(ValueError):
+        ConvergenceMonitor(0.01, confidence=1.5)
+
+
+def test_get_random_state():
+    
+    test1 = get_random_state(1, 2)
+    test2 = get_random_state(1, 2)
+    test3 = get_random_state(1, 3)
+    
+    sample1 = test1.random_sample(10)
+    sample2 = test2.random_sample(10)
+    sample3 = test3.random_sample(10)
+    
+    assert (sample1 == sample2).all()
+    assert not (sample1 == sample3).all()
+
+
+def test_poisson_process_random_state():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    simulation_time = 365 * 20
+    failure_rate = 2. / 365.25
+    
+    test1 = poisson_process(start_date,
+                            simulation_time,
+                            failure_rate,
+                            get_random_state(1, 0))
+    test2 = poisson_process(start_date,
+                            simulation_time,
+                            failure_rate,
+                            get_random_state(1, 0))
+    
+    assert len(test1) > 0
+    assert test1 == test2
+
+
+def test_poisson_process():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    simulation_time = 365 * 20
+    failure_rate = 2. / 365.25
+    
+    test = poisson_process(start_date,
+                           simulation_time,
+                           failure_rate,
+                           get_random_state(1, 0))
+    
+    # The trial is selected from the 40th to 70th percentiles of the counts
+    assert 35 <= len(test) <= 45
+    assert test == sorted(test)
+    assert test[0] >= start_date
+    assert test[-1] <= start_date + dt.timedelta(days=simulation_time)
+
+
+def test_poisson_process_batch(mocker):
+    
+    start_date = dt.datetime(2016, 1, 1)
+    simulation_time = 365 * 20
+    failure_rates = [2. / 365.25, 0., 1. / 365.25]
+    random_state = mocker.Mock(wraps=get_random_state(1, 0))
+    
+    rate_index, event_dates = poisson_process_batch(start_date,
+                                                    simulation_time,
+                                                    failure_rates,
+                                                    random_state)
+    
+    # One draw for the numbers of events and one for the event times
+    assert random_state.random_sample.call_count == 2
+    
+    expected = poisson_process_batch(start_date,
+                                     simulation_time,
+                                     failure_rates,
+                                     get_random_state(1, 0))
+    
+    assert (rate_index == expected[0]).all()
+    assert (event_dates == expected[1]).all()
+    
+    end_date = np.datetime64(start_date + dt.timedelta(days=simulation_time))
+    
+    for i in [0, 2]:
+        
+        test = event_dates[rate_index == i]
+        
+        assert len(test) > 0
+        assert (np.diff(test) >= np.timedelta64(0)).all()
+        assert test[0] >= np.datetime64(start_date)
+        assert test[-1] <= end_date
+    
+    assert (rate_index == 1).sum() == 0
+    assert (np.diff(rate_index) >= 0).all()
+    assert len(rate_index) == len(event_dates)
+
+
+def test_poisson_process_batch_distribution():
+    
+    # The batch draws differ from those of poisson_process, but the mean
+    # numbers of events should agree
+    start_date = dt.datetime(2016, 1, 1)
+    simulation_time = 365 * 20
+    failure_rate = 2. / 365.25
+    n_rates = 2000
+    
+    rate_index, _ = poisson_process_batch(start_date,
+                                          simulation_time,
+                                          [failure_rate] * n_rates,
+                                          get_random_state(1, 0))
+    
+    random_state = get_random_state(2, 0)
+    expected = [len(poisson_process(start_date,
+                                    simulation_time,
+                                    failure_rate,
+                                    random_state)) for _ in range(n_rates)]
+    
+    assert np.isclose(len(rate_index) / float(n_rates),
+                      np.mean(expected),
+                      rtol=0.01)
+
+
+def test_poisson_process_batch_one_year():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    failure_rates = [2. / 365.25]
+    
+    rate_index, event_dates = poisson_process_batch(start_date,
+                                                    365,
+                                                    failure_rates)
+    
+    assert len(rate_index) == len(event_dates) > 0
+
+
+def test_poisson_process_batch_empty():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    failure_rates = [2. / 365.25]
+    
+    rate_index, event_dates = poisson_process_batch(start_date,
+                                                    1,
+                                                    failure_rates)
+    
+    assert len(rate_index) == len(event_dates) == 0
+
+
+def test_get_poisson_numbers():
+    
+    numbers, cum_probabilities = _get_poisson_numbers(10.)
+    
+    # 40th and 70th percentiles are 9 and 12, with some variation
+    assert set(numbers) >= set([9, 10, 11, 12])
+    assert min(numbers) >= 7
+    assert max(numbers) <= 13
+    assert np.all(np.diff(cum_probabilities) >= 0)
+    assert np.isclose(cum_probabilities[-1], 1.)
+    assert _get_poisson_numbers(10.)[0] is numbers
+
+
+@pytest.mark.parametrize("expected_number, reference", [
+    (2.5, {2: 0.5454, 3: 0.4546}),
+    (10., {9: 0.2993, 10: 0.2992, 11: 0.2721, 12: 0.1294})])
+def test_get_poisson_numbers_reference(expected_number, reference):
+    
+    # Reference probabilities of the legacy algorithm, i.e. one trial picked
+    # from the trials of a population of 2000 poisson draws lying between the
+    # population's 40th and 70th percentiles, estimated over 200000
+    # populations
+    numbers, cum_probabilities = _get_poisson_numbers(expected_number)
+    probabilities = np.diff(np.concatenate(([0.], cum_probabilities)))
+    test = dict(zip(numbers, probabilities))
+    
+    for number in set(test) | set(reference):
+        assert np.isclose(test.get(number, 0.),
+                          reference.get(number, 0.),
+                          atol=0.005)
+
+
+def test_poisson_process_zero_rate():
+    
+    start_date = dt.datetime(2016, 1, 1)
+    test = poisson_process(start_date, 365, 0.)
+    
+    assert test == []
+
+
+def test_StatisticsAccumulator():
+    
+    def get_data_point(years, devices):
+        
+        data_point = {key: 1. for key in StatisticsAccumulator.metric_keys}
+        data_point["CapexOfArray [Euro]"] = 1.
+        data_point["OpexPerYear [Euro]"] = pd.DataFrame(
+                                        {"Year": years,
+                                         "Cost": [1.] * len(years)})
+        data_point["energyPerYear [Wh]"] = pd.DataFrame(
+                                        {"Year": years,
+                                         "Energy": [1.] * len(years)})
+        data_point["downtimePerDevice [hour]"] = {x: 1. for x in devices}
+        data_point["energyPerDevice [Wh]"] = {x: 1. for x in devices}
+        data_point['eventTables [-]'] = None
+        
+        return data_point
+    
+    test = StatisticsAccumulator(3)
+    test.add_data_point(get_data_point(range(3), ["device001"]))
+    test.add_data_point(get_data_point(range(4), ["device001",
+                                                  "device002"]))
+    result = test.get_output()
+    
+    year_opex_df = result["OpexPerYear [Euro]"]
+    device_downtime_df = result["downtimePerDevice [hour]"]
+    
+    assert test.get_n_points() == 2
+    assert len(result["MetricsTable [-]"]) == 2
+    assert list(year_opex_df.columns) == ["Cost 0 [Euro]", "Cost 1 [Euro]"]
+    assert list(year_opex_df.index) == range(4)
+    assert np.isnan(year_opex_df.loc[3, "Cost 0 [Euro]"])
+    assert list(device_downtime_df.columns) == ["Downtime 0 [hours]",
+                                                "Downtime 1 [hours]"]
+    assert np.isnan(device_downtime_df.loc["device002",
+                                           "Downtime 0 [hours]"])
+    assert len(result['eventTables [-]']) == 2
+
+
+def test_StatisticsAccumulator_full():
+    
+    data_point = {key: 1. for key in StatisticsAccumulator.metric_keys}
+    data_point["CapexOfArray [Euro]"] = 1.
+    data_point["OpexPerYear [Euro]"] = pd.DataFrame({"Year": [0],
+                                                     "Cost": [1.]})
+    data_point["energyPerYear [Wh]"] = pd.DataFrame({"Year": [0],
+                                                     "Energy": [1.]})
+    data_point["downtimePerDevice [hour]"] = {"device001": 1.}
+    data_point["energyPerDevice [Wh]"] = {"device001": 1.}
+    data_point['eventTables [-]'] = None
+    
+    test = StatisticsAccumulator(1)
+    test.add_data_point(data_point)
+    
+    with pytest.raises(ValueError):
+        test.add_data_point(data_point)
+
+
+def test_StatisticsAccumulator_integer_first():
+    
+    def get_data_point(value):
+        
+        data_point = {key: value for key in StatisticsAccumulator.metric_keys}
+        data_point["CapexOfArray [Euro]"] = 1.
+        data_point["OpexPerYear [Euro]"] = pd.DataFrame({"Year": [0],
+                                                         "Cost": [1.]})
+        data_point["energyPerYear [Wh]"] = pd.DataFrame({"Year": [0],
+                                                         "Energy": [1.]})
+        data_point["downtimePerDevice [hour]"] = {"device001": 1.}
+        data_point["energyPerDevice [Wh]"] = {"device001": 1.}
+        data_point['eventTables [-]'] = None
+        
+        return data_point
+    
+    test = StatisticsAccumulator(2)
+    test.add_data_point(get_data_point(1))
+    test.add_data_point(get_data_point(0.5))
+    result = test.get_output()
+    
+    metrics_df = result["MetricsTable [-]"]
+    
+    assert (metrics_df["LCOEOpex [Euro/kWh]"] == [1., 0.5]).all()
+    assert (metrics_df.dtypes == float).all()
+
+
 def test_Availability_init(availability):
     
     assert availability._max_uptime